@@ -0,0 +1,101 @@
+"""Run many prompts from a JSONL file concurrently and stream results to JSONL."""
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+from .orchestrator import AIOrchestrator
+
+
+def read_batch(path: str | Path) -> Iterator[dict]:
+    """
+    Yield batch requests from a JSONL file, one per non-blank line:
+    {"id": ..., "prompt": ..., "system": optional, "model": optional,
+    "provider": optional}.
+    Lines that are not valid requests are yielded with an "error" key.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"id": f"line-{line_no}", "error": f"invalid JSON: {e}"}
+                continue
+            if not isinstance(item, dict) or not isinstance(item.get("prompt"), str):
+                yield {"id": f"line-{line_no}", "error": "missing 'prompt'"}
+                continue
+            item.setdefault("id", f"line-{line_no}")
+            yield item
+
+
+def run_batch(
+    orch: AIOrchestrator,
+    items: Iterable[dict],
+    out: IO[str],
+    provider: str | None = None,
+    model: str | None = None,
+    auto_continue: bool = True,
+) -> dict[str, int]:
+    """
+    Send every item through orch.chat, up to orch.concurrency at a time, and
+    write one JSON line per item to out as soon as it finishes (so order follows
+    completion, not input): id, response, latency_s, usage, finish_reason, error.
+    provider and model apply to items that do not set their own.
+    Returns counts {"total": ..., "failed": ...}.
+    """
+    def run_one(item: dict) -> dict:
+        if "error" in item:
+            return {"id": item["id"], "response": None, "latency_s": 0.0, "usage": None,
+                    "finish_reason": None, "error": item["error"]}
+        start = time.perf_counter()
+        try:
+            reply = orch.chat(
+                item["prompt"],
+                system_prompt=item.get("system"),
+                model=item.get("model") or model,
+                provider=item.get("provider") or provider,
+                save_to_file=False,
+                auto_continue=auto_continue,
+            )
+            error = None
+        except Exception as e:
+            reply, error = None, f"{type(e).__name__}: {e}"
+        return {
+            "id": item["id"],
+            "response": None if reply is None else str(reply),
+            "latency_s": round(time.perf_counter() - start, 3),
+            "usage": getattr(reply, "usage", None),
+            "finish_reason": getattr(reply, "finish_reason", None),
+            "error": error,
+        }
+
+    counts = {"total": 0, "failed": 0}
+
+    def emit(record: dict) -> None:
+        counts["total"] += 1
+        if record["error"]:
+            counts["failed"] += 1
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+
+    # Keep a bounded number of requests in flight so huge batch files are
+    # never loaded into memory at once.
+    window = orch.concurrency * 2
+    pending: set[Future[dict]] = set()
+    with ThreadPoolExecutor(max_workers=orch.concurrency, thread_name_prefix="batch") as pool:
+        for item in items:
+            pending.add(pool.submit(run_one, item))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    emit(fut.result())
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                emit(fut.result())
+    return counts
@@ -0,0 +1,145 @@
+"""Persistent, content-addressed cache of AI responses (SQLite, LRU + TTL eviction)."""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .providers.base import ChatMessage, ChatResult
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    finish_reason TEXT,
+    usage TEXT
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+class ResponseCache:
+    """
+    Response cache stored in a single SQLite file. Entries are keyed by a hash of
+    provider, model, max_tokens and messages. Safe to share between threads and
+    processes (SQLite locking, WAL journal). Least recently used entries are
+    evicted once the total size exceeds max_bytes; entries older than
+    ttl_seconds are treated as missing.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = "./.cache/responses.sqlite3",
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl_seconds: float | None = None,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds or None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+        for column in ("finish_reason", "usage"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE responses ADD COLUMN {column} TEXT")
+
+    @staticmethod
+    def make_key(provider: str, model: str, max_tokens: int, messages: list[ChatMessage]) -> str:
+        payload = json.dumps(
+            {
+                "provider": provider,
+                "model": model,
+                "max_tokens": max_tokens,
+                "messages": [[m.role, m.content] for m in messages],
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> ChatResult | None:
+        """Return the cached response, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created, finish_reason, usage FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created, finish_reason, usage = row
+            if self.ttl_seconds is not None and now - created > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return ChatResult(value, finish_reason, json.loads(usage) if usage else None)
+
+    def put(self, key: str, value: str) -> None:
+        """Store a response; finish_reason/usage are kept if value is a ChatResult."""
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        finish_reason = getattr(value, "finish_reason", None)
+        usage = getattr(value, "usage", None)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, value, size, created, accessed, finish_reason, usage) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, str(value), size, now, now, finish_reason, json.dumps(usage) if usage else None),
+                )
+                self._evict()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        if self.ttl_seconds is not None:
+            self._conn.execute(
+                "DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,)
+            )
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        doomed: list[tuple[str]] = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def cache_from_config(config: dict) -> ResponseCache | None:
+    """Build the ResponseCache described by config['cache'], or None if disabled."""
+    cache_cfg = config.get("cache", {}) or {}
+    if not cache_cfg.get("enabled", False):
+        return None
+    return ResponseCache(
+        path=cache_cfg.get("path", "./.cache/responses.sqlite3"),
+        max_bytes=int(float(cache_cfg.get("max_size_mb", 512)) * 1024 * 1024),
+        ttl_seconds=cache_cfg.get("ttl_seconds") or None,
+    )
@@ -1,27 +1,106 @@
 """Split large texts into chunks that fit within model token limits."""
 from __future__ import annotations
 
-from typing import Iterator
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from pathlib import Path
+from typing import Generator, Iterable, Iterator
 
-# Optional: use tiktoken for accurate token counts (OpenAI/OpenRouter models)
-try:
-    import tiktoken
-    _TIKTOKEN_AVAILABLE = True
-except ImportError:
-    _TIKTOKEN_AVAILABLE = False
+# Optional: tiktoken gives accurate token counts (OpenAI/OpenRouter models). It
+# is imported, and its BPE ranks loaded, only when a Tokenizer first needs them.
+_UNLOADED = object()
+
+# Preferred chunk boundaries, best first
+BOUNDARY_SEPARATORS = ("\n\n", "\n", ". ")
+
+
+class Tokenizer:
+    """
+    Reusable token counter/encoder for one encoding.
+    Uses tiktoken when available; otherwise estimates ~4 chars per token
+    (exact is False and encode/decode are unavailable).
+    """
+
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        self.encoding_name = encoding_name
+        self._encoding = _UNLOADED
+        self._load_lock = threading.Lock()
+
+    @property
+    def _enc(self):
+        """The tiktoken encoding (None if unavailable), loaded on first use."""
+        if self._encoding is _UNLOADED:
+            with self._load_lock:
+                if self._encoding is _UNLOADED:
+                    self._encoding = _load_encoding(self.encoding_name)
+        return self._encoding
+
+    @property
+    def exact(self) -> bool:
+        """True if counts come from a real tokenizer rather than the char estimate."""
+        return self._enc is not None
+
+    def encode(self, text: str) -> list[int]:
+        # Special-token strings in user text are treated as plain text
+        return self._enc.encode_ordinary(text)
+
+    def decode(self, tokens: list[int]) -> str:
+        return self._enc.decode(tokens)
+
+    def token_bytes(self, token: int) -> bytes:
+        return self._enc.decode_single_token_bytes(token)
+
+    def count(self, text: str) -> int:
+        if self._enc is not None:
+            return len(self._enc.encode_ordinary(text))
+        return (len(text) + 3) // 4
+
+    def count_batch(self, texts: list[str], num_threads: int = 8) -> list[int]:
+        """Token counts of many texts, encoded in parallel threads (tiktoken releases the GIL)."""
+        if self._enc is not None:
+            return [len(t) for t in self._enc.encode_ordinary_batch(texts, num_threads=num_threads)]
+        return [(len(text) + 3) // 4 for text in texts]
+
+    def tail(self, text: str, max_tokens: int) -> str:
+        """Return the last max_tokens tokens of text (only the end of text is encoded)."""
+        if max_tokens <= 0:
+            return ""
+        if self._enc is None:
+            return text[-max_tokens * 4:]
+        window = text[-max_tokens * 16:]
+        tokens = self.encode(window)
+        if len(tokens) <= max_tokens and len(window) < len(text):
+            tokens = self.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        start = len(tokens) - max_tokens
+        while start < len(tokens) - 1 and _starts_mid_char(self.token_bytes(tokens[start])):
+            start += 1
+        return self.decode(tokens[start:])
+
+
+def _load_encoding(encoding_name: str):
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(encoding_name)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(encoding_name: str = "cl100k_base") -> Tokenizer:
+    """Return the shared Tokenizer for encoding_name (encodings are loaded once per process)."""
+    return Tokenizer(encoding_name)
 
 
 def estimate_tokens(text: str, encoding_name: str = "cl100k_base") -> int:
     """
     Estimate token count. Uses tiktoken if available, else ~4 chars per token.
     """
-    if _TIKTOKEN_AVAILABLE:
-        try:
-            enc = tiktoken.get_encoding(encoding_name)
-            return len(enc.encode(text))
-        except Exception:
-            pass
-    return (len(text) + 3) // 4
+    return get_tokenizer(encoding_name).count(text)
 
 
 def chunk_text(
@@ -29,42 +108,27 @@ def chunk_text(
     max_tokens: int = 4000,
     overlap_tokens: int = 0,
     encoding_name: str = "cl100k_base",
+    tokenizer: Tokenizer | None = None,
 ) -> Iterator[str]:
     """
     Split text into chunks of at most max_tokens. Optional overlap for context.
     Tries to break on paragraph or sentence boundaries when possible.
+    The text is encoded once; boundaries are mapped back to token positions
+    without re-encoding.
     """
-    if estimate_tokens(text, encoding_name) <= max_tokens:
-        yield text
-        return
-
-    if _TIKTOKEN_AVAILABLE:
-        try:
-            enc = tiktoken.get_encoding(encoding_name)
-            tokens = enc.encode(text)
-            decode = enc.decode
-            start = 0
-            while start < len(tokens):
-                end = min(start + max_tokens, len(tokens))
-                chunk_tokens = tokens[start:end]
-                chunk = decode(chunk_tokens)
-                # Prefer breaking at last paragraph or sentence
-                if end < len(tokens) and overlap_tokens <= 0:
-                    for sep in ("\n\n", "\n", ". "):
-                        idx = chunk.rfind(sep)
-                        if idx > max_tokens // 2:
-                            chunk = chunk[: idx + len(sep)]
-                            # Re-encode to advance start correctly
-                            chunk_tokens = enc.encode(chunk)
-                            end = start + len(chunk_tokens)
-                            break
-                yield chunk
-                start = end - overlap_tokens if overlap_tokens > 0 else end
+    tok = tokenizer or get_tokenizer(encoding_name)
+    if tok.exact:
+        tokens = tok.encode(text)
+        if len(tokens) <= max_tokens:
+            yield text
             return
-        except Exception:
-            pass
+        yield from _chunk_tokens(tok, tokens, max_tokens, overlap_tokens)
+        return
 
     # Fallback: character-based (assume ~4 chars per token)
+    if tok.count(text) <= max_tokens:
+        yield text
+        return
     max_chars = max_tokens * 4
     overlap_chars = overlap_tokens * 4
     start = 0
@@ -72,11 +136,231 @@ def chunk_text(
         end = min(start + max_chars, len(text))
         chunk = text[start:end]
         if end < len(text):
-            for sep in ("\n\n", "\n", ". "):
+            for sep in BOUNDARY_SEPARATORS:
                 idx = chunk.rfind(sep)
                 if idx > max_chars // 2:
                     chunk = chunk[: idx + len(sep)]
                     end = start + len(chunk)
                     break
         yield chunk
+        if end >= len(text):
+            break
         start = end - overlap_chars if overlap_chars > 0 else end
+
+
+def read_text_blocks(
+    path: str | Path,
+    block_chars: int = 1 << 20,
+    encoding: str = "utf-8",
+) -> Iterator[str]:
+    """Read a text file lazily in blocks of up to block_chars characters."""
+    with open(path, "r", encoding=encoding) as f:
+        while True:
+            block = f.read(block_chars)
+            if not block:
+                return
+            yield block
+
+
+def chunk_stream(
+    blocks: Iterable[str],
+    max_tokens: int = 4000,
+    overlap_tokens: int = 0,
+    encoding_name: str = "cl100k_base",
+    tokenizer: Tokenizer | None = None,
+) -> Iterator[str]:
+    """
+    Like chunk_text, but for text arriving in blocks (e.g. read_text_blocks).
+    Only the current block plus the unfinished last chunk are held in memory;
+    every chunk except the last is final once the text after it has been seen.
+    """
+    tok = tokenizer or get_tokenizer(encoding_name)
+    # Buffer at least ~two chunks' worth of text before splitting
+    min_chars = max_tokens * 8
+    buffer = ""
+    for block in blocks:
+        buffer += block
+        if len(buffer) < min_chars:
+            continue
+        chunks = list(chunk_text(buffer, max_tokens, overlap_tokens, tokenizer=tok))
+        yield from chunks[:-1]
+        buffer = chunks[-1]
+    if buffer:
+        yield from chunk_text(buffer, max_tokens, overlap_tokens, tokenizer=tok)
+
+
+def chunk_parallel(
+    blocks: Iterable[str],
+    max_tokens: int = 4000,
+    overlap_tokens: int = 0,
+    encoding_name: str = "cl100k_base",
+    tokenizer: Tokenizer | None = None,
+    workers: int = 4,
+    segment_chars: int = 1 << 20,
+) -> Iterator[str]:
+    """
+    Like chunk_stream, for large inputs: the text is cut into segments of about
+    segment_chars at line breaks (paragraph breaks preferred), and segments are
+    encoded by a pool of workers threads (tiktoken releases the GIL), up to
+    2 * workers segments ahead of the chunk being yielded. Chunks are cut from
+    the concatenated tokens in order, so the first ones are available after one
+    segment and the result is the same as chunk_text over the whole text.
+    Exception: from a line longer than 4 * segment_chars on, which has no safe
+    place to cut, the rest of the text is chunked by chunk_stream.
+    Without tiktoken (or with workers <= 1) this is chunk_stream.
+    """
+    tok = tokenizer or get_tokenizer(encoding_name)
+    if workers <= 1 or not tok.exact:
+        yield from chunk_stream(blocks, max_tokens, overlap_tokens, tokenizer=tok)
+        return
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chunk-encode")
+    pending: deque[tuple[str, Future[list[int]]]] = deque()
+    rest: list[Iterator[str]] = []
+    segments = _segments(iter(blocks), segment_chars, rest)
+    tokens: list[int] = []
+    # Text of tokens, for handing over to chunk_stream
+    tail = ""
+    try:
+        while True:
+            for segment in segments:
+                pending.append((segment, pool.submit(tok.encode, segment)))
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                break
+            # Unfinished last chunk of the text so far, plus the next segment
+            segment, encoded = pending.popleft()
+            tokens = tokens + encoded.result()
+            start = yield from _chunk_tokens(tok, tokens, max_tokens, overlap_tokens, final=False)
+            tokens = tokens[start:]
+            tail = _text_suffix(tail + segment, sum(len(tok.token_bytes(t)) for t in tokens))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    if rest:
+        yield from chunk_stream(chain([tail], rest[0]), max_tokens, overlap_tokens, tokenizer=tok)
+    elif tokens:
+        yield from _chunk_tokens(tok, tokens, max_tokens, overlap_tokens)
+
+
+def _segments(blocks: Iterator[str], segment_chars: int, rest: list[Iterator[str]]) -> Iterator[str]:
+    """
+    Regroup text blocks into segments of about segment_chars, cut by
+    _segment_cut. If 4 * segment_chars pass without a place to cut, stop and
+    leave the unsegmented remainder of the text in rest.
+    """
+    buffer = ""
+    for block in blocks:
+        buffer += block
+        while len(buffer) >= segment_chars:
+            cut = _segment_cut(buffer, segment_chars)
+            if cut is None:
+                if len(buffer) >= 4 * segment_chars:
+                    rest.append(chain([buffer], blocks))
+                    return
+                break
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+    if buffer:
+        yield buffer
+
+
+def _segment_cut(text: str, segment_chars: int) -> int | None:
+    """
+    Where to end a segment: just after a newline followed by non-whitespace,
+    preferably the last paragraph break, else the last line break, in
+    [segment_chars / 2, segment_chars); failing that, the first line break
+    after it. Tokenizers never merge across such a point, so segments can be
+    encoded separately. None means there is no such point (yet).
+    """
+    low = segment_chars // 2
+    for sep in ("\n\n", "\n"):
+        pos = text.rfind(sep, low, segment_chars)
+        while pos >= 0:
+            cut = pos + len(sep)
+            if cut < len(text) and not text[cut].isspace():
+                return cut
+            pos = text.rfind(sep, low, pos + len(sep) - 1)
+    pos = text.find("\n", segment_chars)
+    while 0 <= pos < len(text) - 1:
+        if not text[pos + 1].isspace():
+            return pos + 1
+        pos = text.find("\n", pos + 1)
+    return None
+
+
+def _text_suffix(text: str, nbytes: int) -> str:
+    """Shortest suffix of text that is at least nbytes long in UTF-8."""
+    if nbytes <= 0:
+        return ""
+    suffix = text[-nbytes:]
+    excess = len(suffix.encode("utf-8")) - nbytes
+    skip = 0
+    while excess > 0 and skip < len(suffix):
+        size = len(suffix[skip].encode("utf-8"))
+        if size > excess:
+            break
+        excess -= size
+        skip += 1
+    return suffix[skip:]
+
+
+def _chunk_tokens(
+    tok: Tokenizer,
+    tokens: list[int],
+    max_tokens: int,
+    overlap_tokens: int,
+    final: bool = True,
+) -> Generator[str, None, int]:
+    """
+    Yield chunks of an already-encoded text, preferring paragraph/sentence ends.
+    With final=False, more text may follow: the last chunk is held back and the
+    generator returns the token index where it starts.
+    """
+    start = 0
+    n = len(tokens)
+    while start < n:
+        end = min(start + max_tokens, n)
+        if end == n and not final:
+            return start
+        # Don't cut inside a multi-byte character split across byte-level tokens
+        while end < n and end - start > 1 and _starts_mid_char(tok.token_bytes(tokens[end])):
+            end -= 1
+        window = tokens[start:end]
+        chunk = tok.decode(window)
+        # Prefer breaking at last paragraph or sentence
+        if end < n and overlap_tokens <= 0:
+            for sep in BOUNDARY_SEPARATORS:
+                idx = chunk.rfind(sep)
+                if idx < 0:
+                    continue
+                cut = idx + len(sep)
+                keep, straddles = _tokens_before(tok, window, len(chunk[cut:].encode("utf-8")))
+                if keep > len(window) // 2:
+                    chunk = tok.decode(window[:keep]) if straddles else chunk[:cut]
+                    end = start + keep
+                    break
+        yield chunk
+        if end >= n:
+            return n
+        start = end - overlap_tokens if overlap_tokens > 0 else end
+    return start
+
+
+def _starts_mid_char(token_bytes: bytes) -> bool:
+    return bool(token_bytes) and (token_bytes[0] & 0xC0) == 0x80
+
+
+def _tokens_before(tok: Tokenizer, window: list[int], tail_bytes: int) -> tuple[int, bool]:
+    """
+    Number of leading tokens of window that cover everything except the last
+    tail_bytes bytes, and whether a token straddles that cut (it stays in the
+    head). Walks back from the end, so the cost is proportional to the tail.
+    """
+    keep = len(window)
+    acc = 0
+    while keep > 0 and acc < tail_bytes:
+        keep -= 1
+        acc += len(tok.token_bytes(window[keep]))
+    if acc > tail_bytes:
+        return keep + 1, True
+    return keep, False
@@ -1,11 +1,15 @@
 """Load and validate configuration from YAML and environment."""
 from __future__ import annotations
 
+import copy
+import hashlib
+import json
 import os
 from pathlib import Path
 from typing import Any
 
-import yaml
+# Parsed configs of this process, keyed by path -> ((mtime_ns, size), config)
+_parsed: dict[str, tuple[tuple[int, int], dict[str, Any]]] = {}
 
 
 def load_config(config_path: str | Path | None = None) -> dict[str, Any]:
@@ -14,19 +18,86 @@ def load_config(config_path: str | Path | None = None) -> dict[str, Any]:
     if config_path is not None:
         path = Path(config_path)
         if path.exists():
-            with open(path, "r", encoding="utf-8") as f:
-                cfg = yaml.safe_load(f) or {}
-            return _apply_env_overrides(cfg)
+            return _apply_env_overrides(_read_yaml(path))
         return _apply_env_overrides({})
     for name in ("config.yaml", "config.example.yaml"):
         path = base / name
         if path.exists():
-            with open(path, "r", encoding="utf-8") as f:
-                cfg = yaml.safe_load(f) or {}
-            return _apply_env_overrides(cfg)
+            return _apply_env_overrides(_read_yaml(path))
     return _apply_env_overrides({})
 
 
+def _read_yaml(path: Path) -> dict[str, Any]:
+    """
+    Parsed YAML file, cached (in process and in a JSON file under the user
+    cache dir) until its mtime or size changes, so a typical run imports and
+    runs neither PyYAML nor the YAML parser. Returns a fresh copy.
+    """
+    path = path.resolve()
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _parsed.get(str(path))
+    if cached is not None and cached[0] == stamp:
+        return copy.deepcopy(cached[1])
+    cache_file = _cache_file(path)
+    cfg = _read_cache_file(cache_file, stamp)
+    if cfg is None:
+        import yaml
+
+        with open(path, "r", encoding="utf-8") as f:
+            cfg = yaml.safe_load(f) or {}
+        _write_cache_file(cache_file, stamp, cfg)
+    _parsed[str(path)] = (stamp, cfg)
+    return copy.deepcopy(cfg)
+
+
+def _cache_file(path: Path) -> Path | None:
+    """Where the parsed copy of path is kept (AITOOL_CACHE_DIR, else XDG cache dir); None = off."""
+    root = os.environ.get("AITOOL_CACHE_DIR")
+    if root is None:
+        root = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "ai_integration_tool")
+    if not root:
+        return None
+    name = hashlib.sha256(str(path).encode("utf-8")).hexdigest()[:32]
+    return Path(root) / f"config-{name}.json"
+
+
+def _read_cache_file(cache_file: Path | None, stamp: tuple[int, int]) -> dict[str, Any] | None:
+    if cache_file is None:
+        return None
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("stamp") != list(stamp):
+        return None
+    return data.get("config")
+
+
+def _write_cache_file(cache_file: Path | None, stamp: tuple[int, int], cfg: dict[str, Any]) -> None:
+    """Best effort: configs JSON cannot represent (e.g. YAML dates) and I/O errors are skipped."""
+    if cache_file is None:
+        return
+    try:
+        text = json.dumps({"stamp": list(stamp), "config": cfg}, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return
+    # Round-trip check: JSON would silently turn e.g. tuples or non-str keys into something else
+    if json.loads(text)["config"] != cfg:
+        return
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_name(f".{cache_file.name}.{os.getpid()}.tmp")
+        # Private: the config may hold API keys
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+
+
 def _apply_env_overrides(cfg: dict[str, Any]) -> dict[str, Any]:
     """Inject API keys and folder_id from environment if present."""
     providers = cfg.get("providers", {})
@@ -2,9 +2,10 @@
 from __future__ import annotations
 
 import re
-from typing import Callable
+from typing import Awaitable, Callable, Generator, Iterator
 
-from .providers.base import ChatMessage
+from .chunking import Tokenizer, get_tokenizer
+from .providers.base import ChatMessage, ChatResult
 
 
 # Common patterns that suggest the model was cut off
@@ -15,6 +16,8 @@ TRUNCATION_INDICATORS = (
     r"^$",         # empty (should not continue)
 )
 
+CONTINUE_PROMPT = "Continue exactly from where you left off. Do not repeat the previous text."
+
 
 def looks_truncated(text: str, min_length: int = 20) -> bool:
     """
@@ -36,33 +39,214 @@ def looks_truncated(text: str, min_length: int = 20) -> bool:
     return False
 
 
+def needs_continuation(reply: str, accumulated: str | None = None) -> bool:
+    """
+    Decide whether to ask for more. If the provider reported a finish_reason on
+    the latest reply (a ChatResult), continue only when it stopped at the token
+    limit ("length"); otherwise fall back to looks_truncated on the full text.
+    """
+    finish_reason = getattr(reply, "finish_reason", None)
+    if finish_reason is not None:
+        return finish_reason == "length"
+    return looks_truncated(accumulated if accumulated is not None else reply)
+
+
 def request_continuation(
     get_reply: Callable[[list[ChatMessage]], str],
     messages: list[ChatMessage],
     accumulated: str,
-    overlap_chars: int = 500,
+    context_tokens: int = 200,
     max_continuations: int = 10,
-) -> str:
+    tokenizer: Tokenizer | None = None,
+    on_round: Callable[[int, int], None] | None = None,
+) -> ChatResult:
     """
-    If accumulated response looks truncated, ask the model to continue.
-    get_reply(messages) should return the next chunk. We append a continuation
-    prompt with the last overlap_chars of context.
+    If accumulated response was cut off (see needs_continuation), ask the model
+    to continue. get_reply(messages) should return the next chunk. Each round
+    sends the original messages plus only the last context_tokens tokens of the
+    reply (see continuation_messages), so input size stays flat instead of
+    growing with the reply. Text repeated at the seam is dropped (see stitch).
+    on_round(context_tokens_sent, tokens_saved) is called once per round, where
+    tokens_saved is relative to resending the whole reply.
+    Returns the full text with the last finish_reason and summed usage.
     """
-    result = accumulated
-    continuations = 0
-    while looks_truncated(result) and continuations < max_continuations:
-        context = result[-overlap_chars:] if len(result) > overlap_chars else result
-        continuation_messages = messages + [
-            ChatMessage("assistant", result),
-            ChatMessage(
-                "user",
-                "Continue from where you left off. Do not repeat the previous text. "
-                f"Context (last part): {context}"
-            ),
-        ]
-        next_chunk = get_reply(continuation_messages)
-        if not next_chunk or next_chunk.strip() in result[-200:]:
+    state = _ContinuationState(accumulated, context_tokens, tokenizer, on_round)
+    while state.wants_more() and state.rounds < max_continuations:
+        if not state.absorb(get_reply(state.next_messages(messages))):
+            break
+    return state.result()
+
+
+async def arequest_continuation(
+    get_reply: Callable[[list[ChatMessage]], Awaitable[str]],
+    messages: list[ChatMessage],
+    accumulated: str,
+    context_tokens: int = 200,
+    max_continuations: int = 10,
+    tokenizer: Tokenizer | None = None,
+    on_round: Callable[[int, int], None] | None = None,
+) -> ChatResult:
+    """Async version of request_continuation; get_reply(messages) is awaited."""
+    state = _ContinuationState(accumulated, context_tokens, tokenizer, on_round)
+    while state.wants_more() and state.rounds < max_continuations:
+        if not state.absorb(await get_reply(state.next_messages(messages))):
             break
-        result = result + next_chunk
-        continuations += 1
-    return result
+    return state.result()
+
+
+def stream_continuation(
+    get_stream: Callable[[list[ChatMessage]], Iterator[str]],
+    messages: list[ChatMessage],
+    context_tokens: int = 200,
+    max_continuations: int = 10,
+    tokenizer: Tokenizer | None = None,
+    on_round: Callable[[int, int], None] | None = None,
+    lookahead: int = 512,
+) -> Generator[str, None, tuple[str | None, dict | None]]:
+    """
+    Streaming version of request_continuation: yield the deltas of the reply
+    and of every continuation round as they arrive. get_stream(messages) should
+    return an iterator of deltas (a ChatStream reports finish_reason/usage).
+    The first lookahead chars of each round are held back so text repeated at
+    the seam can be trimmed. Only the end of the reply is kept in memory.
+    Returns (finish_reason, usage) like a provider stream, so the generator can
+    be wrapped in a ChatStream.
+    """
+    tok = tokenizer or get_tokenizer()
+    keep = max(context_tokens * 16, 4096)
+    tail = ""  # end of the reply so far (enough for context, seam and truncation checks)
+    reply_tokens = 0
+    usage: dict | None = None
+    rounds = 0
+    finish_reason: str | None = None
+    request = messages
+    while True:
+        stream = get_stream(request)
+        parts: list[str] = []
+        pending = "" if rounds else None
+        for delta in stream:
+            if pending is not None:
+                pending += delta
+                if len(pending) < lookahead:
+                    continue
+                delta, pending = stitch(tail, pending), None
+            if delta:
+                parts.append(delta)
+                yield delta
+        if pending is not None:
+            # The whole round fit in the lookahead: stop if it adds nothing new
+            addition = stitch(tail, pending)
+            if not addition.strip() or addition.strip() in tail[-200:]:
+                return finish_reason, add_usage(usage, getattr(stream, "usage", None))
+            parts.append(addition)
+            yield addition
+        finish_reason = getattr(stream, "finish_reason", None)
+        usage = add_usage(usage, getattr(stream, "usage", None))
+        round_text = "".join(parts)
+        tail = (tail + round_text)[-keep:]
+        if on_round is not None:
+            reply_tokens += tok.count(round_text)
+        if rounds >= max_continuations or not needs_continuation(ChatResult("", finish_reason), tail):
+            return finish_reason, usage
+        request = continuation_messages(messages, tail, context_tokens, tok)
+        if on_round is not None:
+            sent = tok.count(request[-2].content)
+            on_round(sent, max(0, reply_tokens - sent))
+        rounds += 1
+
+
+def continuation_messages(
+    messages: list[ChatMessage],
+    partial: str,
+    context_tokens: int = 200,
+    tokenizer: Tokenizer | None = None,
+) -> list[ChatMessage]:
+    """
+    Messages asking the model to continue partial: the original messages, the
+    last context_tokens tokens of partial as the assistant turn, and a short
+    instruction.
+    """
+    tok = tokenizer or get_tokenizer()
+    return messages + [
+        ChatMessage("assistant", tok.tail(partial, context_tokens)),
+        ChatMessage("user", CONTINUE_PROMPT),
+    ]
+
+
+def stitch(existing: str, addition: str, min_overlap: int = 16, max_overlap: int = 2000) -> str:
+    """
+    Return addition without any prefix that repeats the end of existing
+    (models often restate the last sentence when continuing). Overlaps shorter
+    than min_overlap chars are kept, as they are likely coincidental.
+    """
+    for candidate in (addition, addition.lstrip()):
+        tail = existing[-max_overlap:]
+        probe = candidate[:min_overlap]
+        if len(probe) < min_overlap:
+            continue
+        pos = tail.find(probe)
+        while pos != -1:
+            seam = tail[pos:]
+            if candidate.startswith(seam):
+                return candidate[len(seam):]
+            pos = tail.find(probe, pos + 1)
+    return addition
+
+
+class _ContinuationState:
+    """Accumulated reply plus bookkeeping shared by the sync and async loops."""
+
+    def __init__(
+        self,
+        accumulated: str,
+        context_tokens: int,
+        tokenizer: Tokenizer | None,
+        on_round: Callable[[int, int], None] | None,
+    ):
+        self.tokenizer = tokenizer or get_tokenizer()
+        self.context_tokens = context_tokens
+        self.on_round = on_round
+        self.text = str(accumulated)
+        self.last = accumulated
+        self.usage = getattr(accumulated, "usage", None)
+        self.rounds = 0
+        self._reply_tokens: int | None = None
+
+    def wants_more(self) -> bool:
+        return needs_continuation(self.last, self.text)
+
+    def next_messages(self, messages: list[ChatMessage]) -> list[ChatMessage]:
+        cont = continuation_messages(messages, self.text, self.context_tokens, self.tokenizer)
+        if self.on_round is not None:
+            if self._reply_tokens is None:
+                self._reply_tokens = self.tokenizer.count(self.text)
+            sent = self.tokenizer.count(cont[-2].content)
+            self.on_round(sent, max(0, self._reply_tokens - sent))
+        return cont
+
+    def absorb(self, next_chunk: str) -> bool:
+        """Append the next reply; False if the model had nothing new to add."""
+        self.usage = add_usage(self.usage, getattr(next_chunk, "usage", None))
+        addition = stitch(self.text, next_chunk)
+        if not addition.strip() or addition.strip() in self.text[-200:]:
+            return False
+        self.text += addition
+        self.last = next_chunk
+        self.rounds += 1
+        if self._reply_tokens is not None:
+            self._reply_tokens += self.tokenizer.count(addition)
+        return True
+
+    def result(self) -> ChatResult:
+        return ChatResult(self.text, getattr(self.last, "finish_reason", None), self.usage)
+
+
+def add_usage(a: dict | None, b: dict | None) -> dict | None:
+    """Sum two token-usage dicts (numeric fields only); None if neither is known."""
+    if not a or not b:
+        return dict(a or b) if (a or b) else None
+    total = dict(a)
+    for k, v in b.items():
+        if isinstance(v, (int, float)) and isinstance(total.get(k, 0), (int, float)):
+            total[k] = total.get(k, 0) + v
+    return total
@@ -0,0 +1,194 @@
+"""Multi-turn chat history kept within a token budget, with optional summaries of older turns."""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Generator, Iterator
+
+from .chunking import Tokenizer, get_tokenizer
+from .providers.base import ChatMessage, ChatResult, ChatStream
+
+if TYPE_CHECKING:
+    from .orchestrator import AIOrchestrator
+
+# Approximate per-message framing overhead (role, separators) in chat formats
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = (
+    "Summarize the conversation below for your own later reference. Keep facts, "
+    "names, decisions, open questions and the user's preferences; be concise. "
+    "Reply with the summary only."
+)
+
+
+class Conversation:
+    """
+    Chat history sent with every turn, trimmed to max_history_tokens: the
+    system prompt, a summary of older turns (if any) and the newest messages
+    that fit. Token counts are computed once per message and cached on it.
+    Turns that no longer fit are dropped, or with summarize=True folded into
+    the running summary by a background request once at least
+    summarize_min_tokens of them have accumulated, so the reply is never
+    delayed by summarization.
+    """
+
+    def __init__(
+        self,
+        orch: AIOrchestrator,
+        system_prompt: str | None = None,
+        model: str | None = None,
+        provider: str | None = None,
+        max_history_tokens: int = 4000,
+        summarize: bool = False,
+        summarize_min_tokens: int = 500,
+        tokenizer: Tokenizer | None = None,
+    ):
+        self.orch = orch
+        self.model = model
+        self.provider = provider
+        self.max_history_tokens = max_history_tokens
+        self.summarize = summarize
+        self.summarize_min_tokens = summarize_min_tokens
+        self.tokenizer = tokenizer or get_tokenizer()
+        self.system = ChatMessage("system", system_prompt) if system_prompt else None
+        self.summary: ChatMessage | None = None
+        self.messages: list[ChatMessage] = []
+        # messages[:_dropped] no longer fit the budget and await summarization
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._summarizer: ThreadPoolExecutor | None = None
+        self._summarizing: Future | None = None
+
+    @classmethod
+    def from_config(
+        cls,
+        orch: AIOrchestrator,
+        model: str | None = None,
+        provider: str | None = None,
+    ) -> "Conversation":
+        cfg = orch.config.get("conversation", {}) or {}
+        return cls(
+            orch,
+            system_prompt=cfg.get("system_prompt"),
+            model=model,
+            provider=provider,
+            max_history_tokens=int(cfg.get("max_history_tokens", 4000)),
+            summarize=bool(cfg.get("summarize", False)),
+            summarize_min_tokens=int(cfg.get("summarize_min_tokens", 500)),
+        )
+
+    def count(self, message: ChatMessage) -> int:
+        """Token count of a message, computed on first use and cached on it."""
+        if message.tokens is None:
+            message.tokens = self.tokenizer.count(message.content) + MESSAGE_OVERHEAD_TOKENS
+        return message.tokens
+
+    def context(self) -> list[ChatMessage]:
+        """Messages to send for the next reply (always includes the newest message)."""
+        with self._lock:
+            head = [m for m in (self.system, self.summary) if m is not None]
+            budget = self.max_history_tokens - sum(self.count(m) for m in head)
+            start = len(self.messages)
+            while start > 0:
+                tokens = self.count(self.messages[start - 1])
+                if tokens > budget and start < len(self.messages):
+                    break
+                budget -= tokens
+                start -= 1
+            self._drop_before(start)
+            return head + self.messages[self._dropped:]
+
+    def _drop_before(self, start: int) -> None:
+        # Messages before start no longer fit. Without summaries they are
+        # forgotten; otherwise they wait (out of context) to be summarized.
+        if not self.summarize:
+            del self.messages[:start]
+            self._dropped = 0
+            return
+        self._dropped = start
+
+    def send(self, text: str, stream: bool = False, auto_continue: bool = True) -> str | Iterator[str]:
+        """
+        Add a user message and return the reply (a ChatResult, or with
+        stream=True an iterator of deltas). The reply joins the history once
+        complete; a failed or abandoned reply leaves only the user message.
+        """
+        with self._lock:
+            self.messages.append(ChatMessage("user", text))
+        messages = self.context()
+        out = self.orch.chat_messages(
+            messages,
+            model=self.model,
+            provider=self.provider,
+            stream=stream,
+            auto_continue=auto_continue,
+        )
+        if stream:
+            return ChatStream(self._record_stream(out))
+        self._add_reply(out)
+        return out
+
+    def _record_stream(self, out: ChatStream) -> Generator[str, None, tuple[str | None, dict | None]]:
+        parts: list[str] = []
+        for delta in out:
+            parts.append(delta)
+            yield delta
+        self._add_reply(ChatResult("".join(parts), out.finish_reason, out.usage))
+        return out.finish_reason, out.usage
+
+    def _add_reply(self, reply: str) -> None:
+        with self._lock:
+            self.messages.append(ChatMessage("assistant", str(reply)))
+        self._maybe_summarize()
+
+    def _maybe_summarize(self) -> None:
+        if not self.summarize:
+            return
+        with self._lock:
+            if self._summarizing is not None and not self._summarizing.done():
+                return
+            old = self.messages[:self._dropped]
+            if sum(self.count(m) for m in old) < self.summarize_min_tokens:
+                return
+            if self._summarizer is None:
+                self._summarizer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summarize")
+            self._summarizing = self._summarizer.submit(self._summarize, old, self.summary)
+
+    def _summarize(self, old: list[ChatMessage], previous: ChatMessage | None) -> None:
+        lines = []
+        if previous is not None:
+            lines.append(previous.content)
+        lines.extend(f"{m.role}: {m.content}" for m in old)
+        reply = self.orch.chat_messages(
+            [ChatMessage("system", SUMMARY_PROMPT), ChatMessage("user", "\n\n".join(lines))],
+            model=self.model,
+            provider=self.provider,
+        )
+        with self._lock:
+            self.summary = ChatMessage("system", f"Summary of the earlier conversation:\n{reply}")
+            # Only appends happen meanwhile, so the summarized turns are still the prefix
+            del self.messages[:len(old)]
+            self._dropped = max(0, self._dropped - len(old))
+
+    def reset(self) -> None:
+        """Forget the history and summary (the system prompt stays)."""
+        self.wait()
+        with self._lock:
+            self.messages.clear()
+            self.summary = None
+            self._dropped = 0
+
+    def wait(self) -> None:
+        """Wait for a background summary in progress (its errors are ignored)."""
+        future = self._summarizing
+        if future is not None:
+            try:
+                future.result()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        self.wait()
+        if self._summarizer is not None:
+            self._summarizer.shutdown()
+            self._summarizer = None
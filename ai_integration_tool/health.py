@@ -0,0 +1,294 @@
+"""Live provider/model health: rolling stats and circuit breakers for routing."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Iterator
+
+from .providers.base import ProviderError
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# How often a caller waiting on another caller's probe checks its outcome
+PROBE_POLL_SECONDS = 0.05
+
+
+class CircuitOpenError(ProviderError):
+    """A provider/model was skipped because its circuit breaker is open."""
+
+    @property
+    def retryable(self) -> bool:
+        return False
+
+
+class ProviderHealth:
+    """
+    Rolling stats for one provider/model: EWMAs of success rate, latency and
+    time to first token, plus circuit breaker state. Updated under the
+    tracker's lock.
+    """
+
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.success_rate = 1.0
+        self.latency: float | None = None
+        self.ttft: float | None = None
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.requests = 0
+        self.failures = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "success_rate": round(self.success_rate, 4),
+            "latency_ewma_s": None if self.latency is None else round(self.latency, 4),
+            "ttft_ewma_s": None if self.ttft is None else round(self.ttft, 4),
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+def _ewma(previous: float | None, sample: float, alpha: float) -> float:
+    return sample if previous is None else alpha * sample + (1 - alpha) * previous
+
+
+class HealthTracker:
+    """
+    Health of every provider/model used by an orchestrator. After
+    failure_threshold consecutive failed attempts a circuit opens and calls to
+    it are refused at once (CircuitOpenError); after cooldown_seconds a single
+    probe request is let through (half-open) and its outcome closes or re-opens
+    the circuit. A caller with no other route can wait for the probe instead
+    (track(..., wait=True)). order() puts healthy routes first. With enabled=False stats
+    are still kept but nothing is skipped or reordered. listener, if given, is
+    called after every tracked request with (provider, model, outcome, latency,
+    ttft, usage); outcome is "success", "failure" or "other".
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        alpha: float = 0.2,
+        min_success_rate: float = 0.5,
+        prefer_fastest: bool = False,
+        is_failure: Callable[[Exception], bool] | None = None,
+        listener: Callable[[str, str, str, float, float | None, dict | None], None] | None = None,
+    ):
+        self.enabled = enabled
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.alpha = alpha
+        self.min_success_rate = min_success_rate
+        self.prefer_fastest = prefer_fastest
+        self.is_failure = is_failure or (lambda e: True)
+        self.listener = listener
+        self._routes: dict[tuple[str, str], ProviderHealth] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls,
+        config: dict,
+        is_failure: Callable[[Exception], bool] | None = None,
+        listener: Callable[[str, str, str, float, float | None, dict | None], None] | None = None,
+    ) -> "HealthTracker":
+        cfg = config.get("health", {}) or {}
+        return cls(
+            enabled=cfg.get("enabled", True),
+            failure_threshold=int(cfg.get("failure_threshold", 3)),
+            cooldown_seconds=float(cfg.get("cooldown_seconds", 30)),
+            alpha=float(cfg.get("ewma_alpha", 0.2)),
+            min_success_rate=float(cfg.get("min_success_rate", 0.5)),
+            prefer_fastest=bool(cfg.get("prefer_fastest", False)),
+            is_failure=is_failure,
+            listener=listener,
+        )
+
+    def _get(self, provider: str, model: str) -> ProviderHealth:
+        health = self._routes.get((provider, model))
+        if health is None:
+            health = self._routes[(provider, model)] = ProviderHealth()
+        return health
+
+    def _available(self, health: ProviderHealth, now: float) -> bool:
+        if health.state == CLOSED:
+            return True
+        if health.state == OPEN:
+            return now - health.opened_at >= self.cooldown_seconds
+        return not health.probe_in_flight
+
+    def allow(self, provider: str, model: str) -> bool:
+        """True if a request may be sent now (claims the probe slot when half-open)."""
+        if not self.enabled:
+            return True
+        with self._lock:
+            health = self._get(provider, model)
+            if not self._available(health, time.monotonic()):
+                return False
+            if health.state != CLOSED:
+                health.state = HALF_OPEN
+                health.probe_in_flight = True
+            return True
+
+    def record_success(
+        self, provider: str, model: str, latency: float | None = None, ttft: float | None = None
+    ) -> None:
+        with self._lock:
+            health = self._get(provider, model)
+            health.requests += 1
+            health.success_rate = _ewma(health.success_rate, 1.0, self.alpha)
+            if latency is not None:
+                health.latency = _ewma(health.latency, latency, self.alpha)
+            if ttft is not None:
+                health.ttft = _ewma(health.ttft, ttft, self.alpha)
+            health.consecutive_failures = 0
+            health.state = CLOSED
+            health.probe_in_flight = False
+
+    def record_failure(self, provider: str, model: str) -> None:
+        with self._lock:
+            health = self._get(provider, model)
+            health.requests += 1
+            health.failures += 1
+            health.success_rate = _ewma(health.success_rate, 0.0, self.alpha)
+            health.consecutive_failures += 1
+            if health.state == HALF_OPEN or health.consecutive_failures >= self.failure_threshold:
+                health.state = OPEN
+                health.opened_at = time.monotonic()
+            health.probe_in_flight = False
+
+    def release(self, provider: str, model: str) -> None:
+        """End a request that says nothing about health (e.g. cancelled, bad request)."""
+        with self._lock:
+            self._get(provider, model).probe_in_flight = False
+
+    def track(self, provider: str, model: str, wait: bool = False) -> "_TrackedCall":
+        """
+        Context manager around one request: raises CircuitOpenError if the route
+        is unavailable, then records success (latency, and TTFT if first_token()
+        was called), failure (per is_failure) or nothing, depending on how the
+        block exits. Set .usage inside the block to pass token usage to the listener;
+        report time the block spends suspended (e.g. at a yield) with exclude().
+        With wait=True an open circuit is waited out rather than refused: the
+        call sleeps until it may send the probe, or until another caller's probe
+        has closed the circuit, and raises CircuitOpenError only if that probe fails.
+        """
+        if wait:
+            for seconds in self._probe_waits(provider, model):
+                time.sleep(seconds)
+        elif not self.allow(provider, model):
+            raise self._open_error(provider, model)
+        return _TrackedCall(self, provider, model)
+
+    async def atrack(self, provider: str, model: str, wait: bool = False) -> "_TrackedCall":
+        """track() for use on an event loop: waits with asyncio.sleep."""
+        import asyncio
+
+        if wait:
+            for seconds in self._probe_waits(provider, model):
+                await asyncio.sleep(seconds)
+        elif not self.allow(provider, model):
+            raise self._open_error(provider, model)
+        return _TrackedCall(self, provider, model)
+
+    def _probe_waits(self, provider: str, model: str) -> Iterator[float]:
+        """Seconds to sleep, one wait at a time, until a request on the route is allowed."""
+        with self._lock:
+            opened_at = self._get(provider, model).opened_at
+        while not self.allow(provider, model):
+            with self._lock:
+                health = self._get(provider, model)
+                if health.state == OPEN and health.opened_at != opened_at:
+                    reopened, remaining = True, 0.0
+                elif health.state == OPEN:
+                    reopened = False
+                    remaining = self.cooldown_seconds - (time.monotonic() - health.opened_at)
+                else:  # half-open: another caller's probe is in flight
+                    reopened, remaining = False, 0.0
+            if reopened:
+                raise self._open_error(provider, model)
+            yield max(PROBE_POLL_SECONDS, remaining)
+
+    def _open_error(self, provider: str, model: str) -> CircuitOpenError:
+        return CircuitOpenError(
+            f"{provider}/{model}: circuit open, retrying in {self.retry_in(provider, model):.0f}s"
+        )
+
+    def retry_in(self, provider: str, model: str) -> float:
+        """Seconds until an open circuit lets a probe through (0 if not open)."""
+        with self._lock:
+            health = self._routes.get((provider, model))
+            if health is None or health.state != OPEN:
+                return 0.0
+            return max(0.0, self.cooldown_seconds - (time.monotonic() - health.opened_at))
+
+    def order(self, routes: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        """
+        Sort (provider, model) routes for a call: available and healthy ones in
+        configured order (or fastest first with prefer_fastest), then degraded
+        ones by success rate, then open circuits (which will be skipped).
+        """
+        if not self.enabled:
+            return routes
+        now = time.monotonic()
+        with self._lock:
+            def key(item: tuple[int, tuple[str, str]]):
+                index, route = item
+                health = self._routes.get(route)
+                if health is None:
+                    return (0, 0.0, index)
+                if not self._available(health, now):
+                    return (2, 0.0, index)
+                if health.success_rate < self.min_success_rate:
+                    return (1, -health.success_rate, index)
+                if self.prefer_fastest and health.latency is not None:
+                    return (0, health.latency, index)
+                return (0, 0.0, index)
+
+            return [route for _, route in sorted(enumerate(routes), key=key)]
+
+    def snapshot(self) -> dict[str, dict]:
+        """Current stats per "provider/model"."""
+        with self._lock:
+            return {f"{p}/{m}": h.as_dict() for (p, m), h in self._routes.items()}
+
+
+class _TrackedCall:
+    def __init__(self, tracker: HealthTracker, provider: str, model: str):
+        self.tracker = tracker
+        self.provider = provider
+        self.model = model
+        self.started = time.monotonic()
+        self.ttft: float | None = None
+        self.usage: dict | None = None
+        self.excluded = 0.0
+
+    def __enter__(self) -> "_TrackedCall":
+        return self
+
+    def first_token(self) -> None:
+        if self.ttft is None:
+            self.ttft = time.monotonic() - self.started - self.excluded
+
+    def exclude(self, seconds: float) -> None:
+        """Leave time spent outside the request (a stream waiting on its consumer) out of the latency."""
+        self.excluded += seconds
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        latency = time.monotonic() - self.started - self.excluded
+        if exc is None:
+            outcome = "success"
+            self.tracker.record_success(self.provider, self.model, latency, self.ttft)
+        elif isinstance(exc, Exception) and self.tracker.is_failure(exc):
+            outcome = "failure"
+            self.tracker.record_failure(self.provider, self.model)
+        else:
+            outcome = "other"
+            self.tracker.release(self.provider, self.model)
+        if self.tracker.listener is not None:
+            self.tracker.listener(self.provider, self.model, outcome, latency, self.ttft, self.usage)
+        return False
@@ -0,0 +1,194 @@
+"""Hedged requests: race a backup provider/model when the primary is slow to answer."""
+from __future__ import annotations
+
+import math
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+# fn(first_token, cancelled) -> result; call first_token() when the first output arrives
+RaceCall = Callable[[Callable[[], None], "Cancellation"], T]
+
+
+class HedgeCancelled(Exception):
+    """Raised inside a racing request once another request has won."""
+
+
+class Cancellation:
+    """
+    Cancel flag of one racing request. Callbacks registered with on_cancel
+    (e.g. aborting the request's response stream) run when it is set, or at
+    once if it already is.
+    """
+
+    def __init__(self) -> None:
+        self._set = False
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def is_set(self) -> bool:
+        return self._set
+
+    def set(self) -> None:
+        with self._lock:
+            if self._set:
+                return
+            self._set = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            _call_quietly(callback)
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if not self._set:
+                self._callbacks.append(callback)
+                return
+        _call_quietly(callback)
+
+
+def _call_quietly(callback: Callable[[], None]) -> None:
+    try:
+        callback()
+    except Exception:
+        pass
+
+
+class HedgePolicy:
+    """
+    When to hedge: after the given percentile of recently observed
+    time-to-first-token (TTFT) for the primary provider/model. Until
+    min_samples observations exist, initial_delay is used. A primary that lost
+    the race before its first token should still be recorded, with the time it
+    had waited (a lower bound), or the delay drifts towards the fast requests.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        initial_delay: float = 5.0,
+        min_samples: int = 20,
+        window: int = 200,
+        min_delay: float = 0.05,
+        alternate_model: str | None = None,
+    ):
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.min_delay = min_delay
+        self.alternate_model = alternate_model
+        self._samples: dict[tuple[str, str], deque[float]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict) -> "HedgePolicy | None":
+        """Build the policy from config['hedging'], or None if hedging is off."""
+        cfg = config.get("hedging", {}) or {}
+        if not cfg.get("enabled", False):
+            return None
+        return cls(
+            percentile=float(cfg.get("percentile", 95)),
+            initial_delay=float(cfg.get("initial_delay_seconds", 5)),
+            min_samples=int(cfg.get("min_samples", 20)),
+            window=int(cfg.get("window", 200)),
+            alternate_model=cfg.get("alternate_model"),
+        )
+
+    def record(self, provider: str, model: str, ttft: float) -> None:
+        with self._lock:
+            samples = self._samples.get((provider, model))
+            if samples is None:
+                samples = self._samples[(provider, model)] = deque(maxlen=self.window)
+            samples.append(ttft)
+
+    def delay(self, provider: str, model: str) -> float:
+        """Seconds to wait for the first token before starting a hedge."""
+        with self._lock:
+            samples = sorted(self._samples.get((provider, model), ()))
+        if len(samples) < self.min_samples:
+            return self.initial_delay
+        idx = min(len(samples) - 1, math.ceil(self.percentile / 100 * len(samples)) - 1)
+        return max(self.min_delay, samples[max(0, idx)])
+
+
+def race(
+    calls: list[RaceCall[T]],
+    hedge_delay: float,
+    executor: Executor,
+    on_hedge: Callable[[int], None] | None = None,
+) -> tuple[int, T]:
+    """
+    Run calls[0]; if it has produced no first token after hedge_delay seconds
+    (or fails before producing one), also start calls[1], and so on. The first
+    call to produce a token wins: the others are cancelled (their Cancellation
+    is set, and calls not yet started are dropped) and the winner's result is
+    returned as (index, result). If the winner fails, or every call fails, the
+    error is raised. Calls run on executor, which bounds the threads used by
+    hedging; a cancelled loser is not waited for. on_hedge(i) is called when
+    the hedge delay starts calls[i], not when a failure does.
+    """
+    events: queue.Queue[tuple[str, int, object]] = queue.Queue()
+    cancel: list[Cancellation] = []
+    futures: list[Future] = []
+    running: set[int] = set()
+
+    def run(i: int) -> None:
+        try:
+            result = calls[i](lambda: events.put(("first", i, None)), cancel[i])
+            events.put(("done", i, result))
+        except BaseException as e:
+            events.put(("error", i, e))
+
+    def start(i: int) -> None:
+        cancel.append(Cancellation())
+        running.add(i)
+        futures.append(executor.submit(run, i))
+
+    def cancel_others(winner: int) -> None:
+        for j, cancellation in enumerate(cancel):
+            if j != winner:
+                futures[j].cancel()
+                cancellation.set()
+
+    start(0)
+    deadline = time.monotonic() + hedge_delay
+    winner: int | None = None
+    last_error: BaseException | None = None
+    while True:
+        timeout = None
+        if winner is None and len(cancel) < len(calls):
+            timeout = max(0.0, deadline - time.monotonic())
+        try:
+            kind, i, value = events.get(timeout=timeout)
+        except queue.Empty:
+            start(len(cancel))
+            if on_hedge is not None:
+                on_hedge(len(cancel) - 1)
+            deadline = time.monotonic() + hedge_delay
+            continue
+        if kind == "first":
+            if winner is None:
+                winner = i
+                cancel_others(i)
+        elif kind == "done":
+            # A call may finish without signalling a first token (empty reply)
+            if winner is None or winner == i:
+                cancel_others(i)
+                return i, value  # type: ignore[return-value]
+        else:
+            running.discard(i)
+            if winner == i:
+                raise value  # type: ignore[misc]
+            if winner is not None:
+                continue
+            last_error = value  # type: ignore[assignment]
+            if not running:
+                if len(cancel) >= len(calls):
+                    raise last_error
+                start(len(cancel))
+                deadline = time.monotonic() + hedge_delay
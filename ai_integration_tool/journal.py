@@ -0,0 +1,111 @@
+"""Run journal: durable record of finished chunks so a failed run can be resumed."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from .providers.base import ChatResult
+
+
+class RunJournal:
+    """
+    Append-only JSONL file with one record per completed chunk: its index, a
+    hash of the request (chunk text, system prompt, model, provider) and the
+    response. Every record is flushed and fsync'd before the chunk counts as
+    done. With resume=True an existing journal is loaded and its responses are
+    reused for chunks whose hash matches; otherwise the file is started afresh,
+    and a non-empty journal left by an earlier run is first moved aside to
+    <name>.old (the path is kept in `previous`) rather than truncated.
+    """
+
+    def __init__(self, path: str | Path, resume: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._done: dict[str, ChatResult] = {}
+        # Keys of records loaded from an earlier run (not those recorded by this one)
+        self._loaded: set[str] = set()
+        self._lock = threading.Lock()
+        self.previous: Path | None = None
+        if resume and self.path.exists():
+            self._load()
+            self._file = open(self.path, "a", encoding="utf-8")
+            # A crash may have left a torn last line; start the next record cleanly
+            if self.path.stat().st_size and not self._ends_with_newline():
+                self._file.write("\n")
+        else:
+            if self.path.exists() and self.path.stat().st_size:
+                self.previous = self.path.with_name(self.path.name + ".old")
+                os.replace(self.path, self.previous)
+            self._file = open(self.path, "w", encoding="utf-8")
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    self._done[rec["key"]] = ChatResult(
+                        rec["response"], rec.get("finish_reason"), rec.get("usage")
+                    )
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue  # torn or foreign line
+        self._loaded = set(self._done)
+
+    @staticmethod
+    def chunk_key(
+        chunk: str,
+        system_prompt: str | None = None,
+        model: str | None = None,
+        provider: str | None = None,
+    ) -> str:
+        payload = json.dumps([chunk, system_prompt, model, provider], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def get(self, key: str) -> ChatResult | None:
+        """Return the journaled response for key, or None if that chunk is not done."""
+        with self._lock:
+            return self._done.get(key)
+
+    def resumed(self, key: str) -> bool:
+        """True if key's response was loaded from an earlier run (with resume=True)."""
+        return key in self._loaded
+
+    def record(self, index: int, key: str, response: str) -> None:
+        """Durably append a completed chunk (safe to call from worker threads)."""
+        line = json.dumps(
+            {
+                "index": index,
+                "key": key,
+                "response": str(response),
+                "finish_reason": getattr(response, "finish_reason", None),
+                "usage": getattr(response, "usage", None),
+            },
+            ensure_ascii=False,
+        )
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._done[key] = ChatResult(
+                str(response), getattr(response, "finish_reason", None), getattr(response, "usage", None)
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def remove(self) -> None:
+        """Close and delete the journal (call once the whole run has succeeded)."""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,178 @@
+"""In-process run metrics: labelled counters and histograms, JSON and Prometheus output."""
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import threading
+import time
+from pathlib import Path
+
+from .output_manager import write_atomic
+
+# Bucket upper bounds (seconds) for latency-like histograms
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+# Bucket upper bounds for output tokens per second
+RATE_BUCKETS = (1, 5, 10, 25, 50, 100, 200, 400, 800)
+
+# Metric descriptions (Prometheus HELP lines); names without an entry get a generic one
+HELP = {
+    "aitool_requests_total": "Provider requests by outcome (success, failure, other).",
+    "aitool_request_latency_seconds": "Provider request latency, request start to last byte.",
+    "aitool_ttft_seconds": "Time to first token of streamed provider requests.",
+    "aitool_output_tokens_per_second": "Completion tokens per second of generation.",
+    "aitool_tokens_total": "Tokens reported by the API (kind=prompt|completion).",
+    "aitool_http_bytes_total": "HTTP body bytes transferred (direction=sent|received).",
+    "aitool_retry_delay_seconds": "Backoff sleeps before a retry.",
+    "aitool_rate_limit_wait_seconds": "Time spent waiting for client-side rate limits.",
+    "aitool_chunk_latency_seconds": "Time to finish one input chunk, continuations included.",
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus style) with count, sum, min and max."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last = +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i else max(0.0, self.min)
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                return lower + (upper - lower) * ((rank - seen) / n)
+            seen += n
+        return self.max
+
+    def summary(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6),
+            "min": round(self.min, 6),
+            "max": round(self.max, 6),
+            "p50": round(self.quantile(0.50), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "p99": round(self.quantile(0.99), 6),
+        }
+
+
+def _label_key(labels: dict) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _label_text(key: tuple[tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Metrics:
+    """
+    Thread-safe registry of labelled counters and histograms for one run.
+    inc("aitool_retries_total", provider="openrouter") / observe(name, value, **labels).
+    """
+
+    def __init__(self) -> None:
+        self.started = time.time()
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._histograms: dict[str, dict[tuple, Histogram]] = {}
+        self._buckets: dict[str, tuple[float, ...]] = {"aitool_output_tokens_per_second": RATE_BUCKETS}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, n: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + n
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram(self._buckets.get(name, LATENCY_BUCKETS))
+            hist.observe(value)
+
+    def counter(self, name: str, **labels) -> float:
+        """Current value of one counter series (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def snapshot(self) -> dict:
+        """JSON-friendly summary: counters and histogram summaries per label set."""
+        def label_name(key: tuple) -> str:
+            return ",".join(f"{k}={v}" for k, v in key) or "all"
+
+        with self._lock:
+            return {
+                "started": self.started,
+                "duration_s": round(time.time() - self.started, 3),
+                "counters": {
+                    name: {label_name(k): v for k, v in sorted(series.items())}
+                    for name, series in sorted(self._counters.items())
+                },
+                "histograms": {
+                    name: {label_name(k): h.summary() for k, h in sorted(series.items())}
+                    for name, series in sorted(self._histograms.items())
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (for the node_exporter textfile collector)."""
+        lines: list[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# HELP {name} {HELP.get(name, name.replace('_', ' ') + '.')}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_label_text(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# HELP {name} {HELP.get(name, name.replace('_', ' ') + '.')}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, hist in sorted(series.items()):
+                    cumulative = 0
+                    for bound, n in zip(hist.buckets, hist.counts):
+                        cumulative += n
+                        le = 'le="%g"' % bound
+                        lines.append(f"{name}_bucket{_label_text(key, le)} {cumulative}")
+                    le = 'le="+Inf"'
+                    lines.append(f"{name}_bucket{_label_text(key, le)} {hist.count}")
+                    lines.append(f"{name}_sum{_label_text(key)} {hist.sum:g}")
+                    lines.append(f"{name}_count{_label_text(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str | Path, extra: dict | None = None) -> None:
+        data = self.snapshot()
+        if extra:
+            data.update(extra)
+        write_atomic(Path(path), json.dumps(data, indent=2, ensure_ascii=False) + "\n")
+
+    def write_prometheus(self, path: str | Path) -> None:
+        write_atomic(Path(path), self.to_prometheus())
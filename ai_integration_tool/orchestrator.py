@@ -3,19 +3,50 @@ Main orchestrator: chunking, provider fallback, retries, continuation, streaming
 """
 from __future__ import annotations
 
-from typing import Iterator
+import json
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Generator, Iterable, Iterator
 
-from .chunking import chunk_text, estimate_tokens
+from .cache import ResponseCache, cache_from_config
+from .chunking import chunk_text, estimate_tokens, get_tokenizer
 from .config_loader import load_config
-from .continuation import request_continuation
+from .continuation import (
+    arequest_continuation,
+    continuation_messages,
+    request_continuation,
+    stitch,
+    stream_continuation,
+)
+from .health import HealthTracker
+from .hedging import HedgeCancelled, HedgePolicy, race
+from .journal import RunJournal
+from .metrics import Metrics
 from .output_manager import OutputManager
+from .ratelimit import RateLimiter, RateLimits
 from .providers import get_provider
-from .providers.base import ChatMessage, ProviderError
-from .retry import with_retry
+from .providers.base import (
+    AsyncChatStream,
+    BaseProvider,
+    ChatMessage,
+    ChatResult,
+    ChatStream,
+    ProviderError,
+    collect_result,
+)
+from .retry import RetryBudget, async_with_retry, next_delay, retry_delay, with_retry
+
+# Chars of a resumed stream buffered before trimming text it repeats
+STREAM_SEAM_LOOKAHEAD = 512
 
 
 def _is_retryable(e: Exception) -> bool:
-    if isinstance(e, (ProviderError, TimeoutError, ConnectionError)):
+    if isinstance(e, ProviderError):
+        return e.retryable
+    if isinstance(e, (TimeoutError, ConnectionError)):
         return True
     if hasattr(e, "response") and getattr(e, "response") is not None:
         status = getattr(getattr(e, "response"), "status_code", None)
@@ -24,6 +55,37 @@ def _is_retryable(e: Exception) -> bool:
     return False
 
 
+def _is_outage(e: Exception) -> bool:
+    """Errors that count against a provider's health (429 means it is up, just busy)."""
+    return _is_retryable(e) and getattr(e, "status_code", None) != 429
+
+
+def _estimate_input_tokens(messages: list[ChatMessage]) -> int:
+    return sum(estimate_tokens(m.content) for m in messages)
+
+
+def _replay(result: ChatResult) -> ChatStream:
+    """A one-chunk stream carrying a stored result's finish_reason and usage."""
+    def chunks():
+        yield str(result)
+        return result.finish_reason, result.usage
+
+    return ChatStream(chunks())
+
+
+class _StreamError:
+    """Carries a worker's exception through an event queue to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+async def _areplay_chunks(result: ChatResult) -> AsyncIterator[str | tuple[str | None, dict | None]]:
+    """Async _replay: the stored text, then its finish_reason and usage (see AsyncChatStream)."""
+    yield str(result)
+    yield result.finish_reason, result.usage
+
+
 class AIOrchestrator:
     """
     Single entry point: process long texts with chunking, use multiple providers
@@ -35,26 +97,163 @@ class AIOrchestrator:
         self.max_input_tokens = self.config.get("max_input_tokens", 4000)
         self.max_output_tokens = self.config.get("max_output_tokens", 4096)
         self.continuation_overlap = self.config.get("continuation_overlap", 200)
+        self.max_continuations = self.config.get("max_continuations", 10)
         retry_cfg = self.config.get("retry", {})
         self.retry_attempts = retry_cfg.get("max_attempts", 3)
         self.timeout = retry_cfg.get("timeout_seconds", 120)
+        self.connect_timeout = retry_cfg.get("connect_timeout_seconds", 10)
+        self.retry_min_delay = retry_cfg.get("min_delay_seconds", 1)
+        self.retry_max_delay = retry_cfg.get("max_delay_seconds", 30)
+        # Shared by every call made through this orchestrator (one run)
+        self.retry_budget = RetryBudget(retry_cfg.get("budget"))
+        # Client-side rpm/tpm limits from providers.<name>.models[]
+        self.rate_limits = RateLimits(self.config)
+        self.concurrency = max(1, int(self.config.get("concurrency", 1)))
+        # Run metrics (counters and histograms; see metrics.py)
+        self.metrics = Metrics()
+        # Live per provider/model health with circuit breakers (config 'health')
+        self.health = HealthTracker.from_config(
+            self.config, is_failure=_is_outage, listener=self._observe_request
+        )
+        # Optional hedged requests (config 'hedging'); None = off
+        self.hedging: HedgePolicy | None = HedgePolicy.from_config(self.config)
+        # Racing requests run here, so losers still winding down stay bounded and are joined on close()
+        self._hedge_pool: ThreadPoolExecutor | None = None
+        if self.hedging is not None:
+            self._hedge_pool = ThreadPoolExecutor(
+                max_workers=int((self.config.get("hedging") or {}).get("max_workers", 4 * self.concurrency)),
+                thread_name_prefix="hedge",
+            )
         out_cfg = self.config.get("output", {})
         self.output = OutputManager(
             output_dir=out_cfg.get("directory", "./output"),
             prefix=out_cfg.get("filename_prefix", "output"),
             extension=out_cfg.get("extension", ".txt"),
+            per_run_dir=bool(out_cfg.get("per_run_subdir", False)),
+            background=bool(out_cfg.get("background_writer", False)),
+            jsonl=out_cfg.get("jsonl"),
         )
         self.fallback_providers = self.config.get("fallback_providers", ["openrouter"])
         self.default_provider = self.config.get("default_provider", "openrouter")
         self.default_model = self.config.get("default_model", "deepseek/deepseek-chat")
+        # Long-lived provider instances (and their connection pools), keyed by name + config
+        self._providers: dict[tuple[str, str], BaseProvider] = {}
+        self._providers_lock = threading.Lock()
+        # Optional on-disk response cache; refresh skips lookups but still stores
+        self.cache: ResponseCache | None = cache_from_config(self.config)
+        self.cache_refresh = bool((self.config.get("cache") or {}).get("refresh", False))
+        # Run counters (e.g. cache_hits, cache_misses); mirrored in metrics as aitool_<name>_total
+        self.stats: Counter[str] = Counter()
+        self._stats_lock = threading.Lock()
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add n to run counter name: orch.stats[name], and aitool_<name>_total in metrics."""
+        with self._stats_lock:
+            self.stats[name] += n
+        self.metrics.inc(f"aitool_{name}_total", n)
 
-    def _get_provider(self, provider_name: str | None = None):
+    def _observe_request(
+        self,
+        provider: str,
+        model: str,
+        outcome: str,
+        latency: float,
+        ttft: float | None,
+        usage: dict | None,
+    ) -> None:
+        """Record one provider request (called by the health tracker)."""
+        m = self.metrics
+        m.inc("aitool_requests_total", provider=provider, model=model, outcome=outcome)
+        if outcome != "success":
+            return
+        m.observe("aitool_request_latency_seconds", latency, provider=provider, model=model)
+        if ttft is not None:
+            m.observe("aitool_ttft_seconds", ttft, provider=provider, model=model)
+        if usage:
+            completion = usage.get("completion_tokens") or 0
+            m.inc("aitool_tokens_total", usage.get("prompt_tokens") or 0, provider=provider, model=model, kind="prompt")
+            m.inc("aitool_tokens_total", completion, provider=provider, model=model, kind="completion")
+            generating = latency - (ttft or 0.0)
+            if completion and generating > 0:
+                m.observe("aitool_output_tokens_per_second", completion / generating, provider=provider, model=model)
+
+    def _on_retry(self, exc: Exception, delay: float) -> None:
+        self.count("retries")
+        self.metrics.observe("aitool_retry_delay_seconds", delay)
+
+    def _retry_kwargs(self) -> dict:
+        return {
+            "max_attempts": self.retry_attempts,
+            "min_delay": self.retry_min_delay,
+            "max_delay": self.retry_max_delay,
+            "is_retryable": _is_retryable,
+            "budget": self.retry_budget,
+            "on_retry": self._on_retry,
+        }
+
+    def _continuation_kwargs(self) -> dict:
+        def on_round(context_tokens_sent: int, tokens_saved: int) -> None:
+            self.count("continuation_rounds")
+            self.count("continuation_tokens_saved", tokens_saved)
+
+        return {
+            "context_tokens": self.continuation_overlap,
+            "max_continuations": self.max_continuations,
+            "on_round": on_round,
+        }
+
+    def __enter__(self) -> "AIOrchestrator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Finish pending output writes and hedged requests; close cached providers and their pooled connections."""
+        self.output.close()
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=True, cancel_futures=True)
+            self._hedge_pool = None
+        with self._providers_lock:
+            providers = list(self._providers.values())
+            self._providers.clear()
+        for prov in providers:
+            prov.close()
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    async def aclose(self) -> None:
+        """Close async connections of cached providers for the running event loop."""
+        with self._providers_lock:
+            providers = list(self._providers.values())
+        for prov in providers:
+            await prov.aclose()
+
+    def _get_provider(self, provider_name: str | None = None) -> BaseProvider:
         name = provider_name or self.default_provider
         providers_cfg = self.config.get("providers", {})
         prov_cfg = providers_cfg.get(name, {})
         if not prov_cfg.get("enabled", True):
             raise ProviderError(f"Provider {name} is disabled")
-        return get_provider(name, prov_cfg)
+        # HTTP-level timeouts come from the retry section unless set per provider
+        prov_cfg = {
+            "timeout_seconds": self.timeout,
+            "connect_timeout_seconds": self.connect_timeout,
+            **prov_cfg,
+        }
+        key = (name, json.dumps(prov_cfg, sort_keys=True, default=str))
+        with self._providers_lock:
+            prov = self._providers.get(key)
+            if prov is None:
+                prov = get_provider(name, prov_cfg)
+                prov.on_transfer = lambda sent, received, name=name: self._observe_transfer(name, sent, received)
+                self._providers[key] = prov
+            return prov
+
+    def _observe_transfer(self, provider: str, sent: int, received: int) -> None:
+        self.metrics.inc("aitool_http_bytes_total", sent, provider=provider, direction="sent")
+        self.metrics.inc("aitool_http_bytes_total", received, provider=provider, direction="received")
 
     def _model_for_provider(self, provider_name: str, requested_model: str) -> str:
         """Return a model ID that this provider supports; fall back to provider's first model."""
@@ -71,6 +270,13 @@ class AIOrchestrator:
             return model_ids[0]
         return requested_model
 
+    def _providers_to_try(self, model: str, provider: str | None) -> list[str]:
+        """Enabled providers for a call, healthiest first (open circuits last)."""
+        names = [provider] if provider else self.fallback_providers
+        names = [p for p in names if self.config.get("providers", {}).get(p, {}).get("enabled", True)]
+        routes = self.health.order([(p, self._model_for_provider(p, model)) for p in names])
+        return [p for p, _ in routes]
+
     def _chat_with_fallback(
         self,
         messages: list[ChatMessage],
@@ -79,32 +285,272 @@ class AIOrchestrator:
         stream: bool = False,
     ) -> str | Iterator[str]:
         model = model or self.default_model
-        providers_to_try = [provider] if provider else self.fallback_providers
-        providers_to_try = [p for p in providers_to_try if self.config.get("providers", {}).get(p, {}).get("enabled", True)]
+        cache_key = self._cache_key(messages, model, provider)
+        if cache_key is not None:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return _replay(cached) if stream else cached
+        providers_to_try = self._providers_to_try(model, provider)
+        if stream:
+            chunks = ChatStream(self._stream_with_recovery(messages, model, providers_to_try))
+            return chunks if cache_key is None else self._cache_stream(cache_key, chunks)
+        if self.hedging is not None:
+            candidates = self._hedge_candidates(providers_to_try, model)
+            if len(candidates) > 1:
+                result = self._hedged_chat(messages, candidates)
+                if cache_key is not None:
+                    self.cache.put(cache_key, result)
+                return result
         last_error: Exception | None = None
-        for prov_name in providers_to_try:
+        for i, prov_name in enumerate(providers_to_try):
+            if i:
+                self.count("fallbacks")
             try:
                 prov = self._get_provider(prov_name)
                 model_for_prov = self._model_for_provider(prov_name, model)
-                if stream and not prov.supports_streaming(model_for_prov):
-                    stream = False
-                result = with_retry(
-                    lambda: prov.chat(
-                        messages,
-                        model=model_for_prov,
-                        max_tokens=self.max_output_tokens,
-                        stream=stream,
-                    ),
-                    max_attempts=self.retry_attempts,
-                    timeout=self.timeout,
-                    is_retryable=_is_retryable,
-                )
+                limiter = self.rate_limits.get(prov_name, model_for_prov)
+
+                # With no other route left, wait out an open circuit rather than fail
+                last_route = i == len(providers_to_try) - 1
+
+                def attempt() -> str:
+                    estimated = self._acquire_rate(limiter, messages)
+                    with self.health.track(prov_name, model_for_prov, wait=last_route) as tracked:
+                        out = prov.chat(
+                            messages,
+                            model=model_for_prov,
+                            max_tokens=self.max_output_tokens,
+                            stream=False,
+                        )
+                        tracked.usage = getattr(out, "usage", None)
+                    if limiter is not None:
+                        limiter.settle(estimated, getattr(out, "usage", None))
+                    return out
+
+                result = with_retry(attempt, **self._retry_kwargs())
+                if cache_key is not None:
+                    self.cache.put(cache_key, result)
                 return result
             except Exception as e:
                 last_error = e
                 continue
         raise last_error or ProviderError("All providers failed")
 
+    def _hedge_candidates(self, providers_to_try: list[str], model: str) -> list[tuple[str, str]]:
+        """(provider, model) pairs to race, in order: the fallback list plus any alternate model."""
+        candidates = [(p, self._model_for_provider(p, model)) for p in providers_to_try]
+        alternate = self.hedging.alternate_model if self.hedging is not None else None
+        if alternate and candidates:
+            candidates.insert(1, (candidates[0][0], alternate))
+        return self.health.order(list(dict.fromkeys(candidates)))
+
+    def _hedged_chat(self, messages: list[ChatMessage], candidates: list[tuple[str, str]]) -> ChatResult:
+        """
+        Send the request to candidates[0]; if no token has arrived within the
+        hedge delay (a percentile of recent time-to-first-token), race the next
+        candidate too. The first to produce a token wins and the others stop.
+        """
+        policy = self.hedging
+
+        def make_call(prov_name: str, model_for_prov: str, primary: bool):
+            def call(first_token, cancelled) -> ChatResult:
+                prov = self._get_provider(prov_name)
+                limiter = self.rate_limits.get(prov_name, model_for_prov)
+                started = time.monotonic()
+                signalled = False
+
+                def got_token(tracked) -> None:
+                    nonlocal signalled
+                    tracked.first_token()
+                    if not signalled:
+                        signalled = True
+                        policy.record(prov_name, model_for_prov, time.monotonic() - started)
+                        first_token()
+
+                def lost() -> None:
+                    # The primary's TTFT is at least the time it had waited when
+                    # a hedge won; leaving losers out would bias the delay down
+                    if not signalled:
+                        policy.record(prov_name, model_for_prov, time.monotonic() - started)
+
+                if primary:
+                    cancelled.on_cancel(lost)
+
+                def attempt() -> ChatResult:
+                    if cancelled.is_set():
+                        raise HedgeCancelled()
+                    estimated = self._acquire_rate(limiter, messages)
+                    with self.health.track(prov_name, model_for_prov) as tracked:
+                        out = prov.chat(
+                            messages,
+                            model=model_for_prov,
+                            max_tokens=self.max_output_tokens,
+                            stream=prov.supports_streaming(model_for_prov),
+                        )
+                        if isinstance(out, str):
+                            if cancelled.is_set():
+                                raise HedgeCancelled()
+                            got_token(tracked)
+                            result = collect_result(out)
+                        else:
+                            # Losing while blocked on the network: abort wakes the read
+                            if isinstance(out, ChatStream):
+                                cancelled.on_cancel(out.abort)
+                            parts: list[str] = []
+                            try:
+                                for delta in out:
+                                    if cancelled.is_set():
+                                        raise HedgeCancelled()
+                                    got_token(tracked)
+                                    parts.append(delta)
+                            except ProviderError:
+                                if cancelled.is_set():
+                                    raise HedgeCancelled() from None
+                                raise
+                            finally:
+                                out.close()
+                            result = ChatResult(
+                                "".join(parts), getattr(out, "finish_reason", None), getattr(out, "usage", None)
+                            )
+                        tracked.usage = result.usage
+                    if limiter is not None:
+                        limiter.settle(estimated, result.usage)
+                    return result
+
+                return with_retry(attempt, **self._retry_kwargs())
+
+            return call
+
+        primary_provider, primary_model = candidates[0]
+        winner, result = race(
+            [make_call(p, m, i == 0) for i, (p, m) in enumerate(candidates)],
+            policy.delay(primary_provider, primary_model),
+            self._hedge_pool,
+            on_hedge=lambda i: self.count("hedges"),
+        )
+        if winner:
+            self.count("hedge_wins")
+        return result
+
+    def _stream_with_recovery(
+        self,
+        messages: list[ChatMessage],
+        model: str,
+        providers_to_try: list[str],
+    ) -> Generator[str, None, tuple[str | None, dict | None]]:
+        """
+        Stream a reply, surviving errors mid-stream. The text yielded so far is
+        tracked; on a retryable error the same provider is retried (with backoff
+        and the run's retry budget), otherwise the next fallback provider is
+        used. A resumed request asks for a continuation of the partial text and
+        the repeated seam is trimmed, so the caller sees one seamless stream.
+        """
+        received = ""
+        last_error: Exception | None = None
+        tokenizer = get_tokenizer()
+        for i, prov_name in enumerate(providers_to_try):
+            if i:
+                self.count("fallbacks")
+            delay = self.retry_min_delay
+            attempt = 0
+            while attempt < self.retry_attempts:
+                attempt += 1
+                resuming = bool(received)
+                request = (
+                    continuation_messages(messages, received, self.continuation_overlap, tokenizer)
+                    if resuming else messages
+                )
+                try:
+                    prov = self._get_provider(prov_name)
+                    model_for_prov = self._model_for_provider(prov_name, model)
+                    if resuming:
+                        self.count("stream_resumes")
+                    limiter = self.rate_limits.get(prov_name, model_for_prov)
+                    estimated = self._acquire_rate(limiter, request)
+                    last_route = i == len(providers_to_try) - 1
+                    with self.health.track(prov_name, model_for_prov, wait=last_route) as tracked:
+                        out = prov.chat(
+                            request,
+                            model=model_for_prov,
+                            max_tokens=self.max_output_tokens,
+                            stream=prov.supports_streaming(model_for_prov),
+                        )
+                        if isinstance(out, str):
+                            out = _replay(collect_result(out))
+                        # When resuming, hold back the start of the new stream until
+                        # any text it repeats from the partial reply can be trimmed.
+                        pending = "" if resuming else None
+                        for delta in out:
+                            tracked.first_token()
+                            if pending is not None:
+                                pending += delta
+                                if len(pending) < STREAM_SEAM_LOOKAHEAD:
+                                    continue
+                                delta, pending = stitch(received, pending), None
+                            if delta:
+                                received += delta
+                                # The consumer's time between deltas is not request latency
+                                suspended = time.monotonic()
+                                yield delta
+                                tracked.exclude(time.monotonic() - suspended)
+                        if pending:
+                            pending = stitch(received, pending)
+                            received += pending
+                            suspended = time.monotonic()
+                            yield pending
+                            tracked.exclude(time.monotonic() - suspended)
+                        tracked.usage = getattr(out, "usage", None)
+                    if limiter is not None:
+                        limiter.settle(estimated, getattr(out, "usage", None))
+                    return getattr(out, "finish_reason", None), getattr(out, "usage", None)
+                except Exception as e:
+                    last_error = e
+                    if not _is_retryable(e) or attempt >= self.retry_attempts:
+                        break
+                    if not self.retry_budget.try_acquire():
+                        break
+                    delay = next_delay(delay, self.retry_min_delay, self.retry_max_delay)
+                    sleep_for = retry_delay(e, delay)
+                    self._on_retry(e, sleep_for)
+                    time.sleep(sleep_for)
+        raise last_error or ProviderError("All providers failed")
+
+    def _acquire_rate(self, limiter: RateLimiter | None, messages: list[ChatMessage]) -> int:
+        """Wait for rate-limit capacity; return the estimated input tokens charged."""
+        if limiter is None:
+            return 0
+        estimated = _estimate_input_tokens(messages)
+        waited = limiter.acquire(estimated)
+        if waited:
+            self.count("rate_limit_waits")
+            self.metrics.observe("aitool_rate_limit_wait_seconds", waited)
+        return estimated
+
+    def _cache_key(self, messages: list[ChatMessage], model: str, provider: str | None) -> str | None:
+        if self.cache is None:
+            return None
+        route = provider or ",".join(self.fallback_providers)
+        return ResponseCache.make_key(route, model, self.max_output_tokens, messages)
+
+    def _cache_get(self, key: str) -> ChatResult | None:
+        cached = None if self.cache_refresh else self.cache.get(key)
+        self.count("cache_hits" if cached is not None else "cache_misses")
+        return cached
+
+    def _cache_stream(self, key: str, chunks: Iterator[str]) -> ChatStream:
+        """Pass a stream through and cache the full text once it has been consumed."""
+        def passthrough():
+            parts: list[str] = []
+            for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+            finish_reason = getattr(chunks, "finish_reason", None)
+            usage = getattr(chunks, "usage", None)
+            self.cache.put(key, ChatResult("".join(parts), finish_reason, usage))
+            return finish_reason, usage
+
+        return ChatStream(passthrough())
+
     def process_text(
         self,
         text: str,
@@ -114,41 +560,305 @@ class AIOrchestrator:
         stream: bool = False,
         save_each_chunk: bool = True,
         auto_continue: bool = True,
+        journal: RunJournal | None = None,
     ) -> list[str]:
         """
         Chunk long text, call AI for each chunk (with fallback and retries),
         optionally continue truncated replies, stream if supported, save to files.
-        Returns list of full responses (one per chunk).
+        Returns list of full responses (one per chunk). For output as it is
+        generated, use process_text_stream.
         """
-        chunks = list(chunk_text(text, max_tokens=self.max_input_tokens))
-        all_responses: list[str] = []
-        for i, chunk in enumerate(chunks):
-            messages = []
-            if system_prompt:
-                messages.append(ChatMessage("system", system_prompt))
-            messages.append(ChatMessage("user", chunk))
-
-            def get_reply(msgs: list[ChatMessage]) -> str:
-                out = self._chat_with_fallback(msgs, model=model, provider=provider, stream=False)
-                return out if isinstance(out, str) else "".join(out)
-
-            raw = with_retry(
-                lambda: get_reply(messages),
-                max_attempts=self.retry_attempts,
-                timeout=self.timeout,
-                is_retryable=_is_retryable,
+        if stream:
+            responses: list[str] = []
+            parts: list[str] = []
+            for _, delta in self.process_text_stream(
+                text,
+                system_prompt=system_prompt,
+                model=model,
+                provider=provider,
+                auto_continue=auto_continue,
+                journal=journal,
+            ):
+                if delta:
+                    parts.append(delta)
+                    continue
+                responses.append("".join(parts))
+                parts = []
+                if save_each_chunk:
+                    self.output.write_response(responses[-1])
+            return responses
+        return list(
+            self.iter_process_chunks(
+                chunk_text(text, max_tokens=self.max_input_tokens),
+                system_prompt=system_prompt,
+                model=model,
+                provider=provider,
+                save_each_chunk=save_each_chunk,
+                auto_continue=auto_continue,
+                journal=journal,
             )
-            if auto_continue:
-                raw = request_continuation(
-                    get_reply,
-                    messages,
-                    raw,
-                    overlap_chars=self.continuation_overlap * 4,
+        )
+
+    def process_text_stream(
+        self,
+        text: str,
+        system_prompt: str | None = None,
+        model: str | None = None,
+        provider: str | None = None,
+        auto_continue: bool = True,
+        journal: RunJournal | None = None,
+    ) -> Iterator[tuple[int, str]]:
+        """Chunk text and stream the responses; see iter_process_stream."""
+        return self.iter_process_stream(
+            chunk_text(text, max_tokens=self.max_input_tokens),
+            system_prompt=system_prompt,
+            model=model,
+            provider=provider,
+            auto_continue=auto_continue,
+            journal=journal,
+        )
+
+    def iter_process_stream(
+        self,
+        chunks: Iterable[str],
+        system_prompt: str | None = None,
+        model: str | None = None,
+        provider: str | None = None,
+        auto_continue: bool = True,
+        journal: RunJournal | None = None,
+    ) -> Iterator[tuple[int, str]]:
+        """
+        Yield (chunk_index, delta) events as response text arrives, including
+        continuation rounds. Events come in chunk order; after the last delta of
+        a chunk, (chunk_index, "") marks its end. Like iter_process_chunks, up to
+        `concurrency` chunks are in flight: the first one streams live while
+        the others buffer until it is their turn, so memory depends on the
+        in-flight window, not on the total output.
+        """
+        def stream_chunk(index: int, chunk: str) -> Iterator[str]:
+            key = None
+            if journal is not None:
+                key = self._journal_key(chunk, system_prompt, model, provider)
+                done = journal.get(key)
+                if done is not None:
+                    if journal.resumed(key):
+                        self.count("journal_hits")
+                    yield done
+                    return
+            started = time.monotonic()
+            out = self._stream_chunk(
+                chunk, system_prompt=system_prompt, model=model, provider=provider, auto_continue=auto_continue
+            )
+            parts: list[str] = []
+            for delta in out:
+                if journal is not None:
+                    parts.append(delta)
+                yield delta
+            self.metrics.observe("aitool_chunk_latency_seconds", time.monotonic() - started)
+            if journal is not None:
+                journal.record(
+                    index,
+                    key,
+                    ChatResult("".join(parts), getattr(out, "finish_reason", None), getattr(out, "usage", None)),
                 )
-            all_responses.append(raw)
-            if save_each_chunk:
-                self.output.write_response(raw)
-        return all_responses
+
+        if self.concurrency <= 1:
+            for index, chunk in enumerate(chunks):
+                for delta in stream_chunk(index, chunk):
+                    if delta:
+                        yield index, delta
+                yield index, ""
+            return
+
+        stop = threading.Event()
+
+        def run(index: int, chunk: str, events: queue.Queue) -> None:
+            it = stream_chunk(index, chunk)
+            try:
+                for delta in it:
+                    if stop.is_set():
+                        break
+                    events.put(delta)
+            except BaseException as e:
+                events.put(_StreamError(e))
+                return
+            finally:
+                it.close()
+            events.put(None)
+
+        pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="chunk-stream")
+        pending: deque[tuple[int, queue.Queue]] = deque()
+        chunk_iter = enumerate(chunks)
+
+        def submit(index: int, chunk: str) -> None:
+            events: queue.Queue = queue.Queue()
+            pool.submit(run, index, chunk, events)
+            pending.append((index, events))
+
+        try:
+            for index, chunk in chunk_iter:
+                submit(index, chunk)
+                if len(pending) >= self.concurrency:
+                    break
+            while pending:
+                index, events = pending.popleft()
+                while True:
+                    event = events.get()
+                    if event is None:
+                        break
+                    if isinstance(event, _StreamError):
+                        raise event.error
+                    if event:
+                        yield index, event
+                next_item = next(chunk_iter, None)
+                if next_item is not None:
+                    submit(*next_item)
+                yield index, ""
+        finally:
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _stream_chunk(
+        self,
+        chunk: str,
+        system_prompt: str | None = None,
+        model: str | None = None,
+        provider: str | None = None,
+        auto_continue: bool = True,
+    ) -> ChatStream:
+        """Stream the response to one chunk, continuation rounds included."""
+        messages = []
+        if system_prompt:
+            messages.append(ChatMessage("system", system_prompt))
+        messages.append(ChatMessage("user", chunk))
+        return self.chat_messages(messages, model=model, provider=provider, stream=True, auto_continue=auto_continue)
+
+    def iter_process_chunks(
+        self,
+        chunks: Iterable[str],
+        system_prompt: str | None = None,
+        model: str | None = None,
+        provider: str | None = None,
+        save_each_chunk: bool = True,
+        auto_continue: bool = True,
+        journal: RunJournal | None = None,
+    ) -> Iterator[str]:
+        """
+        Yield one full response per chunk, in input order, as soon as it is ready.
+        Chunks are pulled lazily (e.g. from chunk_stream) and up to `concurrency`
+        of them are in flight at once, so memory does not grow with input size.
+        With a journal, chunks it already holds are not sent again and every
+        finished chunk is recorded in it as soon as it completes.
+        """
+        def process_chunk(index: int, chunk: str) -> str:
+            return self._journaled(
+                journal,
+                index,
+                chunk,
+                system_prompt,
+                model,
+                provider,
+                lambda: self._timed_chunk(
+                    chunk,
+                    system_prompt=system_prompt,
+                    model=model,
+                    provider=provider,
+                    auto_continue=auto_continue,
+                ),
+            )
+
+        if self.concurrency <= 1:
+            for index, chunk in enumerate(chunks):
+                raw = process_chunk(index, chunk)
+                if save_each_chunk:
+                    self.output.write_response(raw)
+                yield raw
+            return
+
+        # Chunks are independent, so several are sent in parallel. Results are
+        # taken from the head of the window, which keeps output in input order.
+        pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="chunk")
+        pending: deque[Future[str]] = deque()
+        chunk_iter = enumerate(chunks)
+        try:
+            for index, chunk in chunk_iter:
+                pending.append(pool.submit(process_chunk, index, chunk))
+                if len(pending) >= self.concurrency:
+                    break
+            while pending:
+                raw = pending.popleft().result()
+                next_item = next(chunk_iter, None)
+                if next_item is not None:
+                    pending.append(pool.submit(process_chunk, *next_item))
+                if save_each_chunk:
+                    self.output.write_response(raw)
+                yield raw
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _journal_key(
+        self, chunk: str, system_prompt: str | None, model: str | None, provider: str | None
+    ) -> str:
+        return RunJournal.chunk_key(chunk, system_prompt, model or self.default_model, provider)
+
+    def _journaled(
+        self,
+        journal: RunJournal | None,
+        index: int,
+        chunk: str,
+        system_prompt: str | None,
+        model: str | None,
+        provider: str | None,
+        compute: Callable[[], str],
+    ) -> str:
+        """Return the journaled response for this chunk, or compute and record it."""
+        if journal is None:
+            return compute()
+        key = self._journal_key(chunk, system_prompt, model, provider)
+        done = journal.get(key)
+        if done is not None:
+            # A repeat of a chunk finished earlier in this run is not a resume
+            if journal.resumed(key):
+                self.count("journal_hits")
+            return done
+        raw = compute()
+        journal.record(index, key, raw)
+        return raw
+
+    def _timed_chunk(self, chunk: str, **kwargs) -> str:
+        started = time.monotonic()
+        raw = self._process_chunk(chunk, **kwargs)
+        self.metrics.observe("aitool_chunk_latency_seconds", time.monotonic() - started)
+        return raw
+
+    def _process_chunk(
+        self,
+        chunk: str,
+        system_prompt: str | None = None,
+        model: str | None = None,
+        provider: str | None = None,
+        auto_continue: bool = True,
+    ) -> str:
+        """Send one chunk (with fallback and retries) and continue a truncated reply."""
+        messages = []
+        if system_prompt:
+            messages.append(ChatMessage("system", system_prompt))
+        messages.append(ChatMessage("user", chunk))
+
+        def get_reply(msgs: list[ChatMessage]) -> str:
+            out = self._chat_with_fallback(msgs, model=model, provider=provider, stream=False)
+            return collect_result(out)
+
+        # Retries happen per provider inside _chat_with_fallback; no second layer here
+        raw = get_reply(messages)
+        if auto_continue:
+            raw = request_continuation(
+                get_reply,
+                messages,
+                raw,
+                **self._continuation_kwargs(),
+            )
+        return raw
 
     def chat(
         self,
@@ -168,18 +878,338 @@ class AIOrchestrator:
             messages.append(ChatMessage("system", system_prompt))
         messages.append(ChatMessage("user", prompt))
 
-        result = self._chat_with_fallback(messages, model=model, provider=provider, stream=stream)
-        if isinstance(result, str):
-            full = result
-        else:
-            full = "".join(result)
+        result = self.chat_messages(
+            messages, model=model, provider=provider, stream=stream, auto_continue=auto_continue and not stream
+        )
+        full = collect_result(result)
+
+        if save_to_file:
+            self.output.write_response(full)
+        return full
+
+    def chat_messages(
+        self,
+        messages: list[ChatMessage],
+        model: str | None = None,
+        provider: str | None = None,
+        stream: bool = False,
+        auto_continue: bool = True,
+    ) -> ChatResult | ChatStream:
+        """
+        Reply to a prepared message list (e.g. a multi-turn history), with
+        fallback and retries. With stream=True returns a ChatStream of deltas;
+        auto_continue requests continuations of truncated replies either way.
+        """
+        if stream:
+            def get_stream(msgs: list[ChatMessage]) -> Iterator[str]:
+                return self._chat_with_fallback(msgs, model=model, provider=provider, stream=True)
+
+            if not auto_continue:
+                return get_stream(messages)
+            return ChatStream(stream_continuation(get_stream, messages, **self._continuation_kwargs()))
+
+        def get_reply(msgs: list[ChatMessage]) -> ChatResult:
+            return collect_result(self._chat_with_fallback(msgs, model=model, provider=provider, stream=False))
+
+        full = get_reply(messages)
+        if auto_continue:
+            full = request_continuation(get_reply, messages, full, **self._continuation_kwargs())
+        return full
+
+    # -- asyncio API -------------------------------------------------------
+
+    async def _achat_with_fallback(
+        self,
+        messages: list[ChatMessage],
+        model: str | None = None,
+        provider: str | None = None,
+        stream: bool = False,
+    ) -> str | AsyncChatStream:
+        """Async version of _chat_with_fallback; returns text or an AsyncChatStream of chunks."""
+        model = model or self.default_model
+        cache_key = self._cache_key(messages, model, provider)
+        if cache_key is not None:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return AsyncChatStream(_areplay_chunks(cached)) if stream else cached
+        providers_to_try = self._providers_to_try(model, provider)
+        if stream:
+            chunks = AsyncChatStream(self._astream_with_recovery(messages, model, providers_to_try))
+            return chunks if cache_key is None else self._acache_stream(cache_key, chunks)
+        last_error: Exception | None = None
+        for i, prov_name in enumerate(providers_to_try):
+            if i:
+                self.count("fallbacks")
+            try:
+                prov = self._get_provider(prov_name)
+                model_for_prov = self._model_for_provider(prov_name, model)
+                limiter = self.rate_limits.get(prov_name, model_for_prov)
+
+                last_route = i == len(providers_to_try) - 1
+
+                async def attempt() -> str:
+                    estimated = await self._aacquire_rate(limiter, messages)
+                    with await self.health.atrack(prov_name, model_for_prov, wait=last_route) as tracked:
+                        out = await prov.achat(messages, model=model_for_prov, max_tokens=self.max_output_tokens)
+                        tracked.usage = getattr(out, "usage", None)
+                    if limiter is not None:
+                        limiter.settle(estimated, getattr(out, "usage", None))
+                    return out
+
+                result = await async_with_retry(attempt, **self._retry_kwargs())
+                if cache_key is not None:
+                    self.cache.put(cache_key, result)
+                return result
+            except Exception as e:
+                last_error = e
+                continue
+        raise last_error or ProviderError("All providers failed")
+
+    async def _astream_with_recovery(
+        self,
+        messages: list[ChatMessage],
+        model: str,
+        providers_to_try: list[str],
+    ) -> AsyncIterator[str | tuple[str | None, dict | None]]:
+        """
+        Async version of _stream_with_recovery, with the same retry, fallback,
+        health and resume handling. Ends by yielding (finish_reason, usage), to
+        be wrapped in an AsyncChatStream.
+        """
+        import asyncio
+
+        received = ""
+        last_error: Exception | None = None
+        tokenizer = get_tokenizer()
+        for i, prov_name in enumerate(providers_to_try):
+            if i:
+                self.count("fallbacks")
+            delay = self.retry_min_delay
+            attempt = 0
+            while attempt < self.retry_attempts:
+                attempt += 1
+                resuming = bool(received)
+                request = (
+                    continuation_messages(messages, received, self.continuation_overlap, tokenizer)
+                    if resuming else messages
+                )
+                try:
+                    prov = self._get_provider(prov_name)
+                    model_for_prov = self._model_for_provider(prov_name, model)
+                    if resuming:
+                        self.count("stream_resumes")
+                    limiter = self.rate_limits.get(prov_name, model_for_prov)
+                    estimated = await self._aacquire_rate(limiter, request)
+                    last_route = i == len(providers_to_try) - 1
+                    with await self.health.atrack(prov_name, model_for_prov, wait=last_route) as tracked:
+                        if prov.supports_streaming(model_for_prov):
+                            out = prov.astream(request, model=model_for_prov, max_tokens=self.max_output_tokens)
+                        else:
+                            result = await prov.achat(request, model=model_for_prov, max_tokens=self.max_output_tokens)
+                            out = AsyncChatStream(_areplay_chunks(collect_result(result)))
+                        try:
+                            pending = "" if resuming else None
+                            async for delta in out:
+                                tracked.first_token()
+                                if pending is not None:
+                                    pending += delta
+                                    if len(pending) < STREAM_SEAM_LOOKAHEAD:
+                                        continue
+                                    delta, pending = stitch(received, pending), None
+                                if delta:
+                                    received += delta
+                                    suspended = time.monotonic()
+                                    yield delta
+                                    tracked.exclude(time.monotonic() - suspended)
+                            if pending:
+                                pending = stitch(received, pending)
+                                received += pending
+                                suspended = time.monotonic()
+                                yield pending
+                                tracked.exclude(time.monotonic() - suspended)
+                        finally:
+                            await out.aclose()
+                        tracked.usage = out.usage
+                    if limiter is not None:
+                        limiter.settle(estimated, out.usage)
+                    yield out.finish_reason, out.usage
+                    return
+                except Exception as e:
+                    last_error = e
+                    if not _is_retryable(e) or attempt >= self.retry_attempts:
+                        break
+                    if not self.retry_budget.try_acquire():
+                        break
+                    delay = next_delay(delay, self.retry_min_delay, self.retry_max_delay)
+                    sleep_for = retry_delay(e, delay)
+                    self._on_retry(e, sleep_for)
+                    await asyncio.sleep(sleep_for)
+        raise last_error or ProviderError("All providers failed")
+
+    async def _aacquire_rate(self, limiter: RateLimiter | None, messages: list[ChatMessage]) -> int:
+        """Async _acquire_rate."""
+        if limiter is None:
+            return 0
+        estimated = _estimate_input_tokens(messages)
+        waited = await limiter.aacquire(estimated)
+        if waited:
+            self.count("rate_limit_waits")
+            self.metrics.observe("aitool_rate_limit_wait_seconds", waited)
+        return estimated
+
+    def _acache_stream(self, key: str, chunks: AsyncChatStream) -> AsyncChatStream:
+        """Async _cache_stream."""
+        async def passthrough():
+            parts: list[str] = []
+            async for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+            self.cache.put(key, ChatResult("".join(parts), chunks.finish_reason, chunks.usage))
+            yield chunks.finish_reason, chunks.usage
+
+        return AsyncChatStream(passthrough())
+
+    async def _aget_reply(
+        self,
+        messages: list[ChatMessage],
+        model: str | None = None,
+        provider: str | None = None,
+    ) -> str:
+        out = await self._achat_with_fallback(messages, model=model, provider=provider, stream=False)
+        if isinstance(out, str):
+            return out
+        return ChatResult("".join([chunk async for chunk in out]))
+
+    async def aprocess_text(
+        self,
+        text: str,
+        system_prompt: str | None = None,
+        model: str | None = None,
+        provider: str | None = None,
+        save_each_chunk: bool = True,
+        auto_continue: bool = True,
+        journal: RunJournal | None = None,
+    ) -> list[str]:
+        """
+        Async version of process_text. Up to `concurrency` chunks are in flight on the
+        event loop at once; responses are returned (and saved) in input order.
+        """
+        import asyncio  # already loaded inside a running event loop; kept off CLI startup
+
+        chunks = list(chunk_text(text, max_tokens=self.max_input_tokens))
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def process_chunk(index: int, chunk: str) -> str:
+            key = None
+            if journal is not None:
+                key = self._journal_key(chunk, system_prompt, model, provider)
+                done = journal.get(key)
+                if done is not None:
+                    if journal.resumed(key):
+                        self.count("journal_hits")
+                    return done
+            async with semaphore:
+                raw = await self._aprocess_chunk(
+                    chunk,
+                    system_prompt=system_prompt,
+                    model=model,
+                    provider=provider,
+                    auto_continue=auto_continue,
+                )
+            if journal is not None:
+                journal.record(index, key, raw)
+            return raw
+
+        tasks = [asyncio.ensure_future(process_chunk(i, chunk)) for i, chunk in enumerate(chunks)]
+        all_responses: list[str] = []
+        try:
+            for task in tasks:
+                raw = await task
+                all_responses.append(raw)
+                if save_each_chunk:
+                    self.output.write_response(raw)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return all_responses
+
+    async def _aprocess_chunk(
+        self,
+        chunk: str,
+        system_prompt: str | None = None,
+        model: str | None = None,
+        provider: str | None = None,
+        auto_continue: bool = True,
+    ) -> str:
+        messages = []
+        if system_prompt:
+            messages.append(ChatMessage("system", system_prompt))
+        messages.append(ChatMessage("user", chunk))
+
+        async def get_reply(msgs: list[ChatMessage]) -> str:
+            return await self._aget_reply(msgs, model=model, provider=provider)
+
+        raw = await get_reply(messages)
+        if auto_continue:
+            raw = await arequest_continuation(
+                get_reply,
+                messages,
+                raw,
+                **self._continuation_kwargs(),
+            )
+        return raw
+
+    async def achat(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        model: str | None = None,
+        provider: str | None = None,
+        save_to_file: bool = True,
+        auto_continue: bool = True,
+    ) -> str:
+        """Async version of chat() (non-streaming; use astream() to stream)."""
+        messages = []
+        if system_prompt:
+            messages.append(ChatMessage("system", system_prompt))
+        messages.append(ChatMessage("user", prompt))
+
+        async def get_reply(msgs: list[ChatMessage]) -> str:
+            return await self._aget_reply(msgs, model=model, provider=provider)
 
-        if auto_continue and not stream:
-            def get_reply(msgs: list[ChatMessage]) -> str:
-                out = self._chat_with_fallback(msgs, model=model, provider=provider, stream=False)
-                return out if isinstance(out, str) else "".join(out)
-            full = request_continuation(get_reply, messages, full, overlap_chars=self.continuation_overlap * 4)
+        full = await get_reply(messages)
+        if auto_continue:
+            full = await arequest_continuation(get_reply, messages, full, **self._continuation_kwargs())
 
         if save_to_file:
             self.output.write_response(full)
         return full
+
+    def astream(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        model: str | None = None,
+        provider: str | None = None,
+    ) -> AsyncChatStream:
+        """
+        Async streaming version of chat(): an AsyncChatStream of deltas, with the
+        same fallback, retries and mid-stream resume as chat(stream=True). Its
+        finish_reason and usage are set once it has been consumed; truncated
+        replies are not continued. Nothing is saved to a file.
+        """
+        messages = []
+        if system_prompt:
+            messages.append(ChatMessage("system", system_prompt))
+        messages.append(ChatMessage("user", prompt))
+
+        async def chunks() -> AsyncIterator[str | tuple[str | None, dict | None]]:
+            out = await self._achat_with_fallback(messages, model=model, provider=provider, stream=True)
+            try:
+                async for delta in out:
+                    yield delta
+            finally:
+                await out.aclose()
+            yield out.finish_reason, out.usage
+
+        return AsyncChatStream(chunks())
@@ -1,39 +1,171 @@
 """Save AI responses to numbered output files (output_1.txt, output_2.txt, ...)."""
 from __future__ import annotations
 
+import json
+import os
+import queue
+import re
+import threading
+import time
 from pathlib import Path
 
 
 class OutputManager:
-    """Writes responses to output_dir/prefix_N.ext, auto-incrementing N."""
+    """
+    Writes responses to output_dir/prefix_N.ext, auto-incrementing N. The first
+    N is one past the highest already in the directory (found with a single
+    scan), so new runs never overwrite earlier output; with per_run_dir each
+    run writes into its own run-<timestamp>-<pid> subdirectory instead. Files
+    are written atomically (temp file + rename).
+
+    background=True hands writes to a writer thread so callers never block on
+    disk I/O; call flush() or close() to wait for them (errors are raised
+    there). jsonl="responses.jsonl" appends every response as one JSON line to
+    that file in output_dir instead of writing one file per response.
+    """
 
     def __init__(
         self,
         output_dir: str | Path = "./output",
         prefix: str = "output",
         extension: str = ".txt",
+        per_run_dir: bool = False,
+        background: bool = False,
+        jsonl: str | Path | None = None,
+        queue_size: int = 256,
     ):
         self.output_dir = Path(output_dir)
+        if per_run_dir:
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            self.output_dir = self.output_dir / f"run-{stamp}-{os.getpid()}"
         self.prefix = prefix
         self.extension = extension if extension.startswith(".") else f".{extension}"
-        self._next_index = 1
+        self.jsonl_path = None if jsonl is None else self.output_dir / jsonl
+        self._next_index: int | None = None
+        self._lock = threading.Lock()
+        self._jsonl_file = None
+        self._queue: queue.Queue | None = queue.Queue(maxsize=queue_size) if background else None
+        self._writer: threading.Thread | None = None
+        self._error: BaseException | None = None
 
     def ensure_dir(self) -> None:
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+    def _scan_next_index(self) -> int:
+        """One past the highest prefix_N.ext already in output_dir."""
+        pattern = re.compile(rf"{re.escape(self.prefix)}_(\d+){re.escape(self.extension)}")
+        highest = 0
+        with os.scandir(self.output_dir) as entries:
+            for entry in entries:
+                match = pattern.fullmatch(entry.name)
+                if match:
+                    highest = max(highest, int(match.group(1)))
+        return highest + 1
+
+    def _take_index(self) -> int:
+        with self._lock:
+            if self._next_index is None:
+                self.ensure_dir()
+                self._next_index = self._scan_next_index()
+            index = self._next_index
+            self._next_index += 1
+            return index
+
     def next_path(self) -> Path:
         """Return path for the next output file (output_1.txt, output_2.txt, ...)."""
-        self.ensure_dir()
-        path = self.output_dir / f"{self.prefix}_{self._next_index}{self.extension}"
-        self._next_index += 1
-        return path
+        return self.output_dir / f"{self.prefix}_{self._take_index()}{self.extension}"
 
-    def write_response(self, content: str) -> Path:
-        """Write content to the next numbered file; return path."""
+    def write_response(self, content: str, meta: dict | None = None) -> Path:
+        """
+        Write content to the next numbered file (or append it to the JSONL sink,
+        with meta as extra fields); return the path. In background mode the
+        write may still be pending when this returns.
+        """
+        if self.jsonl_path is not None:
+            record = {"index": self._take_index(), "time": time.time(), **(meta or {}), "response": content}
+            self._submit(self._append_jsonl, record)
+            return self.jsonl_path
         path = self.next_path()
-        path.write_text(content, encoding="utf-8")
+        self._submit(write_atomic, path, content)
         return path
 
+    def _submit(self, fn, *args) -> None:
+        if self._queue is None:
+            fn(*args)
+            return
+        self._raise_error()
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run_writer, daemon=True, name="output-writer")
+                self._writer.start()
+        self._queue.put((fn, args))
+
+    def _run_writer(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                fn, args = item
+                fn(*args)
+            except BaseException as e:
+                if self._error is None:
+                    self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _append_jsonl(self, record: dict) -> None:
+        with self._lock:
+            if self._jsonl_file is None:
+                self.ensure_dir()
+                self._jsonl_file = open(self.jsonl_path, "a", encoding="utf-8")
+            self._jsonl_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._jsonl_file.flush()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def flush(self) -> None:
+        """Wait until pending background writes are on disk; re-raise a failed write."""
+        if self._queue is not None and self._writer is not None:
+            self._queue.join()
+        with self._lock:
+            if self._jsonl_file is not None:
+                self._jsonl_file.flush()
+                os.fsync(self._jsonl_file.fileno())
+        self._raise_error()
+
+    def close(self) -> None:
+        """Flush pending writes, stop the writer thread and close the JSONL sink."""
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                writer, self._writer = self._writer, None
+                if self._jsonl_file is not None:
+                    self._jsonl_file.close()
+                    self._jsonl_file = None
+            if writer is not None:
+                self._queue.put(None)
+                writer.join()
+
     def reset_index(self, start: int = 1) -> None:
         """Reset counter (e.g. for a new run)."""
-        self._next_index = start
+        with self._lock:
+            self._next_index = start
+
+
+def write_atomic(path: Path, content: str) -> None:
+    """
+    Write via a temp file that is fsync'd and then renamed over path, so
+    readers and crashes (power loss included) never see a partial file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
@@ -0,0 +1,181 @@
+"""Offline run planner: chunks, requests, tokens and cost of a job, without network access."""
+from __future__ import annotations
+
+import math
+from itertools import islice
+from typing import Iterable
+
+from .chunking import Tokenizer, get_tokenizer
+from .conversation import MESSAGE_OVERHEAD_TOKENS
+
+# Extra input of a continuation request beyond the prompt and reply tail ("continue" message)
+CONTINUATION_EXTRA_TOKENS = 30
+
+
+class ModelInfo:
+    """Prices (USD per million tokens) and context length of a model, from providers.*.models."""
+
+    def __init__(
+        self,
+        model: str,
+        provider: str | None = None,
+        input_price: float | None = None,
+        output_price: float | None = None,
+        context_length: int | None = None,
+    ):
+        self.model = model
+        self.provider = provider
+        self.input_price = input_price
+        self.output_price = output_price
+        self.context_length = context_length
+
+    @property
+    def priced(self) -> bool:
+        return self.input_price is not None and self.output_price is not None
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float | None:
+        if not self.priced:
+            return None
+        return (input_tokens * self.input_price + output_tokens * self.output_price) / 1_000_000
+
+
+def model_info(config: dict, model: str | None = None, provider: str | None = None) -> ModelInfo:
+    """Look up a model's entry (the provider's, else any provider's) in the config."""
+    model = model or config.get("default_model", "deepseek/deepseek-chat")
+    providers = config.get("providers", {}) or {}
+    names = [provider] if provider else [config.get("default_provider", "openrouter"), *providers]
+    for name in names:
+        for entry in (providers.get(name) or {}).get("models", []) or []:
+            if isinstance(entry, dict) and entry.get("id") == model:
+                return ModelInfo(
+                    model,
+                    name,
+                    _float_or_none(entry.get("input_price_per_mtok")),
+                    _float_or_none(entry.get("output_price_per_mtok")),
+                    int(entry["context_length"]) if entry.get("context_length") else None,
+                )
+    return ModelInfo(model, provider)
+
+
+def _float_or_none(value) -> float | None:
+    return None if value is None else float(value)
+
+
+class PlanRow:
+    """Estimate for one request (a chunk or a batch line)."""
+
+    def __init__(self, label: str, info: ModelInfo, input_tokens: int, config: dict):
+        max_output = int(config.get("max_output_tokens", 4096))
+        max_continuations = int(config.get("max_continuations", 10))
+        overlap = int(config.get("continuation_overlap", 200))
+        self.label = label
+        self.info = info
+        self.input_tokens = input_tokens
+        self.max_requests = 1 + max_continuations
+        # Worst case: every reply is cut at max_output_tokens and continued to the limit
+        self.max_input_tokens = input_tokens + max_continuations * (
+            input_tokens + overlap + CONTINUATION_EXTRA_TOKENS
+        )
+        self.max_output_tokens = max_output * self.max_requests
+        self.cost = info.cost(input_tokens, max_output)
+        self.max_cost = info.cost(self.max_input_tokens, self.max_output_tokens)
+        self.fits = info.context_length is None or input_tokens + max_output <= info.context_length
+
+
+class Plan:
+    """Per-request rows and totals of a planned run."""
+
+    def __init__(self, rows: list[PlanRow], concurrency: int = 1):
+        self.rows = rows
+        self.concurrency = max(1, concurrency)
+
+    def totals(self) -> dict:
+        costs = [r.cost for r in self.rows]
+        max_costs = [r.max_cost for r in self.rows]
+        return {
+            "requests": len(self.rows),
+            "max_requests": sum(r.max_requests for r in self.rows),
+            "input_tokens": sum(r.input_tokens for r in self.rows),
+            "max_input_tokens": sum(r.max_input_tokens for r in self.rows),
+            "max_output_tokens": sum(r.max_output_tokens for r in self.rows),
+            "cost": None if None in costs else sum(costs),
+            "max_cost": None if None in max_costs else sum(max_costs),
+            "over_context": sum(not r.fits for r in self.rows),
+            "waves": math.ceil(len(self.rows) / self.concurrency),
+        }
+
+
+def plan_requests(
+    requests: Iterable[tuple[str, str | None, str | None, str | None]],
+    config: dict,
+    concurrency: int = 1,
+    tokenizer: Tokenizer | None = None,
+    num_threads: int = 8,
+    batch_size: int = 256,
+    provider: str | None = None,
+) -> Plan:
+    """
+    Plan requests given as (label, system_prompt, text, model) tuples. Texts
+    are counted in batches with tiktoken's threaded batch encoder (or the
+    char estimate without tiktoken); nothing is sent anywhere. Models are
+    looked up on provider when given (as with --provider).
+    """
+    tok = tokenizer or get_tokenizer()
+    infos: dict[str | None, ModelInfo] = {}
+    system_tokens: dict[str, int] = {}
+    rows: list[PlanRow] = []
+    it = iter(requests)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            break
+        counts = tok.count_batch([text or "" for _, _, text, _ in batch], num_threads=num_threads)
+        for (label, system, _, model), n in zip(batch, counts):
+            info = infos.get(model)
+            if info is None:
+                info = infos[model] = model_info(config, model, provider)
+            tokens = n + MESSAGE_OVERHEAD_TOKENS
+            if system:
+                if system not in system_tokens:
+                    system_tokens[system] = tok.count(system) + MESSAGE_OVERHEAD_TOKENS
+                tokens += system_tokens[system]
+            rows.append(PlanRow(label, info, tokens, config))
+    return Plan(rows, concurrency)
+
+
+def _money(value: float | None) -> str:
+    return "-" if value is None else f"${value:.4f}"
+
+
+def format_plan(plan: Plan, per_request: bool = True) -> str:
+    """Human-readable table of the plan, then the totals."""
+    lines = []
+    if per_request:
+        lines.append(
+            f"{'request':>10}  {'model':28} {'input':>8} {'max in':>9} {'max out':>9} "
+            f"{'max req':>7} {'cost':>10} {'max cost':>10}"
+        )
+        for r in plan.rows:
+            flag = "  exceeds context" if not r.fits else ""
+            lines.append(
+                f"{r.label:>10}  {r.info.model[:28]:28} {r.input_tokens:>8} {r.max_input_tokens:>9} "
+                f"{r.max_output_tokens:>9} {r.max_requests:>7} {_money(r.cost):>10} {_money(r.max_cost):>10}{flag}"
+            )
+        lines.append("")
+    t = plan.totals()
+    lines.append(f"Requests:      {t['requests']} (up to {t['max_requests']} with continuations)")
+    lines.append(f"Input tokens:  {t['input_tokens']} (up to {t['max_input_tokens']})")
+    lines.append(f"Output tokens: up to {t['max_output_tokens']}")
+    if t["cost"] is None:
+        lines.append("Cost:          unknown (set input_price_per_mtok / output_price_per_mtok on the model)")
+    else:
+        lines.append(
+            f"Cost:          {_money(t['cost'])} with one full-length reply each, "
+            f"up to {_money(t['max_cost'])} worst case"
+        )
+    lines.append(f"Concurrency:   {plan.concurrency} -> {t['waves']} wave(s) of requests")
+    if t["over_context"]:
+        lines.append(
+            f"Warning:       {t['over_context']} request(s) plus max_output_tokens exceed the model's context_length"
+        )
+    return "\n".join(lines)
@@ -1,7 +1,7 @@
 """AI provider implementations (OpenRouter, etc.)."""
 from __future__ import annotations
 
-from .base import BaseProvider, ChatMessage, ProviderError
+from .base import AsyncChatStream, BaseProvider, ChatMessage, ChatResult, ChatStream, ProviderError
 from .openrouter import OpenRouterProvider
 
 PROVIDER_REGISTRY: dict[str, type[BaseProvider]] = {
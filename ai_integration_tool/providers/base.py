@@ -2,8 +2,10 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import AsyncIterator, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Callable, Generator, Iterator
 
 
 @dataclass
@@ -11,11 +13,145 @@ class ChatMessage:
     """Single message in a chat."""
     role: str  # "system", "user", "assistant"
     content: str
+    # Cached token count (set by Conversation); not part of equality or the API payload
+    tokens: int | None = field(default=None, compare=False, repr=False)
+
+
+class ChatResult(str):
+    """
+    Full response text plus what the API reported about it. A str subclass, so
+    callers that only need the text are unaffected.
+    finish_reason: "stop", "length" (hit max_tokens), ... or None if not reported.
+    usage: token usage dict (prompt_tokens, completion_tokens, total_tokens) or None.
+    """
+
+    finish_reason: str | None
+    usage: dict | None
+
+    def __new__(cls, text: str = "", finish_reason: str | None = None, usage: dict | None = None):
+        obj = super().__new__(cls, text)
+        obj.finish_reason = finish_reason
+        obj.usage = usage
+        return obj
+
+
+class ChatStream(Iterator[str]):
+    """
+    Iterator of response text deltas. finish_reason and usage are filled in
+    when the stream is exhausted, from the (finish_reason, usage) value
+    returned by the wrapped generator. abort, if given, stops the stream from
+    another thread (close() may only be called by the thread iterating it).
+    """
+
+    def __init__(
+        self,
+        chunks: Generator[str, None, tuple[str | None, dict | None] | None],
+        abort: Callable[[], None] | None = None,
+    ):
+        self._chunks = chunks
+        self._abort = abort
+        self.finish_reason: str | None = None
+        self.usage: dict | None = None
+
+    def __iter__(self) -> "ChatStream":
+        return self
+
+    def __next__(self) -> str:
+        try:
+            return next(self._chunks)
+        except StopIteration as stop:
+            if stop.value:
+                self.finish_reason, self.usage = stop.value
+            raise
+
+    def close(self) -> None:
+        self._chunks.close()
+
+    def abort(self) -> None:
+        """
+        Stop the stream from any thread: its connection is shut down, so a read
+        blocked in the iterating thread returns and iteration ends with an error.
+        A no-op for providers that cannot interrupt a request.
+        """
+        if self._abort is not None:
+            self._abort()
+
+
+class AsyncChatStream(AsyncIterator[str]):
+    """
+    Async counterpart of ChatStream. Async generators cannot return a value,
+    so the wrapped one ends by yielding a (finish_reason, usage) tuple instead
+    of text; it sets finish_reason and usage and is not passed on.
+    """
+
+    def __init__(self, chunks: AsyncIterator[str | tuple[str | None, dict | None]]):
+        self._chunks = chunks
+        self.finish_reason: str | None = None
+        self.usage: dict | None = None
+
+    def __aiter__(self) -> "AsyncChatStream":
+        return self
+
+    async def __anext__(self) -> str:
+        item = await self._chunks.__anext__()
+        if isinstance(item, tuple):
+            self.finish_reason, self.usage = item
+            raise StopAsyncIteration
+        return item
+
+    async def aclose(self) -> None:
+        aclose = getattr(self._chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+def collect_result(out: str | Iterator[str]) -> ChatResult:
+    """Turn a chat() return value into a ChatResult, consuming it if it is a stream."""
+    if isinstance(out, ChatResult):
+        return out
+    if isinstance(out, str):
+        return ChatResult(out)
+    text = "".join(out)
+    return ChatResult(text, getattr(out, "finish_reason", None), getattr(out, "usage", None))
 
 
 class ProviderError(Exception):
-    """Raised when a provider API call fails (after retries)."""
-    pass
+    """
+    Raised when a provider API call fails. status_code is the HTTP status (None
+    for network errors); retry_after is the server's Retry-After in seconds.
+    """
+
+    # Statuses worth retrying; other 4xx (bad request, auth, ...) will not succeed on retry
+    RETRYABLE_STATUSES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+    def __init__(self, message: str, status_code: int | None = None, retry_after: float | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code is None or self.status_code in self.RETRYABLE_STATUSES
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+_STREAM_END = object()
 
 
 class BaseProvider(ABC):
@@ -23,6 +159,12 @@ class BaseProvider(ABC):
 
     def __init__(self, config: dict):
         self.config = config
+        # Optional hook called with (bytes_sent, bytes_received) per HTTP request
+        self.on_transfer: Callable[[int, int], None] | None = None
+
+    def _record_transfer(self, sent: int, received: int) -> None:
+        if self.on_transfer is not None:
+            self.on_transfer(sent, received)
 
     @property
     @abstractmethod
@@ -40,9 +182,63 @@ class BaseProvider(ABC):
     ) -> str | Iterator[str]:
         """
         Send messages and return full text or an iterator of chunks if stream=True.
+        Providers that know the finish reason / token usage return a ChatResult or
+        ChatStream.
         """
         pass
 
+    async def achat(
+        self,
+        messages: list[ChatMessage],
+        model: str,
+        max_tokens: int = 4096,
+    ) -> str:
+        """
+        Async version of chat() returning the full text (a ChatResult where known).
+        Default runs the blocking chat() in a worker thread; override for native async I/O.
+        """
+        import asyncio
+
+        result = await asyncio.to_thread(self.chat, messages, model, max_tokens, False)
+        return result if isinstance(result, str) else collect_result(result)
+
+    def astream(
+        self,
+        messages: list[ChatMessage],
+        model: str,
+        max_tokens: int = 4096,
+    ) -> AsyncChatStream:
+        """
+        Async stream of response chunks; finish_reason and usage are set once it is exhausted.
+        Default pulls from the blocking chat(stream=True) iterator in a worker thread.
+        """
+        return AsyncChatStream(self._astream_thread(messages, model, max_tokens))
+
+    async def _astream_thread(
+        self, messages: list[ChatMessage], model: str, max_tokens: int
+    ) -> AsyncIterator[str | tuple[str | None, dict | None]]:
+        import asyncio
+
+        result = await asyncio.to_thread(self.chat, messages, model, max_tokens, True)
+        if not isinstance(result, str):
+            it = iter(result)
+            while True:
+                chunk = await asyncio.to_thread(next, it, _STREAM_END)
+                if chunk is _STREAM_END:
+                    break
+                yield chunk
+        elif result:
+            yield result
+        yield getattr(result, "finish_reason", None), getattr(result, "usage", None)
+
     def supports_streaming(self, model: str) -> bool:
         """Override in subclass if only some models support streaming."""
         return True
+
+    def close(self) -> None:
+        """Release pooled connections. Override if the provider holds any."""
+        pass
+
+    async def aclose(self) -> None:
+        """Release async connections bound to the running event loop."""
+        pass
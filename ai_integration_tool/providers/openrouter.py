@@ -1,16 +1,42 @@
 """OpenRouter API provider (DeepSeek, Qwen, Mistral, etc.)."""
 from __future__ import annotations
 
-import json
-from typing import Iterator
+import threading
+import weakref
+from contextlib import aclosing
+from typing import TYPE_CHECKING, AsyncIterator, Generator, Iterator
 
-import requests
+from .base import (
+    AsyncChatStream,
+    BaseProvider,
+    ChatMessage,
+    ChatResult,
+    ChatStream,
+    ProviderError,
+    parse_retry_after,
+)
 
-from .base import BaseProvider, ChatMessage, ProviderError
+# requests, httpx and the SSE parser (orjson) are imported where first needed:
+# importing them is a noticeable share of CLI startup, and cache hits never
+# touch the network
+if TYPE_CHECKING:
+    import asyncio
+
+    import httpx
+    import requests
+
+    from ..sse import SSEEvent
+
+DEFAULT_POOL_SIZE = 100
+DEFAULT_READ_SIZE = 65536
 
 
 class OpenRouterProvider(BaseProvider):
-    """OpenRouter chat completions with optional streaming."""
+    """
+    OpenRouter chat completions with optional streaming.
+    Keeps one pooled keep-alive requests.Session (and one httpx.AsyncClient per event
+    loop) for the lifetime of the instance, so repeated calls reuse TCP/TLS connections.
+    """
 
     name = "openrouter"
 
@@ -18,6 +44,68 @@ class OpenRouterProvider(BaseProvider):
         super().__init__(config)
         self.base_url = config.get("base_url", "https://openrouter.ai/api/v1").rstrip("/")
         self.api_key = config.get("api_key", "")
+        self.pool_size = int(config.get("pool_size", DEFAULT_POOL_SIZE))
+        # Socket-level timeouts: connect, and max wait between bytes of the response
+        self.connect_timeout = float(config.get("connect_timeout_seconds", 10))
+        self.read_timeout = float(config.get("timeout_seconds", 120))
+        # Streaming: max bytes per socket read, and optional merging of tiny deltas (0 = off)
+        self.read_size = int(config.get("stream_read_size", DEFAULT_READ_SIZE))
+        self.coalesce_chars = int(config.get("stream_coalesce_chars", 0))
+        self.coalesce_delay = float(config.get("stream_coalesce_ms", 50)) / 1000
+        self._session: requests.Session | None = None
+        self._session_lock = threading.Lock()
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _get_session(self) -> requests.Session:
+        """Return the pooled session, creating it on first use."""
+        import requests
+
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self.pool_size,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the httpx client for the running event loop (clients are loop-bound)."""
+        import asyncio
+
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                ),
+            )
+            self._async_clients[loop] = client
+        return client
+
+    def close(self) -> None:
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    async def aclose(self) -> None:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
 
     def _headers(self) -> dict:
         return {
@@ -26,12 +114,16 @@ class OpenRouterProvider(BaseProvider):
         }
 
     def _payload(self, messages: list[ChatMessage], model: str, max_tokens: int, stream: bool) -> dict:
-        return {
+        payload = {
             "model": model,
             "messages": [{"role": m.role, "content": m.content} for m in messages],
             "max_tokens": max_tokens,
             "stream": stream,
         }
+        if stream:
+            # Ask for token usage in the final SSE event
+            payload["stream_options"] = {"include_usage": True}
+        return payload
 
     def supports_streaming(self, model: str) -> bool:
         models_cfg = self.config.get("models", [])
@@ -46,40 +138,247 @@ class OpenRouterProvider(BaseProvider):
         model: str,
         max_tokens: int = 4096,
         stream: bool = False,
-    ) -> str | Iterator[str]:
+    ) -> ChatResult | ChatStream:
         url = f"{self.base_url}/chat/completions"
         payload = self._payload(messages, model, max_tokens, stream)
         if stream:
             return self._stream(url, payload)
         return self._complete(url, payload)
 
-    def _complete(self, url: str, payload: dict) -> str:
-        resp = requests.post(url, headers=self._headers(), json=payload, timeout=120)
+    async def achat(
+        self,
+        messages: list[ChatMessage],
+        model: str,
+        max_tokens: int = 4096,
+    ) -> ChatResult:
+        import httpx
+
+        url = f"{self.base_url}/chat/completions"
+        payload = self._payload(messages, model, max_tokens, False)
+        try:
+            resp = await self._get_async_client().post(url, headers=self._headers(), json=payload)
+        except httpx.TransportError as e:
+            raise ProviderError(f"OpenRouter request failed: {e!r}") from e
+        self._record_transfer(len(resp.request.content), len(resp.content))
+        if resp.status_code != 200:
+            raise _api_error(resp.status_code, resp.text, resp.headers)
+        return _result_from_response(resp.json())
+
+    def astream(
+        self,
+        messages: list[ChatMessage],
+        model: str,
+        max_tokens: int = 4096,
+    ) -> AsyncChatStream:
+        return AsyncChatStream(self._aiter_deltas(messages, model, max_tokens))
+
+    async def _aiter_deltas(
+        self, messages: list[ChatMessage], model: str, max_tokens: int
+    ) -> AsyncIterator[str | tuple[str | None, dict | None]]:
+        """Yield content deltas, then the (finish_reason, usage) seen in the SSE events."""
+        import httpx
+
+        from ..sse import DONE, SSEParser, loads
+
+        url = f"{self.base_url}/chat/completions"
+        payload = self._payload(messages, model, max_tokens, True)
+        finish_reason: str | None = None
+        usage: dict | None = None
+        try:
+            async with self._get_async_client().stream("POST", url, headers=self._headers(), json=payload) as resp:
+                if resp.status_code != 200:
+                    await resp.aread()
+                    self._record_transfer(len(resp.request.content), len(resp.content))
+                    raise _api_error(resp.status_code, resp.text, resp.headers)
+                parser = SSEParser()
+                received = 0
+
+                async def events() -> AsyncIterator[SSEEvent]:
+                    nonlocal received
+                    async for block in resp.aiter_bytes():
+                        received += len(block)
+                        for sse in parser.feed(block):
+                            yield sse
+                    # An event not terminated by a blank line, as iter_events does
+                    for sse in parser.close():
+                        yield sse
+
+                try:
+                    async with aclosing(events()) as sse_events:
+                        async for sse in sse_events:
+                            if sse.data == DONE:
+                                break
+                            try:
+                                event = loads(sse.data)
+                            except ValueError:
+                                continue
+                            if not isinstance(event, dict):
+                                continue
+                            choice = (event.get("choices") or [{}])[0]
+                            finish_reason = choice.get("finish_reason") or finish_reason
+                            usage = event.get("usage") or usage
+                            content = _delta_content(event)
+                            if content:
+                                yield content
+                finally:
+                    self._record_transfer(len(resp.request.content), received)
+        except httpx.TransportError as e:
+            raise ProviderError(f"OpenRouter stream failed: {e!r}") from e
+        yield finish_reason, usage
+
+    def _complete(self, url: str, payload: dict) -> ChatResult:
+        import requests
+
+        try:
+            resp = self._get_session().post(
+                url, headers=self._headers(), json=payload, timeout=self._timeouts()
+            )
+        except requests.RequestException as e:
+            raise ProviderError(f"OpenRouter request failed: {e!r}") from e
+        self._record_transfer(len(resp.request.body or b""), len(resp.content))
         if resp.status_code != 200:
-            raise ProviderError(f"OpenRouter API error {resp.status_code}: {resp.text[:500]}")
-        data = resp.json()
-        choice = data.get("choices", [{}])[0]
-        return (choice.get("message") or {}).get("content", "")
-
-    def _stream(self, url: str, payload: dict) -> Iterator[str]:
-        with requests.post(
-            url, headers=self._headers(), json=payload, stream=True, timeout=120
-        ) as resp:
-            if resp.status_code != 200:
-                raise ProviderError(f"OpenRouter API error {resp.status_code}: {resp.text[:500]}")
-            for line in resp.iter_lines():
-                if not line:
-                    continue
-                line_str = line.decode("utf-8").strip()
-                if line_str.startswith("data: "):
-                    data_str = line_str[6:]
-                    if data_str == "[DONE]":
-                        break
-                    try:
-                        obj = json.loads(data_str)
-                        delta = (obj.get("choices") or [{}])[0].get("delta", {})
-                        content = delta.get("content", "")
+            raise _api_error(resp.status_code, resp.text, resp.headers)
+        return _result_from_response(resp.json())
+
+    def _stream(self, url: str, payload: dict) -> ChatStream:
+        abort = _StreamAbort()
+        return ChatStream(self._iter_stream(url, payload, abort), abort=abort.abort)
+
+    def _iter_stream(
+        self, url: str, payload: dict, abort: _StreamAbort
+    ) -> Generator[str, None, tuple[str | None, dict | None]]:
+        deltas = self._iter_deltas(url, payload, abort)
+        if self.coalesce_chars > 0:
+            from ..sse import coalesce
+
+            deltas = coalesce(deltas, self.coalesce_chars, self.coalesce_delay)
+        return (yield from deltas)
+
+    def _iter_deltas(
+        self, url: str, payload: dict, abort: _StreamAbort
+    ) -> Generator[str, None, tuple[str | None, dict | None]]:
+        """Yield content deltas; return (finish_reason, usage) seen in the SSE events."""
+        import requests
+        import urllib3
+
+        from ..sse import iter_json
+
+        finish_reason: str | None = None
+        usage: dict | None = None
+        try:
+            with self._get_session().post(
+                url, headers=self._headers(), json=payload, stream=True, timeout=self._timeouts()
+            ) as resp:
+                sent = len(resp.request.body or b"")
+                abort.attach(resp)
+                if resp.status_code != 200:
+                    self._record_transfer(sent, len(resp.content))
+                    raise _api_error(resp.status_code, resp.text, resp.headers)
+                received = 0
+
+                def blocks() -> Iterator[bytes]:
+                    nonlocal received
+                    for block in _read_blocks(resp, self.read_size):
+                        received += len(block)
+                        yield block
+
+                try:
+                    for event in iter_json(blocks()):
+                        if not isinstance(event, dict):
+                            continue
+                        choice = (event.get("choices") or [{}])[0]
+                        finish_reason = choice.get("finish_reason") or finish_reason
+                        usage = event.get("usage") or usage
+                        content = _delta_content(event)
                         if content:
                             yield content
-                    except json.JSONDecodeError:
-                        pass
+                finally:
+                    self._record_transfer(sent, received)
+        except (requests.RequestException, urllib3.exceptions.HTTPError, OSError) as e:
+            if abort.aborted:
+                raise ProviderError("OpenRouter stream aborted") from e
+            raise ProviderError(f"OpenRouter stream failed: {e!r}") from e
+        if abort.aborted:
+            # A shut-down socket may also read as a clean end of stream
+            raise ProviderError("OpenRouter stream aborted")
+        return finish_reason, usage
+
+    def _timeouts(self) -> tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+
+def _api_error(status_code: int, text: str, headers) -> ProviderError:
+    return ProviderError(
+        f"OpenRouter API error {status_code}: {text[:500]}",
+        status_code=status_code,
+        retry_after=parse_retry_after(headers.get("Retry-After")),
+    )
+
+
+def _result_from_response(data: dict) -> ChatResult:
+    choice = data.get("choices", [{}])[0]
+    return ChatResult(
+        (choice.get("message") or {}).get("content", "") or "",
+        finish_reason=choice.get("finish_reason"),
+        usage=data.get("usage"),
+    )
+
+
+class _StreamAbort:
+    """
+    Stops a blocking stream from another thread. Shutting the socket down wakes
+    a read blocked in the iterating thread, which then closes the response as
+    usual. An abort before the response headers arrive takes effect when they do.
+    """
+
+    def __init__(self) -> None:
+        self.aborted = False
+        self._resp: requests.Response | None = None
+        self._lock = threading.Lock()
+
+    def attach(self, resp: requests.Response) -> None:
+        with self._lock:
+            self._resp = resp
+            if self.aborted:
+                _shutdown(resp)
+
+    def abort(self) -> None:
+        with self._lock:
+            self.aborted = True
+            if self._resp is not None:
+                _shutdown(self._resp)
+
+
+def _shutdown(resp: requests.Response) -> None:
+    import socket
+
+    sock = getattr(getattr(resp.raw, "_connection", None), "sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+def _read_blocks(resp: requests.Response, size: int) -> Iterator[bytes]:
+    """
+    Raw (decompressed) response bytes in blocks of up to size: read1() returns
+    whatever has arrived without waiting to fill the block, so large reads cost
+    no latency. Falls back to small iter_content() reads without read1().
+    """
+    read1 = getattr(resp.raw, "read1", None)
+    if read1 is None:
+        yield from resp.iter_content(chunk_size=512)
+        return
+    while True:
+        block = read1(size, decode_content=True)
+        if not block:
+            return
+        yield block
+
+
+def _delta_content(event: dict | None) -> str:
+    if not isinstance(event, dict):
+        return ""
+    delta = (event.get("choices") or [{}])[0].get("delta") or {}
+    return delta.get("content", "") or ""
@@ -0,0 +1,102 @@
+"""Client-side rate limiting: token buckets for requests and tokens per minute."""
+from __future__ import annotations
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at rate_per_minute, holding up to capacity.
+    reserve() takes the amount immediately (the balance may go negative) and
+    returns how long the caller must wait, so waiters queue up fairly without
+    polling and the same bucket serves threads and asyncio tasks.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take amount from the bucket; return seconds to wait before using it."""
+        # A single request larger than the bucket would otherwise never fit
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            self._level -= amount
+            if self._level >= 0:
+                return 0.0
+            return -self._level / self.rate
+
+    def adjust(self, amount: float) -> None:
+        """Charge (positive) or refund (negative) amount without waiting."""
+        with self._lock:
+            self._refill()
+            self._level = min(self.capacity, self._level - amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one provider/model."""
+
+    def __init__(self, rpm: float | None = None, tpm: float | None = None):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+
+    def _reserve(self, estimated_tokens: int) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = self.requests.reserve(1)
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(estimated_tokens))
+        return wait
+
+    def acquire(self, estimated_tokens: int = 0) -> float:
+        """Block until there is capacity for one request of estimated_tokens; return seconds waited."""
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, estimated_tokens: int = 0) -> float:
+        """Async version of acquire (waits with asyncio.sleep)."""
+        import asyncio
+
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def settle(self, estimated_tokens: int, usage: dict | None) -> None:
+        """Correct the token charge once the API has reported actual usage."""
+        if self.tokens is None or not usage:
+            return
+        actual = usage.get("total_tokens")
+        if actual is None:
+            actual = (usage.get("prompt_tokens") or 0) + (usage.get("completion_tokens") or 0)
+        self.tokens.adjust(actual - estimated_tokens)
+
+
+class RateLimits:
+    """
+    Rate limiters built from config: providers.<name>.models[] entries may set
+    rpm (requests per minute) and tpm (tokens per minute). Limiters are created
+    once and shared by every caller of the orchestrator.
+    """
+
+    def __init__(self, config: dict):
+        self._limiters: dict[tuple[str, str], RateLimiter] = {}
+        for prov_name, prov_cfg in (config.get("providers") or {}).items():
+            for m in (prov_cfg or {}).get("models", []) or []:
+                if isinstance(m, dict) and "id" in m and (m.get("rpm") or m.get("tpm")):
+                    self._limiters[(prov_name, m["id"])] = RateLimiter(m.get("rpm"), m.get("tpm"))
+
+    def get(self, provider: str, model: str) -> RateLimiter | None:
+        return self._limiters.get((provider, model))
@@ -0,0 +1,107 @@
+"""Map-reduce over long documents: per-chunk answers combined in a parallel tree."""
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+from .chunking import Tokenizer, get_tokenizer
+from .journal import RunJournal
+from .orchestrator import AIOrchestrator
+
+DEFAULT_REDUCE_PROMPT = (
+    "You are given partial results, in order, each produced from consecutive parts "
+    "of one long document. Combine them into a single result for the whole document: "
+    "merge overlapping content, remove repetition and keep the format of the parts."
+)
+
+# Label of each part inside a reduce prompt; parts are separated by PART_SEPARATOR
+PART_HEADER = "Part {n}:\n"
+PART_SEPARATOR = "\n\n---\n\n"
+
+
+def pack_groups(counts: list[int], max_tokens: int, overhead: int = 0) -> list[list[int]]:
+    """
+    Split consecutive items (given their token counts) into groups whose total,
+    plus overhead tokens per item, fits max_tokens. Every group but a trailing
+    one gets at least two items, so each reduce level shrinks the list even
+    when single items are large (such a pair may exceed max_tokens).
+    """
+    groups: list[list[int]] = []
+    group: list[int] = []
+    total = 0
+    for i, n in enumerate(counts):
+        cost = n + overhead
+        if len(group) >= 2 and total + cost > max_tokens:
+            groups.append(group)
+            group, total = [], 0
+        group.append(i)
+        total += cost
+    if group:
+        groups.append(group)
+    return groups
+
+
+def reduce_prompt(parts: list[str]) -> str:
+    """User message combining parts, labelled in order."""
+    return PART_SEPARATOR.join(PART_HEADER.format(n=n) + part for n, part in enumerate(parts, start=1))
+
+
+def map_reduce(
+    orch: AIOrchestrator,
+    chunks: Iterable[str],
+    system_prompt: str | None = None,
+    reduce_instructions: str | None = None,
+    model: str | None = None,
+    provider: str | None = None,
+    journal: RunJournal | None = None,
+    max_reduce_tokens: int | None = None,
+    tokenizer: Tokenizer | None = None,
+    on_level: Callable[[int, int, int], None] | None = None,
+) -> str:
+    """
+    Answer every chunk (system_prompt applies), then repeatedly pack the answers
+    (token-aware, in order) into reduce prompts and answer those, one tree level
+    at a time, until one result remains. Requests within a level run in
+    parallel (orch.concurrency), so latency grows with the number of levels,
+    log(#chunks), rather than with #chunks. Every request, intermediate levels
+    included, goes through the journal (and response cache), so a resumed run
+    skips work already done. on_level(level, inputs, outputs) reports progress
+    (level 0 is the map step).
+    """
+    tok = tokenizer or get_tokenizer()
+    instructions = reduce_instructions or DEFAULT_REDUCE_PROMPT
+    if system_prompt:
+        instructions += f"\n\nThe task applied to each part was:\n{system_prompt}"
+    budget = (max_reduce_tokens or orch.max_input_tokens) - tok.count(instructions)
+    overhead = tok.count(PART_SEPARATOR + PART_HEADER.format(n=100))
+
+    def run_level(prompts: Iterable[str], system: str | None) -> list[str]:
+        return list(
+            orch.iter_process_chunks(
+                prompts,
+                system_prompt=system,
+                model=model,
+                provider=provider,
+                save_each_chunk=False,
+                journal=journal,
+            )
+        )
+
+    texts = run_level(chunks, system_prompt)
+    if on_level is not None:
+        on_level(0, len(texts), len(texts))
+    level = 0
+    while len(texts) > 1:
+        level += 1
+        groups = pack_groups([tok.count(t) for t in texts], budget, overhead)
+        # A trailing single item has nothing to combine with yet; carry it up
+        carried = texts[groups[-1][0]] if len(groups[-1]) == 1 else None
+        if carried is not None:
+            groups.pop()
+        reduced = run_level((reduce_prompt([texts[i] for i in g]) for g in groups), instructions)
+        orch.count("reduce_requests", len(groups))
+        if carried is not None:
+            reduced.append(carried)
+        if on_level is not None:
+            on_level(level, len(texts), len(reduced))
+        texts = reduced
+    return texts[0] if texts else ""
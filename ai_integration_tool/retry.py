@@ -1,58 +1,105 @@
-"""Retry logic with exponential backoff and timeout handling."""
+"""Retry logic with jittered backoff, Retry-After support and a shared retry budget."""
 from __future__ import annotations
 
+import random
+import threading
 import time
-from typing import Callable, TypeVar
+from typing import Awaitable, Callable, TypeVar
 
 T = TypeVar("T")
 
+# Upper bound on a server-requested Retry-After wait
+MAX_RETRY_AFTER = 300.0
+
+
+class RetryBudget:
+    """
+    Thread-safe cap on the number of retries across a whole run, so a failing
+    upstream cannot multiply the total number of requests. None = unlimited.
+    """
+
+    def __init__(self, max_retries: int | None = None):
+        self.max_retries = max_retries
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """Take one retry from the budget; False if it is exhausted."""
+        with self._lock:
+            if self.max_retries is not None and self.used >= self.max_retries:
+                return False
+            self.used += 1
+            return True
+
+
+def next_delay(previous: float, min_delay: float, max_delay: float) -> float:
+    """Decorrelated jitter: random in [min_delay, 3 * previous], capped at max_delay."""
+    return min(max_delay, random.uniform(min_delay, max(min_delay, previous * 3)))
+
+
+def retry_delay(exc: Exception, delay: float) -> float:
+    """Honour a server-sent Retry-After (e.g. on 429/503) when it asks for longer."""
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is not None and retry_after > delay:
+        return min(float(retry_after), MAX_RETRY_AFTER)
+    return delay
+
 
 def with_retry(
     fn: Callable[[], T],
     max_attempts: int = 3,
     min_delay: float = 1.0,
     max_delay: float = 30.0,
-    timeout: float | None = None,
     is_retryable: Callable[[Exception], bool] | None = None,
+    budget: RetryBudget | None = None,
+    on_retry: Callable[[Exception, float], None] | None = None,
 ) -> T:
     """
-    Execute fn with exponential backoff. Optionally enforce a timeout per attempt.
+    Execute fn, retrying retryable errors with decorrelated-jitter backoff.
+    Timeouts are expected to be enforced by fn itself (HTTP client timeouts).
+    on_retry(exc, delay) is called before each sleep.
     """
-    last_exc: Exception | None = None
     delay = min_delay
     for attempt in range(1, max_attempts + 1):
         try:
-            if timeout is not None and timeout > 0:
-                return _run_with_timeout(fn, timeout)
             return fn()
         except Exception as e:
-            last_exc = e
             if is_retryable is not None and not is_retryable(e):
                 raise
-            if attempt == max_attempts:
+            if attempt == max_attempts or (budget is not None and not budget.try_acquire()):
                 raise
-            time.sleep(delay)
-            delay = min(delay * 2, max_delay)
-    raise last_exc or RuntimeError("Retry exhausted")
+            delay = next_delay(delay, min_delay, max_delay)
+            sleep_for = retry_delay(e, delay)
+            if on_retry is not None:
+                on_retry(e, sleep_for)
+            time.sleep(sleep_for)
+    raise RuntimeError("Retry exhausted")
 
 
-def _run_with_timeout(fn: Callable[[], T], timeout: float) -> T:
-    """Run fn in a single attempt; timeout is best-effort (thread-based would be better)."""
-    import threading
-    result: list[T] = []
-    exc: list[Exception] = []
+async def async_with_retry(
+    fn: Callable[[], Awaitable[T]],
+    max_attempts: int = 3,
+    min_delay: float = 1.0,
+    max_delay: float = 30.0,
+    is_retryable: Callable[[Exception], bool] | None = None,
+    budget: RetryBudget | None = None,
+    on_retry: Callable[[Exception, float], None] | None = None,
+) -> T:
+    """Async version of with_retry: await fn() and back off with asyncio.sleep."""
+    import asyncio
 
-    def target() -> None:
+    delay = min_delay
+    for attempt in range(1, max_attempts + 1):
         try:
-            result.append(fn())
+            return await fn()
         except Exception as e:
-            exc.append(e)
-
-    thread = threading.Thread(target=target, daemon=True)
-    thread.start()
-    thread.join(timeout=timeout)
-    if thread.is_alive():
-        raise TimeoutError(f"Operation timed out after {timeout}s")
-    if exc:
-        raise exc[0]
-    return result[0]
+            if is_retryable is not None and not is_retryable(e):
+                raise
+            if attempt == max_attempts or (budget is not None and not budget.try_acquire()):
+                raise
+            delay = next_delay(delay, min_delay, max_delay)
+            sleep_for = retry_delay(e, delay)
+            if on_retry is not None:
+                on_retry(e, sleep_for)
+            await asyncio.sleep(sleep_for)
+    raise RuntimeError("Retry exhausted")
@@ -0,0 +1,163 @@
+"""Incremental Server-Sent Events parsing over raw byte blocks, with a fast JSON path."""
+from __future__ import annotations
+
+import time
+from typing import Any, Generator, Iterable, Iterator
+
+# Optional: orjson parses the small per-token JSON events several times faster.
+# Both raise ValueError subclasses on invalid input.
+try:
+    from orjson import loads
+except ImportError:
+    from json import JSONDecoder
+
+    _decode = JSONDecoder().decode
+
+    def loads(data: bytes) -> Any:
+        # SSE is always UTF-8: skip json.loads' encoding detection for bytes
+        return _decode(data.decode("utf-8"))
+
+DONE = b"[DONE]"
+
+
+class SSEEvent:
+    """One dispatched event: its type (default "message"), data (lines joined by \\n) and id."""
+
+    __slots__ = ("event", "data", "id")
+
+    def __init__(self, data: bytes, event: str = "message", id: str | None = None):
+        self.data = data
+        self.event = event
+        self.id = id
+
+    def __repr__(self) -> str:
+        return f"SSEEvent(event={self.event!r}, data={self.data[:60]!r})"
+
+
+class SSEParser:
+    """
+    Incremental SSE parser: feed() raw bytes as they arrive (any block size,
+    lines may span blocks) and get back the events completed by them. Handles
+    LF and CRLF line ends, comment lines (": keep-alive"), multi-line data
+    and the event/id fields, per the WHATWG spec. Data stays bytes, so it can
+    go straight to the JSON parser without decoding or copying lines.
+    """
+
+    def __init__(self) -> None:
+        self._tail = b""
+        self._data: list[bytes] = []
+        self._event = "message"
+        self._id: str | None = None
+
+    def feed(self, block: bytes) -> list[SSEEvent]:
+        events: list[SSEEvent] = []
+        buf = self._tail + block if self._tail else block
+        if b"\r" in buf:
+            # Normalize CRLF and CR line ends; a trailing CR waits for a possible LF
+            keep = buf.endswith(b"\r")
+            buf = buf.replace(b"\r\n", b"\n")
+            if keep:
+                buf = buf[:-1]
+            buf = buf.replace(b"\r", b"\n")
+            if keep:
+                buf += b"\r"
+        lines = buf.split(b"\n")
+        # The last piece is an incomplete line (b"" when the block ends with a line end)
+        self._tail = lines.pop()
+        data = self._data
+        for line in lines:
+            if not line:
+                if data:
+                    self._dispatch(events)
+                    data = self._data
+            elif line[:6] == b"data: ":
+                data.append(line[6:])
+            elif line[0] != 0x3A:  # ":" starts a comment
+                self._field(line)
+        return events
+
+    def close(self) -> list[SSEEvent]:
+        """
+        End of stream. The spec drops an event not terminated by a blank line;
+        we dispatch it, since some servers omit the final blank line.
+        """
+        events = self.feed(b"\n") if self._tail else []
+        if self._data:
+            self._dispatch(events)
+        return events
+
+    def _field(self, line: bytes) -> None:
+        name, _, value = line.partition(b":")
+        if value.startswith(b" "):
+            value = value[1:]
+        if name == b"event":
+            self._event = value.decode("utf-8", "replace")
+        elif name == b"id" and b"\0" not in value:
+            self._id = value.decode("utf-8", "replace")
+        elif name == b"data":  # "data:value" or "data" without a colon
+            self._data.append(value)
+
+    def _dispatch(self, events: list[SSEEvent]) -> None:
+        data = self._data[0] if len(self._data) == 1 else b"\n".join(self._data)
+        # An event with empty data (a bare "data" line) is not dispatched
+        if data:
+            events.append(SSEEvent(data, self._event, self._id))
+        self._data = []
+        self._event = "message"
+
+
+def iter_events(blocks: Iterable[bytes]) -> Iterator[SSEEvent]:
+    """SSE events from an iterable of raw byte blocks."""
+    parser = SSEParser()
+    for block in blocks:
+        if block:
+            yield from parser.feed(block)
+    yield from parser.close()
+
+
+def iter_json(blocks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Parsed JSON of each event's data, up to the OpenAI-style "[DONE]" sentinel.
+    Events whose data is not valid JSON are skipped.
+    """
+    for event in iter_events(blocks):
+        data = event.data
+        if data == DONE:
+            return
+        try:
+            yield loads(data)
+        except ValueError:
+            continue
+
+
+def coalesce(
+    deltas: Generator[str, None, Any], min_chars: int = 32, max_delay: float = 0.05
+) -> Generator[str, None, Any]:
+    """
+    Merge tiny text deltas: yield once at least min_chars are buffered or
+    max_delay seconds have passed since the first buffered delta (checked
+    when the next delta arrives). Fewer, larger deltas cut per-token overhead
+    downstream at the cost of at most max_delay extra latency. Returns what
+    the wrapped generator returns, so it can wrap a ChatStream source.
+    """
+    buf: list[str] = []
+    size = 0
+    since = 0.0
+    try:
+        while True:
+            try:
+                delta = next(deltas)
+            except StopIteration as stop:
+                if buf:
+                    yield "".join(buf)
+                return stop.value
+            if not buf:
+                since = time.monotonic()
+            buf.append(delta)
+            size += len(delta)
+            if size >= min_chars or time.monotonic() - since >= max_delay:
+                yield "".join(buf)
+                buf, size = [], 0
+    finally:
+        # Closed early (consumer stopped reading): release the source's connection now
+        deltas.close()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: chunking.chunk_text vs. the previous implementation
+(encode for estimate_tokens + encode again + re-encode every chunk), and
+chunking.chunk_parallel (total time and time to the first chunk).
+
+Usage:
+  python benchmarks/bench_chunking.py                  # synthetic ~2 MB text
+  python benchmarks/bench_chunking.py --input big.txt --max-tokens 4000 --repeat 5
+  python benchmarks/bench_chunking.py --size-mb 200 --workers 8 --repeat 1
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_integration_tool.chunking import chunk_parallel, chunk_text, get_tokenizer
+
+
+def legacy_chunk_text(
+    text: str,
+    max_tokens: int = 4000,
+    overlap_tokens: int = 0,
+    encoding_name: str = "cl100k_base",
+) -> Iterator[str]:
+    """chunk_text as it was before the single-pass tokenizer (tiktoken path only)."""
+    import tiktoken
+    if len(tiktoken.get_encoding(encoding_name).encode(text)) <= max_tokens:
+        yield text
+        return
+    enc = tiktoken.get_encoding(encoding_name)
+    tokens = enc.encode(text)
+    decode = enc.decode
+    start = 0
+    while start < len(tokens):
+        end = min(start + max_tokens, len(tokens))
+        chunk_tokens = tokens[start:end]
+        chunk = decode(chunk_tokens)
+        if end < len(tokens) and overlap_tokens <= 0:
+            for sep in ("\n\n", "\n", ". "):
+                idx = chunk.rfind(sep)
+                if idx > max_tokens // 2:
+                    chunk = chunk[: idx + len(sep)]
+                    chunk_tokens = enc.encode(chunk)
+                    end = start + len(chunk_tokens)
+                    break
+        yield chunk
+        start = end - overlap_tokens if overlap_tokens > 0 else end
+
+
+def synthetic_text(size_bytes: int, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    words = ("the quick brown fox jumps over lazy dog token chunk model request "
+             "response stream provider latency budget paragraph sentence").split()
+    parts: list[str] = []
+    total = 0
+    while total < size_bytes:
+        sentences = [
+            " ".join(rnd.choice(words) for _ in range(rnd.randint(6, 20))).capitalize() + "."
+            for _ in range(rnd.randint(2, 8))
+        ]
+        para = " ".join(sentences) + "\n\n"
+        parts.append(para)
+        total += len(para)
+    return "".join(parts)
+
+
+def best_of(fn, repeat: int) -> tuple[float, list[str]]:
+    best = float("inf")
+    out: list[str] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = list(fn())
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def first_chunk_seconds(fn) -> float:
+    t0 = time.perf_counter()
+    next(iter(fn()))
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", type=Path, default=None, help="Text file to chunk (default: synthetic).")
+    parser.add_argument("--size-mb", type=float, default=2.0, help="Size of synthetic text.")
+    parser.add_argument("--max-tokens", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4, help="Threads for chunk_parallel.")
+    args = parser.parse_args()
+
+    text = args.input.read_text(encoding="utf-8") if args.input else synthetic_text(int(args.size_mb * 1024 * 1024))
+    tok = get_tokenizer()
+    if not tok.exact:
+        print("tiktoken (or its cl100k_base data) is unavailable; nothing to compare.", file=sys.stderr)
+        sys.exit(1)
+
+    def parallel():
+        blocks = (text[i:i + (1 << 20)] for i in range(0, len(text), 1 << 20))
+        return chunk_parallel(blocks, max_tokens=args.max_tokens, workers=args.workers)
+
+    new_s, new_chunks = best_of(lambda: chunk_text(text, max_tokens=args.max_tokens), args.repeat)
+    old_s, old_chunks = best_of(lambda: legacy_chunk_text(text, max_tokens=args.max_tokens), args.repeat)
+    par_s, par_chunks = best_of(parallel, args.repeat)
+    new_first = first_chunk_seconds(lambda: chunk_text(text, max_tokens=args.max_tokens))
+    par_first = first_chunk_seconds(parallel)
+    mb = len(text.encode("utf-8")) / (1024 * 1024)
+    print(f"input: {mb:.2f} MB, max_tokens={args.max_tokens}")
+    print(f"legacy chunk_text: {old_s * 1000:8.1f} ms  ({len(old_chunks)} chunks, {mb / old_s:6.1f} MB/s)")
+    print(f"chunk_text:        {new_s * 1000:8.1f} ms  ({len(new_chunks)} chunks, {mb / new_s:6.1f} MB/s)")
+    print(f"chunk_parallel:    {par_s * 1000:8.1f} ms  ({len(par_chunks)} chunks, {mb / par_s:6.1f} MB/s, "
+          f"workers={args.workers})")
+    print(f"speedup: {old_s / new_s:.2f}x")
+    print(f"first chunk: chunk_text {new_first * 1000:.1f} ms, chunk_parallel {par_first * 1000:.1f} ms")
+    if par_chunks != new_chunks:
+        print("warning: chunk_parallel produced different chunks than chunk_text", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
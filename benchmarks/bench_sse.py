@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: the SSE stream loop of OpenRouterProvider (sse.SSEParser over
+raw byte blocks, orjson when installed) vs. the previous one (requests'
+iter_lines over 512-byte reads, decode, strip and json.loads per line).
+
+Both loops replay a recorded SSE transcript, cut into the blocks each one
+reads from the socket, and must produce the same text, finish_reason and
+usage. Reported: wall and CPU time per run, per event and per output token.
+The default transcript is benchmarks/fixtures/openrouter_stream.sse; record
+your own with e.g.
+
+  curl -sN https://openrouter.ai/api/v1/chat/completions -H "Authorization: Bearer $KEY" \\
+       -H "Content-Type: application/json" \\
+       -d '{"model": "deepseek/deepseek-chat", "stream": true, "messages": [...]}' > my.sse
+
+Usage:
+  python benchmarks/bench_sse.py
+  python benchmarks/bench_sse.py --transcript my.sse --block-size 1400 --repeat 500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_integration_tool.providers.openrouter import _delta_content
+from ai_integration_tool import sse
+from ai_integration_tool.sse import iter_json
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "openrouter_stream.sse"
+LEGACY_CHUNK_SIZE = 512  # requests' iter_lines() default
+
+
+def split_blocks(raw: bytes, size: int) -> list[bytes]:
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+def legacy_iter_lines(blocks: list[bytes]) -> Iterator[bytes]:
+    """requests.Response.iter_lines() over iter_content() blocks."""
+    pending = None
+    for chunk in blocks:
+        if pending is not None:
+            chunk = pending + chunk
+        lines = chunk.splitlines()
+        if lines and lines[-1] and chunk and lines[-1][-1] == chunk[-1]:
+            pending = lines.pop()
+        else:
+            pending = None
+        yield from lines
+    if pending is not None:
+        yield pending
+
+
+def legacy_parse_stream_line(line: str) -> tuple[bool, dict | None]:
+    line_str = line.strip()
+    if not line_str.startswith("data: "):
+        return False, None
+    data_str = line_str[6:]
+    if data_str == "[DONE]":
+        return True, None
+    try:
+        return False, json.loads(data_str)
+    except json.JSONDecodeError:
+        return False, None
+
+
+def legacy_loop(blocks: list[bytes]) -> tuple[list[str], str | None, dict | None, int]:
+    """The stream loop of OpenRouterProvider._iter_stream before sse.py."""
+    deltas: list[str] = []
+    finish_reason = usage = None
+    events = 0
+    for line in legacy_iter_lines(blocks):
+        if not line:
+            continue
+        done, event = legacy_parse_stream_line(line.decode("utf-8"))
+        if done:
+            break
+        if event is None:
+            continue
+        events += 1
+        choice = (event.get("choices") or [{}])[0]
+        finish_reason = choice.get("finish_reason") or finish_reason
+        usage = event.get("usage") or usage
+        content = _delta_content(event)
+        if content:
+            deltas.append(content)
+    return deltas, finish_reason, usage, events
+
+
+def sse_loop(blocks: list[bytes]) -> tuple[list[str], str | None, dict | None, int]:
+    """The stream loop of OpenRouterProvider._iter_deltas."""
+    deltas: list[str] = []
+    finish_reason = usage = None
+    events = 0
+    for event in iter_json(blocks):
+        if not isinstance(event, dict):
+            continue
+        events += 1
+        choice = (event.get("choices") or [{}])[0]
+        finish_reason = choice.get("finish_reason") or finish_reason
+        usage = event.get("usage") or usage
+        content = _delta_content(event)
+        if content:
+            deltas.append(content)
+    return deltas, finish_reason, usage, events
+
+
+def measure(loop: Callable, blocks: list[bytes], repeat: int) -> tuple[float, float, tuple]:
+    """Best wall and CPU seconds of repeat runs, and the loop's result."""
+    best_wall = best_cpu = float("inf")
+    result: tuple = ()
+    for _ in range(repeat):
+        w0, c0 = time.perf_counter(), time.process_time()
+        result = loop(blocks)
+        best_cpu = min(best_cpu, time.process_time() - c0)
+        best_wall = min(best_wall, time.perf_counter() - w0)
+    return best_wall, best_cpu, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transcript", type=Path, default=FIXTURE, help="Recorded SSE response body.")
+    parser.add_argument("--block-size", type=int, default=4096,
+                        help="Bytes per socket read of the new loop (what read1() returns on a busy stream).")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--stdlib-json", action="store_true",
+                        help="Parse events with json.loads even if orjson is installed (parser gain alone).")
+    args = parser.parse_args()
+    if args.stdlib_json:
+        sse.loads = lambda data: json.loads(data.decode("utf-8"))
+
+    raw = args.transcript.read_bytes()
+    runs = {
+        "legacy iter_lines": measure(legacy_loop, split_blocks(raw, LEGACY_CHUNK_SIZE), args.repeat),
+        "sse.SSEParser": measure(sse_loop, split_blocks(raw, args.block_size), args.repeat),
+    }
+    (_, _, old), (_, _, new) = runs.values()
+    if old[:3] != new[:3]:
+        print("Outputs differ between the two loops.", file=sys.stderr)
+        sys.exit(1)
+    deltas, finish_reason, usage, events = new
+    tokens = (usage or {}).get("completion_tokens") or len(deltas)
+    json_lib = getattr(sse.loads, "__module__", None) or "json"
+    print(f"transcript: {args.transcript.name}, {len(raw) / 1024:.1f} KB, {events} events, "
+          f"{tokens} tokens, finish_reason={finish_reason}; JSON: {json_lib.split('.')[0]}")
+    for name, (wall, cpu, _) in runs.items():
+        print(f"{name:18} {wall * 1000:7.2f} ms wall  {cpu * 1000:7.2f} ms CPU  "
+              f"{cpu / events * 1e6:6.2f} us/event  {cpu / tokens * 1e6:6.2f} us/token  "
+              f"{events / wall:10.0f} events/s")
+    (old_wall, old_cpu, _), (new_wall, new_cpu, _) = runs.values()
+    print(f"speedup: {old_wall / new_wall:.2f}x wall, {old_cpu / new_cpu:.2f}x CPU")
+
+
+if __name__ == "__main__":
+    main()
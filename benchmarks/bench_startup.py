@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+CLI startup benchmark. Runs fresh interpreters and measures wall time of:
+
+  interpreter    python -c pass (the floor every scenario pays)
+  import         import ai_integration_tool.orchestrator
+  help           python main.py --help
+  cached_prompt  python main.py "prompt" answered from the response cache
+                 (warmed once against the mock server, which is then stopped)
+
+Each scenario is also run once with -X importtime; it fails if it imported any
+of the heavy modules that should load only when needed (tiktoken, requests,
+httpx, yaml). Exits with status 1 on such an import, when a median exceeds
+--max-ms, or when it is slower than --compare's baseline by more than
+--tolerance.
+
+Usage:
+  python benchmarks/bench_startup.py --out startup.json
+  python benchmarks/bench_startup.py --compare startup.json --tolerance 0.25 --max-ms 400
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_server import MockServer
+from run_bench import git_commit, summarize
+
+HEAVY_MODULES = ("tiktoken", "requests", "httpx", "yaml")
+PROMPT = "startup benchmark prompt"
+
+
+def run(cmd: list[str], env: dict) -> subprocess.CompletedProcess:
+    out = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    if out.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} failed ({out.returncode}):\n{out.stderr[-2000:]}")
+    return out
+
+
+def imported_modules(cmd: list[str], env: dict) -> set[str]:
+    """Top-level names of all modules a command imports (from -X importtime)."""
+    out = run([cmd[0], "-X", "importtime", *cmd[1:]], env)
+    names = set()
+    for line in out.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            if name and name != "imported package":
+                names.add(name.split(".")[0])
+    return names
+
+
+def time_command(cmd: list[str], env: dict, runs: int) -> list[float]:
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        run(cmd, env)
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def prepare_cached_prompt(workdir: Path, env: dict) -> list[str]:
+    """Write a config with the response cache on, warm it once, return the command."""
+    config = workdir / "config.yaml"
+    cmd = [sys.executable, "main.py", "-c", str(config), "--no-save", PROMPT]
+    with MockServer() as server:
+        config.write_text(
+            "providers:\n"
+            "  openrouter:\n"
+            f"    base_url: {server.url}\n"
+            "    api_key: bench\n"
+            "cache:\n"
+            "  enabled: true\n"
+            f"  path: {workdir / 'responses.sqlite'}\n",
+            encoding="utf-8",
+        )
+        run(cmd, env)
+    # The server is gone now: a run that is not a cache hit fails
+    return cmd
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Print median changes versus a baseline; return scenarios slower than allowed."""
+    print("\nvs. baseline" + (f" ({baseline['meta'].get('commit')})" if baseline.get("meta") else ""))
+    slower = []
+    for name, new in results.items():
+        old = baseline.get("results", {}).get(name)
+        if not old or name == "interpreter":
+            continue
+        a, b = old["wall_s"]["p50"], new["wall_s"]["p50"]
+        print(f"  {name:14} p50 {a * 1000:8.1f} -> {b * 1000:8.1f} ms  ({(b / a - 1) * 100:+.1f}%)")
+        if b > a * (1 + tolerance):
+            slower.append(name)
+    return slower
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Timed runs per scenario.")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if any scenario's median exceeds this.")
+    parser.add_argument("--out", type=Path, default=None, help="Write JSON results here.")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline JSON from an earlier run.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed median slowdown versus --compare (0.25 = 25%%).")
+    args = parser.parse_args()
+
+    failures: list[str] = []
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        # Isolated config cache, so the first run parses YAML and the rest hit the cache
+        env = dict(os.environ, AITOOL_CACHE_DIR=str(workdir / "config-cache"))
+        scenarios = {
+            "interpreter": [sys.executable, "-c", "pass"],
+            "import": [sys.executable, "-c", "import ai_integration_tool.orchestrator"],
+            "help": [sys.executable, "main.py", "--help"],
+            "cached_prompt": prepare_cached_prompt(workdir, env),
+        }
+        for name, cmd in scenarios.items():
+            run(cmd, env)  # warm the OS file cache and .pyc files
+            times = time_command(cmd, env, args.runs)
+            heavy = sorted(imported_modules(cmd, env) & set(HEAVY_MODULES)) if name != "interpreter" else []
+            results[name] = {"wall_s": summarize(times), "heavy_imports": heavy}
+            p50_ms = results[name]["wall_s"]["p50"] * 1000
+            print(f"{name:14} p50 {p50_ms:8.1f} ms  p95 {results[name]['wall_s']['p95'] * 1000:8.1f} ms"
+                  + (f"  imported: {', '.join(heavy)}" if heavy else ""))
+            if heavy:
+                failures.append(f"{name} imported {', '.join(heavy)}")
+            if args.max_ms is not None and name != "interpreter" and p50_ms > args.max_ms:
+                failures.append(f"{name} median {p50_ms:.1f} ms > {args.max_ms:g} ms")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+        },
+        "results": results,
+    }
+    if args.out is not None:
+        args.out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nResults written to {args.out}")
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        for name in compare(results, baseline, args.tolerance):
+            failures.append(f"{name} is more than {args.tolerance:.0%} slower than the baseline")
+    if failures:
+        print("\nFAILED: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Local mock of an OpenAI/OpenRouter-compatible POST /chat/completions endpoint
+for offline benchmarks and tests. Supports JSON and SSE streaming responses,
+a configurable first-byte latency and token rate, injected 429/5xx errors and
+dropped streams, and finish_reason="length" when a reply exceeds max_tokens.
+One "token" is one numbered word of the generated reply.
+
+Usage:
+  python benchmarks/mock_server.py --port 8999 --latency 0.2 --token-rate 100
+  # then set providers.openrouter.base_url: http://127.0.0.1:8999
+
+From Python:
+  with MockServer(latency=0.05, reply_tokens=200) as server:
+      ... server.url ...
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_LAST_INDEX = re.compile(r"[a-z]+(\d+)\W*$")
+WORDS = (
+    "the model streams tokens while the client measures latency and throughput "
+    "for every request chunk provider retry budget paragraph sentence answer"
+).split()
+
+
+class MockSettings:
+    """Behaviour of the mock server (shared by all handler threads)."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        token_rate: float = 0.0,
+        reply_tokens: int = 100,
+        tokens_per_event: int = 1,
+        error_429_rate: float = 0.0,
+        error_5xx_rate: float = 0.0,
+        retry_after: float | None = 0.0,
+        truncate_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        seed: int | None = 0,
+    ):
+        self.latency = latency
+        self.token_rate = token_rate
+        self.reply_tokens = reply_tokens
+        self.tokens_per_event = max(1, tokens_per_event)
+        self.error_429_rate = error_429_rate
+        self.error_5xx_rate = error_5xx_rate
+        self.retry_after = retry_after
+        self.truncate_rate = truncate_rate
+        self.drop_rate = drop_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    settings: MockSettings
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "invalid JSON"}})
+            return
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+        s = self.settings
+        s.count_request()
+        if s.latency > 0:
+            time.sleep(s.latency)
+        if s.roll(s.error_429_rate):
+            headers = {} if s.retry_after is None else {"Retry-After": f"{s.retry_after:g}"}
+            self._send_json(429, {"error": {"message": "rate limited (mock)"}}, headers)
+            return
+        if s.roll(s.error_5xx_rate):
+            self._send_json(503, {"error": {"message": "unavailable (mock)"}})
+            return
+
+        messages = body.get("messages") or []
+        prompt = " ".join(str(m.get("content", "")) for m in messages)
+        # Tokens are numbered ("model17 "), so a continuation request (whose
+        # last assistant message ends with a partial reply) resumes after it.
+        start = 0
+        partial = [m for m in messages if m.get("role") == "assistant"]
+        if partial:
+            match = _LAST_INDEX.search(str(partial[-1].get("content", "")))
+            if match:
+                start = int(match.group(1)) + 1
+        remaining = max(1, s.reply_tokens - start)
+        max_tokens = int(body.get("max_tokens") or remaining)
+        n_tokens = min(remaining, max_tokens)
+        finish_reason = "length" if n_tokens < remaining else "stop"
+        if finish_reason == "stop" and s.roll(s.truncate_rate):
+            n_tokens, finish_reason = max(1, n_tokens // 2), "length"
+        tokens = [f"{WORDS[i % len(WORDS)]}{i} " for i in range(start, start + n_tokens)]
+        if finish_reason == "stop":
+            tokens[-1] = tokens[-1].rstrip() + ".\n"
+        usage = {
+            "prompt_tokens": len(prompt.split()),
+            "completion_tokens": n_tokens,
+            "total_tokens": len(prompt.split()) + n_tokens,
+        }
+        if body.get("stream"):
+            self._stream(body, tokens, finish_reason, usage)
+        else:
+            if s.token_rate > 0:
+                time.sleep(n_tokens / s.token_rate)
+            self._send_json(200, {
+                "id": "mock",
+                "object": "chat.completion",
+                "model": body.get("model"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": finish_reason,
+                }],
+                "usage": usage,
+            })
+
+    def _stream(self, body: dict, tokens: list[str], finish_reason: str, usage: dict) -> None:
+        s = self.settings
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        drop_at = len(tokens) // 2 if s.roll(s.drop_rate) else None
+        self._write_chunk(b": mock keep-alive\n\n")
+        step = s.tokens_per_event
+        for i in range(0, len(tokens), step):
+            if drop_at is not None and i >= drop_at:
+                # Abort mid-stream without the terminating chunk
+                self.close_connection = True
+                self.wfile.flush()
+                return
+            if s.token_rate > 0:
+                time.sleep(len(tokens[i:i + step]) / s.token_rate)
+            event = {"choices": [{"index": 0, "delta": {"content": "".join(tokens[i:i + step])}}]}
+            self._write_chunk(b"data: " + json.dumps(event).encode() + b"\n\n")
+        final = {"choices": [{"index": 0, "delta": {}, "finish_reason": finish_reason}]}
+        if (body.get("stream_options") or {}).get("include_usage"):
+            final["usage"] = usage
+        self._write_chunk(b"data: " + json.dumps(final).encode() + b"\n\n")
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _send_json(self, status: int, data: dict, headers: dict | None = None) -> None:
+        out = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(out)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # benchmarks open many connections at once
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients closing pooled keep-alive connections are expected, not errors
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class MockServer:
+    """Mock server running in a background thread; url is the base_url to configure."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **settings):
+        self.settings = MockSettings(**settings)
+        handler = type("Handler", (_Handler,), {"settings": self.settings})
+        self._server = _Server((host, port), handler)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name="mock-server")
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the first byte.")
+    parser.add_argument("--token-rate", type=float, default=0.0, help="Tokens per second (0 = instant).")
+    parser.add_argument("--reply-tokens", type=int, default=100, help="Tokens per reply.")
+    parser.add_argument("--tokens-per-event", type=int, default=1, help="Tokens per SSE event.")
+    parser.add_argument("--error-429-rate", type=float, default=0.0)
+    parser.add_argument("--error-5xx-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=0.0, help="Retry-After sent with 429s.")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="Share of replies cut with finish_reason=length.")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Share of streams aborted midway.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    server = MockServer(
+        args.host,
+        args.port,
+        latency=args.latency,
+        token_rate=args.token_rate,
+        reply_tokens=args.reply_tokens,
+        tokens_per_event=args.tokens_per_event,
+        error_429_rate=args.error_429_rate,
+        error_5xx_rate=args.error_5xx_rate,
+        retry_after=args.retry_after,
+        truncate_rate=args.truncate_rate,
+        drop_rate=args.drop_rate,
+        seed=args.seed,
+    )
+    print(f"Mock /chat/completions listening on {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
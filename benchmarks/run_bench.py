@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite. Starts the local mock server (mock_server.py) and
+measures, without network access:
+
+  provider         OpenRouterProvider.chat, concurrent non-streaming requests
+  provider_stream  OpenRouterProvider.chat(stream=True), incl. time to first token
+  process_text     AIOrchestrator.process_text over a multi-chunk document
+  chunk_text       chunking.chunk_text on synthetic text (no server)
+  continuation     continuation.request_continuation of replies cut at max_tokens
+
+Each scenario reports wall time, throughput, p50/p95/p99 latency and memory.
+Results are written as JSON (--out) so runs can be compared across commits
+(--compare baseline.json).
+
+Usage:
+  python benchmarks/run_bench.py --out bench.json
+  python benchmarks/run_bench.py --scenarios provider,process_text --concurrency 32 --compare bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ai_integration_tool.chunking import chunk_text, get_tokenizer
+from ai_integration_tool.continuation import request_continuation
+from ai_integration_tool.orchestrator import AIOrchestrator
+from ai_integration_tool.providers.base import ChatMessage, collect_result
+from ai_integration_tool.providers.openrouter import OpenRouterProvider
+from bench_chunking import synthetic_text
+from mock_server import MockServer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCENARIOS = ("provider", "provider_stream", "process_text", "chunk_text", "continuation")
+MODEL = "mock/model"
+
+
+def summarize(values: list[float]) -> dict:
+    """Nearest-rank percentiles of a list of latencies (seconds)."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def pct(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))], 6)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 6),
+        "p50": pct(0.50),
+        "p95": pct(0.95),
+        "p99": pct(0.99),
+        "max": round(ordered[-1], 6),
+    }
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process so far (MB), if the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def timed_calls(fn: Callable[[int], float | None], n: int, concurrency: int) -> tuple[float, list[float], int]:
+    """Run fn(i) n times on a thread pool; return (wall seconds, latencies, errors)."""
+    latencies: list[float] = []
+    errors = 0
+
+    def one(i: int) -> float:
+        t0 = time.perf_counter()
+        fn(i)
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(one, i) for i in range(n)]
+        for fut in futures:
+            try:
+                latencies.append(fut.result())
+            except Exception:
+                errors += 1
+    return time.perf_counter() - t0, latencies, errors
+
+
+def mock_settings(args: argparse.Namespace, **overrides) -> dict:
+    settings = {
+        "latency": args.latency,
+        "token_rate": args.token_rate,
+        "reply_tokens": args.reply_tokens,
+        "tokens_per_event": args.tokens_per_event,
+        "error_429_rate": args.error_rate,
+    }
+    settings.update(overrides)
+    return settings
+
+
+def bench_provider(args: argparse.Namespace, stream: bool = False) -> dict:
+    with MockServer(**mock_settings(args)) as server:
+        prov = OpenRouterProvider({"base_url": server.url, "api_key": "bench", "pool_size": args.concurrency})
+        messages = [ChatMessage("user", "Benchmark prompt " * 20)]
+        ttfts: list[float] = []
+
+        def call(i: int) -> None:
+            t0 = time.perf_counter()
+            out = prov.chat(messages, model=MODEL, max_tokens=4096, stream=stream)
+            if stream:
+                for _ in out:
+                    ttfts.append(time.perf_counter() - t0)
+                    break
+            collect_result(out)
+
+        wall, latencies, errors = timed_calls(call, args.requests, args.concurrency)
+        prov.close()
+    result = {
+        "wall_s": round(wall, 4),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "throughput_per_s": round(len(latencies) / wall, 2),
+        "latency_s": summarize(latencies),
+    }
+    if stream:
+        result["ttft_s"] = summarize(ttfts)
+    return result
+
+
+def bench_process_text(args: argparse.Namespace) -> dict:
+    text = synthetic_text(args.chunks * 1600, seed=1)
+    with MockServer(**mock_settings(args)) as server, tempfile.TemporaryDirectory() as tmp:
+        config = {
+            "providers": {"openrouter": {"base_url": server.url, "api_key": "bench"}},
+            "default_model": MODEL,
+            "max_input_tokens": 400,
+            "concurrency": args.concurrency,
+            "retry": {"min_delay_seconds": 0.01, "max_delay_seconds": 0.1},
+            "output": {"directory": tmp},
+        }
+        with AIOrchestrator(config) as orch:
+            t0 = time.perf_counter()
+            responses = orch.process_text(text, save_each_chunk=False)
+            wall = time.perf_counter() - t0
+            chunk_latency = orch.metrics.snapshot()["histograms"].get("aitool_chunk_latency_seconds", {})
+    return {
+        "wall_s": round(wall, 4),
+        "chunks": len(responses),
+        "concurrency": args.concurrency,
+        "throughput_per_s": round(len(responses) / wall, 2),
+        "chunk_latency_s": chunk_latency.get("all", {"count": 0}),
+    }
+
+
+def bench_chunk_text(args: argparse.Namespace) -> dict:
+    text = synthetic_text(int(args.size_mb * 1024 * 1024))
+    mb = len(text.encode("utf-8")) / (1024 * 1024)
+    times: list[float] = []
+    chunks = 0
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        chunks = sum(1 for _ in chunk_text(text, max_tokens=4000))
+        times.append(time.perf_counter() - t0)
+    best = min(times)
+    return {
+        "wall_s": round(best, 4),
+        "input_mb": round(mb, 2),
+        "chunks": chunks,
+        "exact_tokenizer": get_tokenizer().exact,
+        "throughput_mb_per_s": round(mb / best, 2),
+        "latency_s": summarize(times),
+    }
+
+
+def bench_continuation(args: argparse.Namespace) -> dict:
+    # Replies are 4x max_tokens, so each needs three continuation rounds
+    max_tokens = 100
+    with MockServer(**mock_settings(args, reply_tokens=max_tokens * 4)) as server:
+        prov = OpenRouterProvider({"base_url": server.url, "api_key": "bench", "pool_size": args.concurrency})
+        messages = [ChatMessage("user", "Write a long answer. " * 10)]
+        rounds: list[int] = []
+
+        def get_reply(msgs: list[ChatMessage]) -> str:
+            return prov.chat(msgs, model=MODEL, max_tokens=max_tokens)
+
+        def call(i: int) -> None:
+            count = 0
+
+            def on_round(context_tokens: int, saved: int) -> None:
+                nonlocal count
+                count += 1
+
+            request_continuation(get_reply, messages, get_reply(messages), on_round=on_round)
+            rounds.append(count)
+
+        n = max(1, args.requests // 4)
+        wall, latencies, errors = timed_calls(call, n, args.concurrency)
+        prov.close()
+    return {
+        "wall_s": round(wall, 4),
+        "replies": n,
+        "errors": errors,
+        "rounds_per_reply": round(sum(rounds) / len(rounds), 2) if rounds else 0,
+        "throughput_per_s": round(len(latencies) / wall, 2),
+        "latency_s": summarize(latencies),
+    }
+
+
+RUNNERS: dict[str, Callable[[argparse.Namespace], dict]] = {
+    "provider": bench_provider,
+    "provider_stream": lambda args: bench_provider(args, stream=True),
+    "process_text": bench_process_text,
+    "chunk_text": bench_chunk_text,
+    "continuation": bench_continuation,
+}
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print the change of throughput and latency percentiles versus a baseline run."""
+    print("\nvs. baseline" + (f" ({baseline['meta'].get('commit')})" if baseline.get("meta") else ""))
+    for name, new in results.items():
+        old = baseline.get("results", {}).get(name)
+        if not old:
+            continue
+        for key in ("throughput_per_s", "throughput_mb_per_s"):
+            if key in new and old.get(key):
+                print(f"  {name:16} {key:20} {old[key]:>10} -> {new[key]:>10}  ({(new[key] / old[key] - 1) * 100:+.1f}%)")
+        for section in ("latency_s", "ttft_s", "chunk_latency_s"):
+            for q in ("p50", "p95", "p99"):
+                a, b = (old.get(section) or {}).get(q), (new.get(section) or {}).get(q)
+                if a and b:
+                    print(f"  {name:16} {section + '.' + q:20} {a:>10} -> {b:>10}  ({(b / a - 1) * 100:+.1f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset to run.")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per provider scenario.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock first-byte latency (s).")
+    parser.add_argument("--token-rate", type=float, default=0.0, help="Mock tokens per second (0 = instant).")
+    parser.add_argument("--reply-tokens", type=int, default=100)
+    parser.add_argument("--tokens-per-event", type=int, default=1)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of mock requests answered with 429.")
+    parser.add_argument("--chunks", type=int, default=40, help="Approximate chunks for process_text.")
+    parser.add_argument("--size-mb", type=float, default=2.0, help="Synthetic text size for chunk_text.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeats for chunk_text.")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also report tracemalloc peak per scenario (slows the timings).")
+    parser.add_argument("--out", type=Path, default=None, help="Write JSON results here.")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline JSON from an earlier run.")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in RUNNERS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}; choose from {', '.join(SCENARIOS)}")
+
+    results: dict[str, dict] = {}
+    for name in names:
+        if args.trace_memory:
+            tracemalloc.start()
+        result = RUNNERS[name](args)
+        if args.trace_memory:
+            result["tracemalloc_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+            tracemalloc.stop()
+        result["peak_rss_mb"] = peak_rss_mb()
+        results[name] = result
+        lat = result.get("latency_s") or result.get("chunk_latency_s") or {}
+        rate = result.get("throughput_per_s", result.get("throughput_mb_per_s"))
+        unit = "MB/s" if "throughput_mb_per_s" in result else "/s"
+        print(
+            f"{name:16} {result['wall_s']:8.3f}s  {rate:>9} {unit:4}  "
+            f"p50 {lat.get('p50', '-')}  p95 {lat.get('p95', '-')}  p99 {lat.get('p99', '-')}  "
+            f"rss {result['peak_rss_mb']} MB"
+        )
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        },
+        "results": results,
+    }
+    if args.out is not None:
+        args.out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nResults written to {args.out}")
+    if args.compare is not None:
+        compare(results, json.loads(args.compare.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
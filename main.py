@@ -6,18 +6,28 @@ Usage:
   python main.py "Your prompt"            # single prompt, output to file
   python main.py -i request.txt -o result.txt   # input from file, full result to one file
   python main.py --file input.txt        # same as -i; uses request_response.txt if no -o
+  python main.py -i request.txt -o result.txt --resume   # skip chunks finished by a failed run
   python main.py --stream "Prompt"       # stream response to stdout and save to file
+  python main.py -i request.txt -o result.txt --stream   # write/echo the result as it is generated
+  python main.py -i report.txt -o summary.txt --reduce "Summarize"   # one answer for the whole file
+  python main.py --batch requests.jsonl --out results.jsonl   # many prompts, concurrently
 """
 from __future__ import annotations
 
 import argparse
 import sys
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, TextIO
 
 # Add project root so "ai_integration_tool" is importable
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from ai_integration_tool.orchestrator import AIOrchestrator
+# The package is imported after argument parsing, so --help and usage errors
+# stay fast; providers, YAML and the tokenizer load only when a run needs them.
+if TYPE_CHECKING:
+    from ai_integration_tool.journal import RunJournal
+    from ai_integration_tool.orchestrator import AIOrchestrator
 
 
 def main() -> None:
@@ -37,10 +47,11 @@ def main() -> None:
         help="Read your request from this .txt file (long text is chunked automatically).",
     )
     parser.add_argument(
-        "--output", "-o",
+        "--output", "-o", "--out",
         type=Path,
         default=None,
-        help="Write the full AI response to this .txt file (use with --input).",
+        help="Write the full AI response to this .txt file (use with --input), "
+        "or the results .jsonl file (use with --batch).",
     )
     parser.add_argument(
         "--file", "-f",
@@ -48,10 +59,28 @@ def main() -> None:
         default=None,
         help="Same as --input: read request from this .txt file.",
     )
+    parser.add_argument(
+        "--batch", "-b",
+        type=Path,
+        default=None,
+        help="Run every prompt in this .jsonl file concurrently "
+        '(one {"id", "prompt", "system", "model"} object per line).',
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Only print the chunks, requests, tokens and estimated cost of the run (no network access).",
+    )
+    parser.add_argument(
+        "--reduce",
+        action="store_true",
+        help="With --input, combine the per-chunk responses into one answer (map-reduce); "
+        "the prompt argument, if given, is the task applied to every chunk.",
+    )
     parser.add_argument(
         "--stream", "-s",
         action="store_true",
-        help="Stream response to stdout (when supported by model).",
+        help="Stream response to stdout (when supported by model); with --input, also write it to the output file as it arrives.",
     )
     parser.add_argument(
         "--model", "-m",
@@ -71,6 +100,40 @@ def main() -> None:
         action="store_true",
         help="Do not save response to output_N.txt.",
     )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=None,
+        help="Number of chunks to send in parallel (overrides 'concurrency' in config).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="With --input: reuse chunks recorded in the run journal by an earlier, "
+        "unfinished run instead of sending them again.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the response cache for this run.",
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Ignore cached responses but store fresh ones (enables the cache).",
+    )
+    parser.add_argument(
+        "--metrics-out",
+        type=Path,
+        default=None,
+        help="Write a JSON summary of run metrics (latency, TTFT, tokens/s, retries, ...) here.",
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        type=Path,
+        default=None,
+        help="Write run metrics in Prometheus text format here (for the textfile collector).",
+    )
     parser.add_argument(
         "--config", "-c",
         type=Path,
@@ -78,19 +141,182 @@ def main() -> None:
         help="Path to config YAML (default: config.yaml or config.example.yaml).",
     )
     args = parser.parse_args()
+    if args.reduce and args.stream:
+        # The reduce tree has no single stream to show until its last level
+        parser.error("--reduce cannot be combined with --stream")
 
     from ai_integration_tool.config_loader import load_config
     config_path = str(args.config) if args.config else None
-    orch = AIOrchestrator(config=load_config(config_path))
+    config = load_config(config_path)
+    if args.jobs is not None:
+        config["concurrency"] = max(1, args.jobs)
+    if args.no_cache or args.refresh_cache:
+        cache_cfg = config.setdefault("cache", {}) or {}
+        cache_cfg["enabled"] = not args.no_cache
+        cache_cfg["refresh"] = args.refresh_cache
+        config["cache"] = cache_cfg
+    if args.plan:
+        _plan(args, config)
+        return
+    from ai_integration_tool.orchestrator import AIOrchestrator
+    orch = AIOrchestrator(config=config)
+    try:
+        _run(args, orch)
+    finally:
+        orch.close()
+        # Written even when the run fails, so the failure itself is visible
+        if args.metrics_out is not None:
+            orch.metrics.write_json(args.metrics_out, extra={"health": orch.health.snapshot()})
+        if args.metrics_prom is not None:
+            orch.metrics.write_prometheus(args.metrics_prom)
+
+
+def _plan(args: argparse.Namespace, config: dict) -> None:
+    """Print the plan of the requested run (--input, --batch or a prompt) without sending anything."""
+    from ai_integration_tool.planner import format_plan, plan_requests
+
+    concurrency = max(1, int(config.get("concurrency", 1)))
+    input_file = args.input or args.file
+    source = args.batch if args.batch is not None else input_file
+    if source is not None and not source.exists():
+        print(f"Error: file not found: {source}", file=sys.stderr)
+        sys.exit(1)
+    if args.batch is not None:
+        from ai_integration_tool.batch import read_batch
+        items = (item for item in read_batch(args.batch) if "error" not in item)
+        requests = (
+            (str(item["id"]), item.get("system"), item["prompt"], item.get("model") or args.model)
+            for item in items
+        )
+    elif input_file is not None:
+        chunks = _chunk_input(input_file, config)
+        system = args.prompt if args.reduce else None
+        requests = ((f"chunk {i + 1}", system, chunk, args.model) for i, chunk in enumerate(chunks))
+    elif args.prompt is not None:
+        requests = iter([("prompt", None, args.prompt, args.model)])
+    else:
+        print("Error: --plan needs --input, --batch or a prompt.", file=sys.stderr)
+        sys.exit(1)
+    plan = plan_requests(requests, config, concurrency=concurrency, provider=args.provider)
+    print(format_plan(plan))
+    if args.reduce and len(plan.rows) > 1:
+        print(f"Reduce:        up to {len(plan.rows) - 1} more request(s) to combine the answers (not priced)")
+
+
+def _chunk_input(input_file: Path, config: dict) -> Iterable[str]:
+    """Chunk an input file lazily; with chunk_workers > 1, segments are tokenized in parallel."""
+    from ai_integration_tool.chunking import chunk_parallel, read_text_blocks
+
+    return chunk_parallel(
+        read_text_blocks(input_file),
+        max_tokens=int(config.get("max_input_tokens", 4000)),
+        workers=int(config.get("chunk_workers", 1)),
+    )
+
+
+def _stream_to_file(
+    orch: AIOrchestrator, chunks: Iterable[str], out: TextIO, args: argparse.Namespace, journal: RunJournal
+) -> int:
+    """
+    Write response deltas to out (and echo them to stdout) as they arrive;
+    report each finished chunk on stderr. Returns the number of chunks.
+    """
+    count = 0
+    current = -1
+    chars = 0
+    started = time.monotonic()
+    events = orch.iter_process_stream(
+        chunks,
+        model=args.model,
+        provider=args.provider,
+        auto_continue=True,
+        journal=journal,
+    )
+    for index, delta in events:
+        if index != current:
+            current = index
+            if count:
+                out.write("\n\n---\n\n")
+                print("\n\n---\n", flush=True)
+        if delta:
+            out.write(delta)
+            out.flush()
+            print(delta, end="", flush=True)
+            chars += len(delta)
+            continue
+        count += 1
+        print(
+            f"\n[chunk {index + 1} done: {chars} chars, {time.monotonic() - started:.1f}s elapsed]",
+            file=sys.stderr,
+            flush=True,
+        )
+        chars = 0
+    if count:
+        print()
+    return count
+
+
+def _reduce_to_file(
+    orch: AIOrchestrator, chunks: Iterable[str], output_file: Path, args: argparse.Namespace, journal: RunJournal
+) -> int:
+    """Map-reduce the chunks into one answer, written to output_file. Returns the number of chunks."""
+    from ai_integration_tool.reduce import map_reduce
+
+    reduce_cfg = orch.config.get("reduce", {}) or {}
+    count = 0
+
+    def on_level(level: int, inputs: int, outputs: int) -> None:
+        nonlocal count
+        if level == 0:
+            count = inputs
+            print(f"[map: {inputs} chunk(s) answered]", file=sys.stderr, flush=True)
+        else:
+            print(f"[reduce level {level}: {inputs} -> {outputs}]", file=sys.stderr, flush=True)
+
+    answer = map_reduce(
+        orch,
+        chunks,
+        system_prompt=args.prompt,
+        reduce_instructions=reduce_cfg.get("prompt"),
+        model=args.model,
+        provider=args.provider,
+        journal=journal,
+        max_reduce_tokens=reduce_cfg.get("max_input_tokens"),
+        on_level=on_level,
+    )
+    output_file.write_text(answer, encoding="utf-8")
+    return count
+
+
+def _run(args: argparse.Namespace, orch: AIOrchestrator) -> None:
+    if args.batch is not None:
+        from ai_integration_tool.batch import read_batch, run_batch
+        if not args.batch.exists():
+            print(f"Error: file not found: {args.batch}", file=sys.stderr)
+            sys.exit(1)
+        output_file = args.output
+        if output_file is None:
+            output_file = args.batch.with_name(f"{args.batch.stem}_results.jsonl")
+        output_file = output_file.resolve()
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        # Results are appended as each request finishes (completion order)
+        with orch, open(output_file, "w", encoding="utf-8") as out:
+            counts = run_batch(orch, read_batch(args.batch), out, provider=args.provider, model=args.model)
+        failed = f", {counts['failed']} failed" if counts["failed"] else ""
+        print(f"Processed {counts['total']} request(s){failed}. Results written to: {output_file}")
+        if counts["failed"]:
+            sys.exit(1)
+        return
 
     # Input from file: --input / --file (file takes precedence for backward compat)
     input_file = args.input or args.file
     if input_file is not None:
+        from ai_integration_tool.chunking import read_text_blocks
+        from ai_integration_tool.journal import RunJournal
         if not input_file.exists():
             print(f"Error: file not found: {input_file}", file=sys.stderr)
             sys.exit(1)
-        text = input_file.read_text(encoding="utf-8")
-        if not text.strip():
+        if not any(block.strip() for block in read_text_blocks(input_file)):
             print("Error: input file is empty.", file=sys.stderr)
             sys.exit(1)
         # Output path: explicit --output, or default: {input_stem}_response.txt
@@ -99,18 +325,68 @@ def main() -> None:
             output_file = input_file.with_name(f"{input_file.stem}_response.txt")
         output_file = output_file.resolve()
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        # Process (chunk if long), combine all responses into one and write to output file
-        responses = orch.process_text(
-            text,
-            model=args.model,
-            provider=args.provider,
-            stream=False,
-            save_each_chunk=False,  # we write one combined file
-            auto_continue=True,
-        )
-        combined = "\n\n---\n\n".join(responses) if len(responses) > 1 else (responses[0] if responses else "")
-        output_file.write_text(combined, encoding="utf-8")
-        print(f"Processed {len(responses)} chunk(s). Full response written to: {output_file}")
+        # Every finished chunk is journaled next to the output, so a failed or
+        # killed run can be resumed without paying for those chunks again.
+        journal_path = output_file.with_name(output_file.name + ".journal.jsonl")
+        if args.resume and not journal_path.exists():
+            print(f"Note: no journal at {journal_path}; starting from the beginning.", file=sys.stderr)
+        journal = RunJournal(journal_path, resume=args.resume)
+        if journal.previous is not None:
+            print(
+                f"Warning: moved the journal of an earlier unfinished run to {journal.previous}; "
+                f"to continue that run instead, move it back and re-run with --resume.",
+                file=sys.stderr,
+            )
+        # Read and chunk the input lazily; append each response to the output
+        # file as soon as it is ready, so memory stays bounded and a crash keeps
+        # everything finished so far.
+        chunks = _chunk_input(input_file, orch.config)
+        count = 0
+        try:
+            if args.reduce:
+                count = _reduce_to_file(orch, chunks, output_file, args, journal)
+            else:
+                with open(output_file, "w", encoding="utf-8") as out:
+                    if args.stream:
+                        count = _stream_to_file(orch, chunks, out, args, journal)
+                    else:
+                        responses = orch.iter_process_chunks(
+                            chunks,
+                            model=args.model,
+                            provider=args.provider,
+                            save_each_chunk=False,  # we write one combined file
+                            auto_continue=True,
+                            journal=journal,
+                        )
+                        for response in responses:
+                            if count:
+                                out.write("\n\n---\n\n")
+                            out.write(response)
+                            out.flush()
+                            count += 1
+        except BaseException:
+            journal.close()
+            print(
+                f"Run stopped after {len(journal)} completed chunk(s); "
+                f"re-run with --resume to continue from {journal_path}",
+                file=sys.stderr,
+            )
+            raise
+        journal.remove()
+        notes = []
+        if orch.cache is not None:
+            notes.append(f"{orch.stats['cache_hits']} from cache")
+        if orch.stats["journal_hits"]:
+            notes.append(f"{orch.stats['journal_hits']} resumed")
+        note = f" ({', '.join(notes)})" if notes else ""
+        print(f"Processed {count} chunk(s){note}. Full response written to: {output_file}")
+        if orch.stats["reduce_requests"]:
+            print(f"Reduce requests: {orch.stats['reduce_requests']}.")
+        if orch.stats["continuation_rounds"]:
+            print(
+                f"Continuation rounds: {orch.stats['continuation_rounds']}; "
+                f"bounded context saved ~{orch.stats['continuation_tokens_saved']} input tokens."
+            )
         return
 
     if args.prompt is not None:
@@ -147,27 +423,37 @@ def main() -> None:
             print(reply)
         return
 
-    # Interactive chat
-    print("AI Integration Tool – interactive chat. Type 'exit' or 'quit' to end.\n")
-    while True:
-        try:
-            user = input("You: ").strip()
-        except (EOFError, KeyboardInterrupt):
-            break
-        if not user or user.lower() in ("exit", "quit"):
-            print("Bye.")
-            break
-        try:
-            reply = orch.chat(
-                user,
-                model=args.model,
-                provider=args.provider,
-                stream=args.stream,
-                save_to_file=False,
-            )
-            print(f"Assistant: {reply}\n")
-        except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
+    # Interactive chat: multi-turn history trimmed to a token budget (config 'conversation')
+    from ai_integration_tool.conversation import Conversation
+    conversation = Conversation.from_config(orch, model=args.model, provider=args.provider)
+    print("AI Integration Tool – interactive chat. Type 'exit' or 'quit' to end, 'reset' to clear the history.\n")
+    try:
+        while True:
+            try:
+                user = input("You: ").strip()
+            except (EOFError, KeyboardInterrupt):
+                break
+            if not user or user.lower() in ("exit", "quit"):
+                print("Bye.")
+                break
+            if user.lower() == "reset":
+                conversation.reset()
+                print("History cleared.\n")
+                continue
+            try:
+                if args.stream:
+                    print("Assistant: ", end="", flush=True)
+                    for delta in conversation.send(user, stream=True):
+                        print(delta, end="", flush=True)
+                    print("\n")
+                else:
+                    print(f"Assistant: {conversation.send(user)}\n")
+            except KeyboardInterrupt:
+                print("\n[interrupted]\n")
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+    finally:
+        conversation.close()
 
 
 if __name__ == "__main__":
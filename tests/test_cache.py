@@ -0,0 +1,97 @@
+"""ResponseCache: round trip, TTL expiry and least-recently-used eviction."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_integration_tool import cache as cache_module
+from ai_integration_tool.cache import ResponseCache, cache_from_config
+from ai_integration_tool.providers.base import ChatMessage, ChatResult
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable stand-in for the cache's wall clock."""
+    now = SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def make_cache(tmp_path: Path, **kwargs) -> ResponseCache:
+    return ResponseCache(tmp_path / "responses.sqlite3", **kwargs)
+
+
+def test_round_trip_keeps_finish_reason_and_usage(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("k", ChatResult("hello", "length", {"completion_tokens": 3}))
+    hit = cache.get("k")
+    assert hit == "hello"
+    assert hit.finish_reason == "length"
+    assert hit.usage == {"completion_tokens": 3}
+    assert cache.get("missing") is None
+    cache.close()
+
+
+def test_key_depends_on_every_request_field():
+    messages = [ChatMessage("user", "hi")]
+    key = ResponseCache.make_key("openrouter", "m", 100, messages)
+    assert key == ResponseCache.make_key("openrouter", "m", 100, [ChatMessage("user", "hi")])
+    assert key != ResponseCache.make_key("other", "m", 100, messages)
+    assert key != ResponseCache.make_key("openrouter", "m2", 100, messages)
+    assert key != ResponseCache.make_key("openrouter", "m", 200, messages)
+    assert key != ResponseCache.make_key("openrouter", "m", 100, [ChatMessage("system", "hi")])
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl_seconds=60)
+    cache.put("k", "v")
+    clock.value += 59
+    assert cache.get("k") == "v"
+    clock.value += 2
+    assert cache.get("k") is None
+    cache.close()
+
+
+def test_expired_entries_are_dropped_on_put(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl_seconds=60)
+    cache.put("old", "v")
+    clock.value += 61
+    cache.put("new", "v")
+    rows = [key for (key,) in cache._conn.execute("SELECT key FROM responses")]
+    assert rows == ["new"]
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = make_cache(tmp_path, max_bytes=30)
+    for key in ("a", "b", "c"):
+        cache.put(key, "x" * 10)
+        clock.value += 1
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") is not None
+    clock.value += 1
+    cache.put("d", "x" * 10)
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+    cache.close()
+
+
+def test_entries_persist_across_instances(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("k", "v")
+    cache.close()
+    reopened = make_cache(tmp_path)
+    assert reopened.get("k") == "v"
+    reopened.close()
+
+
+def test_cache_is_opt_in(tmp_path):
+    assert cache_from_config({}) is None
+    cache = cache_from_config({"cache": {"enabled": True, "path": str(tmp_path / "c.sqlite3"), "max_size_mb": 1}})
+    assert cache.max_bytes == 1024 * 1024
+    cache.close()
@@ -0,0 +1,81 @@
+"""iter_process_chunks: bounded concurrency, lazy input, results in input order."""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_integration_tool.orchestrator import AIOrchestrator
+from ai_integration_tool.providers import PROVIDER_REGISTRY
+from ai_integration_tool.providers.base import BaseProvider, ChatResult
+
+
+class EchoProvider(BaseProvider):
+    """Answers with the prompt after a delay that shrinks with the chunk number."""
+
+    name = "echo"
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def chat(self, messages, model, max_tokens=4096, stream=False):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            n = int(messages[-1].content.split()[-1])
+            time.sleep(0.02 * (8 - n % 8) / 8)
+            return ChatResult(f"answer {n}", "stop")
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+
+@pytest.fixture
+def orch(tmp_path, monkeypatch):
+    monkeypatch.setitem(PROVIDER_REGISTRY, "echo", EchoProvider)
+    EchoProvider.in_flight = EchoProvider.max_in_flight = 0
+    orch = AIOrchestrator({
+        "fallback_providers": ["echo"],
+        "concurrency": 4,
+        "output": {"directory": str(tmp_path)},
+    })
+    yield orch
+    orch.close()
+
+
+def test_results_come_back_in_input_order(orch):
+    chunks = [f"chunk {i}" for i in range(20)]
+    out = list(orch.iter_process_chunks(chunks, save_each_chunk=False, auto_continue=False))
+    assert out == [f"answer {i}" for i in range(20)]
+    assert 1 < EchoProvider.max_in_flight <= 4
+
+
+def test_chunks_are_pulled_lazily(orch):
+    pulled = 0
+
+    def chunks():
+        nonlocal pulled
+        for i in range(100):
+            pulled += 1
+            yield f"chunk {i}"
+
+    results = orch.iter_process_chunks(chunks(), save_each_chunk=False, auto_continue=False)
+    assert next(results) == "answer 0"
+    # The window holds at most `concurrency` chunks beyond those already yielded
+    assert pulled <= 1 + orch.concurrency
+    results.close()
+
+
+def test_each_response_is_saved_in_order(orch, tmp_path):
+    chunks = [f"chunk {i}" for i in range(6)]
+    list(orch.iter_process_chunks(chunks, auto_continue=False))
+    orch.output.close()
+    saved = [(tmp_path / f"output_{i}.txt").read_text(encoding="utf-8") for i in range(1, 7)]
+    assert saved == [f"answer {i}" for i in range(6)]
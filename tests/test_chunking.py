@@ -0,0 +1,138 @@
+"""chunk_parallel gives the same chunks as chunk_text over the whole text."""
+from __future__ import annotations
+
+import re
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_integration_tool.chunking import (
+    Tokenizer,
+    _text_suffix,
+    chunk_parallel,
+    chunk_stream,
+    chunk_text,
+)
+
+# Simplified cl100k_base pre-tokenizer: like tiktoken's encodings, it never
+# merges a line break with the non-whitespace that follows it
+PIECES = re.compile(r" ?\w+| ?[^\s\w]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+")
+
+
+class ByteLevelEncoding:
+    """
+    Stand-in for a tiktoken Encoding (tiktoken's BPE data is not needed):
+    pre-tokenized pieces are split into tokens of up to 3 UTF-8 bytes, so
+    multi-byte characters can straddle tokens as they do with real BPE.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[bytes, int] = {}
+        self._bytes: list[bytes] = []
+        self._lock = threading.Lock()
+
+    def _id(self, piece: bytes) -> int:
+        with self._lock:
+            token = self._ids.get(piece)
+            if token is None:
+                token = self._ids[piece] = len(self._bytes)
+                self._bytes.append(piece)
+            return token
+
+    def encode_ordinary(self, text: str) -> list[int]:
+        tokens = []
+        for piece in PIECES.findall(text):
+            data = piece.encode("utf-8")
+            tokens.extend(self._id(data[i:i + 3]) for i in range(0, len(data), 3))
+        return tokens
+
+    def encode_ordinary_batch(self, texts: list[str], num_threads: int = 8) -> list[list[int]]:
+        return [self.encode_ordinary(text) for text in texts]
+
+    def decode(self, tokens: list[int]) -> str:
+        return b"".join(self._bytes[t] for t in tokens).decode("utf-8", errors="replace")
+
+    def decode_single_token_bytes(self, token: int) -> bytes:
+        return self._bytes[token]
+
+
+@pytest.fixture
+def tok() -> Tokenizer:
+    tokenizer = Tokenizer("test")
+    tokenizer._encoding = ByteLevelEncoding()
+    return tokenizer
+
+
+def sample_text(paragraphs: int = 60) -> str:
+    parts = []
+    for i in range(paragraphs):
+        sentences = " ".join(f"Sentence {j} of paragraph {i} mentions café, naïve and 東京." for j in range(i % 7 + 1))
+        parts.append(sentences + ("\n  indented line" if i % 5 == 0 else ""))
+    return "\n\n".join(parts) + "\n"
+
+
+def blocks(text: str, size: int) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("block_size", [1, 97, 4096])
+@pytest.mark.parametrize("segment_chars", [64, 300, 1000])
+def test_same_chunks_as_chunk_text(tok, block_size, segment_chars):
+    text = sample_text()
+    expected = list(chunk_text(text, max_tokens=60, tokenizer=tok))
+    assert len(expected) > 10
+    got = list(
+        chunk_parallel(blocks(text, block_size), max_tokens=60, tokenizer=tok, workers=4, segment_chars=segment_chars)
+    )
+    assert got == expected
+
+
+def test_same_chunks_with_overlap(tok):
+    text = sample_text()
+    expected = list(chunk_text(text, max_tokens=60, overlap_tokens=10, tokenizer=tok))
+    got = list(chunk_parallel(blocks(text, 500), max_tokens=60, overlap_tokens=10, tokenizer=tok, segment_chars=300))
+    assert got == expected
+
+
+def test_chunks_respect_max_tokens(tok):
+    for chunk in chunk_parallel(blocks(sample_text(), 500), max_tokens=60, tokenizer=tok, segment_chars=300):
+        assert tok.count(chunk) <= 60
+
+
+def test_long_line_hands_over_to_chunk_stream(tok):
+    head = sample_text(10)
+    long_line = "word " * 800  # no line break for far more than 4 * segment_chars
+    text = head + long_line + "\n" + sample_text(5)
+    got = list(chunk_parallel(blocks(text, 256), max_tokens=60, tokenizer=tok, segment_chars=200))
+    assert "".join(got) == text
+    assert all(tok.count(chunk) <= 60 for chunk in got)
+    # Chunks before the long line are cut exactly as chunk_text would
+    expected = list(chunk_text(text, max_tokens=60, tokenizer=tok))
+    assert got[:3] == expected[:3]
+
+
+def test_without_exact_tokenizer_is_chunk_stream():
+    tokenizer = Tokenizer("test")
+    tokenizer._encoding = None
+    text = sample_text()
+    expected = list(chunk_stream(blocks(text, 500), max_tokens=60, tokenizer=tokenizer))
+    assert list(chunk_parallel(blocks(text, 500), max_tokens=60, tokenizer=tokenizer)) == expected
+
+
+@pytest.mark.parametrize(
+    "text, nbytes, expected",
+    [
+        ("abcdef", 0, ""),
+        ("abcdef", 2, "ef"),
+        ("abcdef", 10, "abcdef"),
+        ("ab東京", 3, "京"),
+        ("ab東京", 4, "東京"),
+        ("ab東京", 7, "b東京"),
+    ],
+)
+def test_text_suffix(text, nbytes, expected):
+    assert _text_suffix(text, nbytes) == expected
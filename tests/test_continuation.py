@@ -0,0 +1,117 @@
+"""Continuations: seam stitching and the bounded context sent each round."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_integration_tool.continuation import (
+    CONTINUE_PROMPT,
+    request_continuation,
+    stitch,
+    stream_continuation,
+)
+from ai_integration_tool.providers.base import ChatMessage, ChatResult, ChatStream
+
+EXISTING = "The first part of the answer ends with this sentence about rivers."
+
+
+@pytest.mark.parametrize(
+    "addition, expected",
+    [
+        # The model restates the end of the reply: the repeat is dropped
+        ("this sentence about rivers. Then it goes on.", " Then it goes on."),
+        ("  this sentence about rivers. Then it goes on.", " Then it goes on."),
+        ("The first part of the answer ends with this sentence about rivers. More.", " More."),
+        # Nothing repeated
+        (" Then it goes on.", " Then it goes on."),
+        # Overlaps shorter than min_overlap are likely coincidental and kept
+        ("rivers. Then", "rivers. Then"),
+        # The addition only starts like the tail; it does not continue it
+        ("this sentence about lakes.", "this sentence about lakes."),
+    ],
+)
+def test_stitch(addition, expected):
+    assert stitch(EXISTING, addition) == expected
+
+
+def test_stitch_whole_addition_repeated():
+    assert stitch(EXISTING, "ends with this sentence about rivers.") == ""
+
+
+def test_stitch_looks_back_at_most_max_overlap_chars():
+    existing = "x" * 100 + EXISTING
+    assert stitch(existing, EXISTING + " More.", max_overlap=len(EXISTING)) == " More."
+    assert stitch(existing, EXISTING + " More.", max_overlap=len(EXISTING) - 1) == EXISTING + " More."
+
+
+def replies(*parts: ChatResult):
+    """get_reply that returns parts in order and records the messages it was sent."""
+    sent: list[list[ChatMessage]] = []
+    queue = list(parts)
+
+    def get_reply(messages: list[ChatMessage]) -> ChatResult:
+        sent.append(messages)
+        return queue.pop(0)
+
+    return get_reply, sent
+
+
+def test_request_continuation_sends_a_bounded_tail_and_stitches():
+    messages = [ChatMessage("user", "Tell me about rivers.")]
+    first = ChatResult("A" * 5000 + " " + EXISTING, "length", {"completion_tokens": 10})
+    get_reply, sent = replies(
+        ChatResult("this sentence about rivers. Rivers flow to the sea.", "stop", {"completion_tokens": 5})
+    )
+    rounds = []
+    full = request_continuation(
+        get_reply, messages, first, context_tokens=50, on_round=lambda *a: rounds.append(a)
+    )
+    assert full == first + " Rivers flow to the sea."
+    assert full.finish_reason == "stop"
+    assert full.usage == {"completion_tokens": 15}
+    (request,) = sent
+    assert request[:-2] == messages
+    assert request[-2].role == "assistant"
+    assert first.endswith(request[-2].content)
+    assert len(request[-2].content) < 500
+    assert request[-1].content == CONTINUE_PROMPT
+    ((context_sent, saved),) = rounds
+    assert context_sent <= 50 and saved > 1000
+
+
+def test_request_continuation_stops_when_nothing_new_arrives():
+    first = ChatResult(EXISTING, "length")
+    get_reply, sent = replies(ChatResult("this sentence about rivers.", "length"))
+    full = request_continuation(get_reply, [ChatMessage("user", "q")], first, max_continuations=5)
+    assert full == EXISTING
+    assert len(sent) == 1
+
+
+def test_request_continuation_only_on_length():
+    get_reply, sent = replies()
+    full = request_continuation(get_reply, [ChatMessage("user", "q")], ChatResult("Short, but done", "stop"))
+    assert full == "Short, but done"
+    assert sent == []
+
+
+def stream_of(text: str, finish_reason: str, size: int = 7) -> ChatStream:
+    def chunks():
+        for i in range(0, len(text), size):
+            yield text[i:i + size]
+        return finish_reason, None
+
+    return ChatStream(chunks())
+
+
+def test_stream_continuation_trims_the_seam():
+    streams = [
+        stream_of(EXISTING, "length"),
+        stream_of("this sentence about rivers. And lakes.", "stop"),
+    ]
+    out = ChatStream(stream_continuation(lambda msgs: streams.pop(0), [ChatMessage("user", "q")]))
+    assert "".join(out) == EXISTING + " And lakes."
+    assert out.finish_reason == "stop"
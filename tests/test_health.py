@@ -0,0 +1,165 @@
+"""HealthTracker circuit breaker: state transitions, and waiting out an outage on the last route."""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_integration_tool.health import CLOSED, HALF_OPEN, OPEN, CircuitOpenError, HealthTracker
+from ai_integration_tool.orchestrator import AIOrchestrator
+from ai_integration_tool.providers import PROVIDER_REGISTRY
+from ai_integration_tool.providers.base import BaseProvider, ChatResult, ProviderError
+
+ROUTE = ("p", "m")
+
+
+def state(tracker: HealthTracker) -> str:
+    return tracker._get(*ROUTE).state
+
+
+def fail(tracker: HealthTracker) -> None:
+    with pytest.raises(ProviderError):
+        with tracker.track(*ROUTE):
+            raise ProviderError("down", status_code=503)
+
+
+def test_opens_after_threshold_and_refuses_calls():
+    tracker = HealthTracker(failure_threshold=3, cooldown_seconds=60)
+    fail(tracker)
+    fail(tracker)
+    assert state(tracker) == CLOSED
+    fail(tracker)
+    assert state(tracker) == OPEN
+    assert tracker.retry_in(*ROUTE) > 0
+    with pytest.raises(CircuitOpenError):
+        tracker.track(*ROUTE)
+
+
+def test_success_resets_consecutive_failures():
+    tracker = HealthTracker(failure_threshold=2, cooldown_seconds=60)
+    fail(tracker)
+    with tracker.track(*ROUTE):
+        pass
+    fail(tracker)
+    assert state(tracker) == CLOSED
+
+
+def test_half_open_admits_a_single_probe():
+    tracker = HealthTracker(failure_threshold=1, cooldown_seconds=0.05)
+    fail(tracker)
+    time.sleep(0.06)
+    assert tracker.allow(*ROUTE)
+    assert state(tracker) == HALF_OPEN
+    assert not tracker.allow(*ROUTE)
+
+
+def test_probe_success_closes_and_failure_reopens():
+    tracker = HealthTracker(failure_threshold=1, cooldown_seconds=0.05)
+    fail(tracker)
+    time.sleep(0.06)
+    fail(tracker)
+    assert state(tracker) == OPEN
+    time.sleep(0.06)
+    with tracker.track(*ROUTE):
+        pass
+    assert state(tracker) == CLOSED
+
+
+def test_rate_limit_does_not_count_as_failure():
+    tracker = HealthTracker(failure_threshold=1, is_failure=lambda e: getattr(e, "status_code", None) != 429)
+    with pytest.raises(ProviderError):
+        with tracker.track(*ROUTE):
+            raise ProviderError("busy", status_code=429)
+    assert state(tracker) == CLOSED
+
+
+def test_disabled_tracker_never_refuses():
+    tracker = HealthTracker(enabled=False, failure_threshold=1)
+    fail(tracker)
+    with tracker.track(*ROUTE):
+        pass
+
+
+def test_wait_sleeps_until_the_probe():
+    tracker = HealthTracker(failure_threshold=1, cooldown_seconds=0.1)
+    fail(tracker)
+    started = time.monotonic()
+    with tracker.track(*ROUTE, wait=True):
+        pass
+    assert time.monotonic() - started >= 0.09
+    assert state(tracker) == CLOSED
+
+
+def test_waiters_follow_another_callers_probe():
+    tracker = HealthTracker(failure_threshold=1, cooldown_seconds=0.05)
+    fail(tracker)
+    time.sleep(0.06)
+    probe = tracker.track(*ROUTE)  # holds the probe slot
+    outcome: list[str] = []
+
+    def waiter() -> None:
+        try:
+            with tracker.track(*ROUTE, wait=True):
+                outcome.append("sent")
+        except CircuitOpenError:
+            outcome.append("refused")
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    time.sleep(0.1)
+    assert outcome == []
+    probe.__exit__(ProviderError, ProviderError("still down", status_code=503), None)
+    thread.join(1)
+    assert outcome == ["refused"]
+
+
+class FlakyProvider(BaseProvider):
+    """Fails with 503 until `outage` calls have been made, then answers."""
+
+    name = "flaky"
+
+    def __init__(self, config: dict):
+        super().__init__(config)
+        self.calls = 0
+        self.outage = config.get("outage", 0)
+
+    def chat(self, messages, model, max_tokens=4096, stream=False):
+        self.calls += 1
+        if self.calls <= self.outage:
+            raise ProviderError("service unavailable", status_code=503)
+        return ChatResult("ok", "stop")
+
+
+@pytest.fixture
+def flaky(monkeypatch):
+    monkeypatch.setitem(PROVIDER_REGISTRY, "flaky", FlakyProvider)
+
+
+def single_route_orchestrator(tmp_path: Path, outage: int) -> AIOrchestrator:
+    return AIOrchestrator({
+        "fallback_providers": ["flaky"],
+        "providers": {"flaky": {"outage": outage}},
+        "retry": {"max_attempts": 2, "min_delay_seconds": 0.01, "max_delay_seconds": 0.01},
+        "health": {"failure_threshold": 3, "cooldown_seconds": 0.2},
+        "output": {"directory": str(tmp_path)},
+    })
+
+
+def test_single_route_survives_a_short_outage(tmp_path, flaky):
+    orch = single_route_orchestrator(tmp_path, outage=3)
+    route = "flaky/deepseek/deepseek-chat"
+    with pytest.raises(ProviderError):
+        orch.chat("hi", save_to_file=False, auto_continue=False)
+    # The third failure opens the circuit; with no other route the retry waits
+    # for the probe instead of failing fast with CircuitOpenError
+    started = time.monotonic()
+    assert orch.chat("hi", save_to_file=False, auto_continue=False) == "ok"
+    assert time.monotonic() - started >= 0.2
+    assert orch.health.snapshot()[route]["state"] == CLOSED
+    assert orch.health.snapshot()[route]["failures"] == 3
+    orch.close()
@@ -0,0 +1,159 @@
+"""Hedged requests: race() start, win and cancellation rules, and HedgePolicy delays."""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_integration_tool.hedging import Cancellation, HedgeCancelled, HedgePolicy, race
+from ai_integration_tool.orchestrator import AIOrchestrator
+from ai_integration_tool.providers import PROVIDER_REGISTRY
+from ai_integration_tool.providers.base import BaseProvider, ChatStream
+
+
+@pytest.fixture
+def pool():
+    executor = ThreadPoolExecutor(max_workers=4)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def answers(name: str, token_after: float, log: dict):
+    """A racing call: first token after token_after seconds, then a short body; honours cancellation."""
+    def call(first_token, cancelled: Cancellation) -> str:
+        log.setdefault("started", []).append(name)
+        woke = threading.Event()
+        cancelled.on_cancel(woke.set)  # like aborting a blocked stream read
+        if woke.wait(token_after):
+            log.setdefault("cancelled", []).append(name)
+            raise HedgeCancelled()
+        first_token()
+        time.sleep(0.02)
+        return name
+
+    return call
+
+
+def fails(name: str, log: dict):
+    def call(first_token, cancelled: Cancellation) -> str:
+        log.setdefault("started", []).append(name)
+        raise RuntimeError(f"{name} failed")
+
+    return call
+
+
+def test_fast_primary_never_hedges(pool):
+    log: dict = {}
+    hedges = []
+    winner, result = race(
+        [answers("a", 0.0, log), answers("b", 0.0, log)], 0.5, pool, on_hedge=hedges.append
+    )
+    assert (winner, result) == (0, "a")
+    assert log["started"] == ["a"]
+    assert hedges == []
+
+
+def test_slow_primary_is_hedged_and_cancelled(pool):
+    log: dict = {}
+    hedges = []
+    winner, result = race(
+        [answers("a", 5.0, log), answers("b", 0.0, log)], 0.05, pool, on_hedge=hedges.append
+    )
+    assert (winner, result) == (1, "b")
+    assert hedges == [1]
+    deadline = time.monotonic() + 1
+    while "cancelled" not in log and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert log["cancelled"] == ["a"]
+
+
+def test_failed_primary_starts_the_next_call_at_once(pool):
+    log: dict = {}
+    hedges = []
+    started = time.monotonic()
+    winner, result = race([fails("a", log), answers("b", 0.0, log)], 5.0, pool, on_hedge=hedges.append)
+    assert (winner, result) == (1, "b")
+    assert time.monotonic() - started < 1
+    assert hedges == []  # started by the failure, not the hedge delay
+
+
+def test_all_failing_raises_the_last_error(pool):
+    log: dict = {}
+    with pytest.raises(RuntimeError, match="b failed"):
+        race([fails("a", log), fails("b", log)], 5.0, pool)
+    assert log["started"] == ["a", "b"]
+
+
+def test_calls_not_yet_started_are_dropped(pool):
+    log: dict = {}
+    winner, _ = race([answers("a", 0.15, log), answers("b", 5.0, log), answers("c", 5.0, log)], 0.1, pool)
+    assert winner == 0
+    time.sleep(0.15)
+    assert "c" not in log["started"]
+
+
+def test_cancellation_runs_callbacks_once():
+    calls = []
+    cancellation = Cancellation()
+    cancellation.on_cancel(lambda: calls.append(1))
+    cancellation.set()
+    cancellation.set()
+    assert calls == [1]
+    assert cancellation.is_set()
+    cancellation.on_cancel(lambda: calls.append(2))  # already set: runs at once
+    assert calls == [1, 2]
+
+
+def test_policy_delay_is_a_percentile_of_recent_ttft():
+    policy = HedgePolicy(percentile=90, initial_delay=5.0, min_samples=10, min_delay=0.05)
+    assert policy.delay("p", "m") == 5.0
+    for i in range(1, 11):
+        policy.record("p", "m", i / 10)
+    assert policy.delay("p", "m") == pytest.approx(0.9)
+    assert policy.delay("p", "other") == 5.0
+
+
+def test_policy_from_config_is_opt_in():
+    assert HedgePolicy.from_config({}) is None
+    policy = HedgePolicy.from_config({"hedging": {"enabled": True, "percentile": 99, "alternate_model": "x"}})
+    assert policy.percentile == 99 and policy.alternate_model == "x"
+
+
+class DelayedProvider(BaseProvider):
+    """Streams one token after config['delay'] seconds."""
+
+    name = "delayed"
+
+    def chat(self, messages, model, max_tokens=4096, stream=False):
+        def chunks():
+            time.sleep(self.config.get("delay", 0))
+            yield "token"
+            return "stop", None
+
+        return ChatStream(chunks())
+
+
+def test_losing_primary_still_feeds_the_delay(tmp_path, monkeypatch):
+    monkeypatch.setitem(PROVIDER_REGISTRY, "slow", DelayedProvider)
+    monkeypatch.setitem(PROVIDER_REGISTRY, "fast", DelayedProvider)
+    orch = AIOrchestrator({
+        "fallback_providers": ["slow", "fast"],
+        "providers": {"slow": {"delay": 0.3}, "fast": {}},
+        "hedging": {"enabled": True, "initial_delay_seconds": 0.05},
+        "output": {"directory": str(tmp_path)},
+    })
+    try:
+        for _ in range(3):
+            assert orch.chat("hi", save_to_file=False, auto_continue=False) == "token"
+        samples = orch.hedging._samples[("slow", orch.default_model)]
+    finally:
+        orch.close()
+    assert orch.stats["hedge_wins"] == 3
+    # Each lost race records how long the primary had waited: at least the hedge delay
+    assert len(samples) == 3 and min(samples) >= 0.05
@@ -0,0 +1,116 @@
+"""RunJournal and --resume: finished chunks are reused, only missing ones are sent."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_integration_tool.journal import RunJournal
+from ai_integration_tool.orchestrator import AIOrchestrator
+from ai_integration_tool.providers import PROVIDER_REGISTRY
+from ai_integration_tool.providers.base import BaseProvider, ChatResult, ProviderError
+
+
+def test_resume_loads_recorded_chunks(tmp_path):
+    path = tmp_path / "run.journal.jsonl"
+    journal = RunJournal(path)
+    journal.record(0, "k0", ChatResult("zero", "stop", {"completion_tokens": 1}))
+    assert not journal.resumed("k0")
+    journal.close()
+
+    resumed = RunJournal(path, resume=True)
+    assert len(resumed) == 1
+    assert resumed.get("k0") == "zero"
+    assert resumed.get("k0").usage == {"completion_tokens": 1}
+    assert resumed.resumed("k0")
+    assert resumed.get("k1") is None
+    resumed.close()
+
+
+def test_torn_last_line_is_skipped_and_appending_continues(tmp_path):
+    path = tmp_path / "run.journal.jsonl"
+    journal = RunJournal(path)
+    journal.record(0, "k0", "zero")
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"index": 1, "key": "k1", "resp')  # killed mid-write
+
+    resumed = RunJournal(path, resume=True)
+    assert resumed.get("k1") is None
+    resumed.record(1, "k1", "one")
+    resumed.close()
+    reopened = RunJournal(path, resume=True)
+    assert reopened.get("k1") == "one"
+    reopened.close()
+
+
+def test_fresh_run_moves_an_old_journal_aside(tmp_path):
+    path = tmp_path / "run.journal.jsonl"
+    journal = RunJournal(path)
+    journal.record(0, "k0", "zero")
+    journal.close()
+
+    fresh = RunJournal(path)
+    assert fresh.get("k0") is None
+    assert fresh.previous == path.with_name(path.name + ".old")
+    old = RunJournal(fresh.previous, resume=True)
+    assert old.get("k0") == "zero"
+    old.close()
+    fresh.remove()
+    assert not path.exists()
+
+
+class FailingProvider(BaseProvider):
+    """Echoes each chunk; fails on chunks listed in config['fail_on']."""
+
+    name = "failing"
+    sent: list[str] = []
+
+    def chat(self, messages, model, max_tokens=4096, stream=False):
+        chunk = messages[-1].content
+        if chunk in self.config.get("fail_on", ()):
+            raise ProviderError("bad request", status_code=400)
+        type(self).sent.append(chunk)
+        return ChatResult(f"re: {chunk}", "stop")
+
+
+@pytest.fixture
+def failing(monkeypatch):
+    monkeypatch.setitem(PROVIDER_REGISTRY, "failing", FailingProvider)
+    FailingProvider.sent = []
+
+
+def run(tmp_path: Path, chunks: list[str], journal: RunJournal, fail_on: tuple[str, ...] = ()) -> AIOrchestrator:
+    orch = AIOrchestrator({
+        "fallback_providers": ["failing"],
+        "providers": {"failing": {"fail_on": list(fail_on)}},
+        "output": {"directory": str(tmp_path / "out")},
+    })
+    try:
+        list(orch.iter_process_chunks(chunks, save_each_chunk=False, auto_continue=False, journal=journal))
+    finally:
+        journal.close()
+        orch.close()
+    return orch
+
+
+def test_resume_sends_only_missing_chunks(tmp_path, failing):
+    path = tmp_path / "run.journal.jsonl"
+    chunks = ["a", "b", "c", "d"]
+    with pytest.raises(ProviderError):
+        run(tmp_path, chunks, RunJournal(path), fail_on=("c",))
+    assert FailingProvider.sent == ["a", "b"]
+
+    FailingProvider.sent = []
+    orch = run(tmp_path, chunks, RunJournal(path, resume=True))
+    assert FailingProvider.sent == ["c", "d"]
+    assert orch.stats["journal_hits"] == 2
+
+
+def test_repeated_chunk_in_one_run_is_not_counted_as_resumed(tmp_path, failing):
+    orch = run(tmp_path, ["a", "b", "a"], RunJournal(tmp_path / "run.journal.jsonl"))
+    assert FailingProvider.sent == ["a", "b"]
+    assert orch.stats["journal_hits"] == 0
@@ -0,0 +1,91 @@
+"""OutputManager: numbering continues across runs; background and JSONL writes."""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_integration_tool.output_manager import OutputManager, write_atomic
+
+
+def names(directory: Path) -> list[str]:
+    return sorted(p.name for p in directory.iterdir())
+
+
+def test_numbering_starts_at_one(tmp_path):
+    out = OutputManager(tmp_path / "out")
+    assert out.write_response("a").name == "output_1.txt"
+    assert out.write_response("b").name == "output_2.txt"
+    assert (tmp_path / "out" / "output_2.txt").read_text(encoding="utf-8") == "b"
+
+
+def test_new_run_continues_after_the_highest_existing_file(tmp_path):
+    for name in ("output_1.txt", "output_7.txt", "output_x.txt", "other_9.txt", "output_8.md"):
+        (tmp_path / name).write_text("old", encoding="utf-8")
+    out = OutputManager(tmp_path)
+    assert out.write_response("new").name == "output_8.txt"
+    assert (tmp_path / "output_7.txt").read_text(encoding="utf-8") == "old"
+
+
+def test_prefix_and_extension_are_matched(tmp_path):
+    (tmp_path / "answer_3.md").write_text("old", encoding="utf-8")
+    (tmp_path / "output_5.txt").write_text("old", encoding="utf-8")
+    out = OutputManager(tmp_path, prefix="answer", extension="md")
+    assert out.write_response("new").name == "answer_4.md"
+
+
+def test_concurrent_writers_get_distinct_numbers(tmp_path):
+    out = OutputManager(tmp_path)
+    paths: list[Path] = []
+    lock = threading.Lock()
+
+    def write(i: int) -> None:
+        path = out.write_response(str(i))
+        with lock:
+            paths.append(path)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(p.name for p in paths) == sorted(f"output_{i}.txt" for i in range(1, 21))
+
+
+def test_per_run_dir_starts_afresh(tmp_path):
+    (tmp_path / "output_4.txt").write_text("old", encoding="utf-8")
+    out = OutputManager(tmp_path, per_run_dir=True)
+    path = out.write_response("new")
+    assert path.name == "output_1.txt"
+    assert path.parent.parent == tmp_path and path.parent.name.startswith("run-")
+
+
+def test_background_writes_are_on_disk_after_close(tmp_path):
+    out = OutputManager(tmp_path, background=True)
+    for i in range(10):
+        out.write_response(f"response {i}")
+    out.close()
+    assert names(tmp_path) == sorted(f"output_{i}.txt" for i in range(1, 11))
+    assert (tmp_path / "output_10.txt").read_text(encoding="utf-8") == "response 9"
+
+
+def test_jsonl_sink_numbers_records(tmp_path):
+    (tmp_path / "output_2.txt").write_text("old", encoding="utf-8")
+    out = OutputManager(tmp_path, jsonl="responses.jsonl")
+    out.write_response("a", meta={"chunk": 0})
+    out.write_response("b")
+    out.close()
+    records = [json.loads(line) for line in (tmp_path / "responses.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [(r["index"], r["response"]) for r in records] == [(3, "a"), (4, "b")]
+    assert records[0]["chunk"] == 0
+
+
+def test_write_atomic_leaves_no_temp_file(tmp_path):
+    path = tmp_path / "sub" / "file.txt"
+    write_atomic(path, "one")
+    write_atomic(path, "two")
+    assert path.read_text(encoding="utf-8") == "two"
+    assert names(path.parent) == ["file.txt"]
@@ -0,0 +1,132 @@
+"""Retries: decorrelated jitter, Retry-After, and the run-wide retry budget."""
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_integration_tool import retry as retry_module
+from ai_integration_tool.providers.base import ProviderError, parse_retry_after
+from ai_integration_tool.retry import (
+    MAX_RETRY_AFTER,
+    RetryBudget,
+    async_with_retry,
+    next_delay,
+    retry_delay,
+    with_retry,
+)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of sleeping."""
+    slept: list[float] = []
+    monkeypatch.setattr(retry_module, "time", SimpleNamespace(sleep=slept.append))
+    return slept
+
+
+def flaky(failures: int, error: Exception):
+    """fn that raises error `failures` times, then returns the number of calls."""
+    calls = 0
+
+    def fn():
+        nonlocal calls
+        calls += 1
+        if calls <= failures:
+            raise error
+        return calls
+
+    return fn
+
+
+def test_next_delay_is_jittered_within_bounds():
+    rng_state = random.getstate()
+    random.seed(7)
+    try:
+        delays = [next_delay(2.0, 1.0, 30.0) for _ in range(200)]
+    finally:
+        random.setstate(rng_state)
+    assert all(1.0 <= d <= 6.0 for d in delays)
+    assert len(set(delays)) > 100  # decorrelated, not a fixed schedule
+    assert next_delay(100.0, 1.0, 30.0) <= 30.0
+    assert next_delay(0.0, 1.0, 30.0) == 1.0
+
+
+def test_retry_after_takes_precedence_when_longer():
+    assert retry_delay(ProviderError("busy", 429, retry_after=10.0), 2.0) == 10.0
+    assert retry_delay(ProviderError("busy", 429, retry_after=1.0), 2.0) == 2.0
+    assert retry_delay(ProviderError("busy", 429, retry_after=1e6), 2.0) == MAX_RETRY_AFTER
+    assert retry_delay(ValueError(), 2.0) == 2.0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+def test_retries_until_success(sleeps):
+    seen = []
+    result = with_retry(
+        flaky(2, ProviderError("down", 503)),
+        max_attempts=3,
+        min_delay=0.5,
+        max_delay=4.0,
+        on_retry=lambda e, delay: seen.append(delay),
+    )
+    assert result == 3
+    assert seen == sleeps and len(sleeps) == 2
+    assert all(0.5 <= d <= 4.0 for d in sleeps)
+
+
+def test_gives_up_after_max_attempts(sleeps):
+    with pytest.raises(ProviderError):
+        with_retry(flaky(5, ProviderError("down", 503)), max_attempts=3, min_delay=0.1)
+    assert len(sleeps) == 2
+
+
+def test_non_retryable_errors_are_raised_at_once(sleeps):
+    with pytest.raises(ProviderError):
+        with_retry(
+            flaky(1, ProviderError("bad request", 400)),
+            is_retryable=lambda e: e.retryable,
+        )
+    assert sleeps == []
+
+
+def test_budget_is_shared_across_calls(sleeps):
+    budget = RetryBudget(3)
+    assert with_retry(flaky(2, TimeoutError()), max_attempts=5, min_delay=0.1, budget=budget) == 3
+    with pytest.raises(TimeoutError):
+        with_retry(flaky(2, TimeoutError()), max_attempts=5, min_delay=0.1, budget=budget)
+    assert budget.used == 3
+    assert len(sleeps) == 3
+
+
+def test_unlimited_budget():
+    budget = RetryBudget()
+    assert all(budget.try_acquire() for _ in range(1000))
+
+
+def test_async_with_retry(monkeypatch):
+    slept: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        slept.append(seconds)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    fn = flaky(2, ProviderError("busy", 429, retry_after=3.0))
+
+    async def call():
+        return fn()
+
+    budget = RetryBudget(5)
+    assert asyncio.run(async_with_retry(call, max_attempts=3, min_delay=0.1, max_delay=1.0, budget=budget)) == 3
+    assert slept == [3.0, 3.0]
+    assert budget.used == 2
@@ -0,0 +1,60 @@
+"""SSEParser: the same events whatever the line ends and block boundaries."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_integration_tool.sse import SSEParser
+
+TRANSCRIPT = (
+    ": keep-alive\n"
+    "\n"
+    'data: {"n": 1}\n'
+    "\n"
+    "event: note\n"
+    "id: 7\n"
+    "data: first line\n"
+    "data:second line\n"
+    "\n"
+    "data\n"
+    "\n"
+    ": comment between events\n"
+    'data: {"n": 2}\n'
+    "\n"
+    "data: [DONE]"  # no terminating blank line
+)
+
+EXPECTED = [
+    ("message", b'{"n": 1}', None),
+    ("note", b"first line\nsecond line", "7"),
+    ("message", b'{"n": 2}', "7"),
+    ("message", b"[DONE]", "7"),
+]
+
+
+def parse(data: bytes, block_size: int) -> list[tuple[str, bytes, str | None]]:
+    parser = SSEParser()
+    events = []
+    for i in range(0, len(data), block_size):
+        events += parser.feed(data[i:i + block_size])
+    events += parser.close()
+    return [(e.event, e.data, e.id) for e in events]
+
+
+@pytest.mark.parametrize("line_end", ["\n", "\r\n", "\r"])
+@pytest.mark.parametrize("block_size", [1, 2, 3, 5, 16, 4096])
+def test_block_sizes_and_line_ends(line_end: str, block_size: int) -> None:
+    data = TRANSCRIPT.replace("\n", line_end).encode("utf-8")
+    assert parse(data, block_size) == EXPECTED
+
+
+def test_crlf_split_between_blocks() -> None:
+    parser = SSEParser()
+    assert parser.feed(b"data: a\r") == []
+    assert parser.feed(b"\n\r") == []
+    assert [e.data for e in parser.feed(b"\ndata: b\r\n\r\n")] == [b"a", b"b"]
+    assert parser.close() == []